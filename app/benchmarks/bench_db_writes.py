@@ -0,0 +1,105 @@
+"""
+SQLite 동시 쓰기 벤치마크: 기본 저널 모드 vs WAL 튜닝 (app.database.apply_sqlite_pragmas)
+
+/grade-quiz, /feedback, 생성 로그 저장처럼 여러 스레드가 짧은 트랜잭션(INSERT 1행 + commit)을
+동시에 실행하는 상황을 재현하고, 두 설정의 초당 commit 수와 잠금 오류 수를 비교합니다.
+
+실행 (프로젝트 루트에서):
+    python -m app.benchmarks.bench_db_writes --threads 8 --writes 200
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.database import apply_sqlite_pragmas
+
+
+def run_profile(name: str, tuned: bool, threads: int, writes: int, payload_bytes: int) -> Dict[str, float]:
+    """임시 DB 파일 하나에 threads개 스레드가 writes번씩 INSERT + commit 합니다."""
+    workdir = tempfile.mkdtemp(prefix=f"bench_db_{name}_")
+    url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    engine = create_engine(url, connect_args={"check_same_thread": False}, pool_size=threads, max_overflow=0)
+    if tuned:
+        apply_sqlite_pragmas(engine)
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE generation_logs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " request_type TEXT, prompt_context TEXT, generated_content TEXT)"
+        ))
+
+    payload = "x" * payload_bytes
+    errors = [0]
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(threads)
+
+    def worker(worker_id: int) -> None:
+        start_barrier.wait()
+        for i in range(writes):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text(
+                            "INSERT INTO generation_logs (request_type, prompt_context, generated_content)"
+                            " VALUES (:t, :p, :c)"
+                        ),
+                        {"t": "bench", "p": f"{worker_id}:{i}", "c": payload}
+                    )
+            except OperationalError:
+                with lock:
+                    errors[0] += 1
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        committed = conn.execute(text("SELECT COUNT(*) FROM generation_logs")).scalar()
+        journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+    engine.dispose()
+
+    return {
+        "journal_mode": journal_mode,
+        "committed": committed,
+        "errors": errors[0],
+        "elapsed": elapsed,
+        "commits_per_sec": committed / elapsed if elapsed else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite concurrent write benchmark")
+    parser.add_argument("--threads", type=int, default=8, help="동시 쓰기 스레드 수")
+    parser.add_argument("--writes", type=int, default=200, help="스레드당 트랜잭션 수")
+    parser.add_argument("--payload-bytes", type=int, default=2048, help="행당 본문 크기")
+    args = parser.parse_args()
+
+    print(f"threads={args.threads} writes/thread={args.writes} payload={args.payload_bytes}B")
+    results = {
+        "default": run_profile("default", False, args.threads, args.writes, args.payload_bytes),
+        "tuned": run_profile("tuned", True, args.threads, args.writes, args.payload_bytes),
+    }
+    for name, result in results.items():
+        print(
+            f"{name:>8}: journal={result['journal_mode']:<6} committed={result['committed']:>6} "
+            f"locked_errors={result['errors']:>4} elapsed={result['elapsed']:.2f}s "
+            f"-> {result['commits_per_sec']:.0f} commits/s"
+        )
+    baseline = results["default"]["commits_per_sec"]
+    if baseline:
+        print(f"speedup: {results['tuned']['commits_per_sec'] / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
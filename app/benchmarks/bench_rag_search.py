@@ -0,0 +1,170 @@
+"""
+RAG 검색 벤치마크: ContentGenerator.search_context × N vs search_context_many (쿼리 N개)
+
+실제 검색 코드(ContentGenerator.search_context / search_context_many → _search_many_sync)를 그대로 실행합니다.
+벡터 DB 대신 실제와 같은 차원(768)의 임의 벡터로 LangChain FAISS 벡터 스토어를 만들고,
+원격 임베딩 API는 요청당 고정 지연(--embed-latency-ms) + 쿼리당 지연(--embed-per-query-ms)으로 흉내 냅니다.
+
+- single: search_context(query)를 쿼리마다 순서대로 호출 (쿼리마다 임베딩 요청 1회 + index.search(1 × d))
+- batched: search_context_many(queries) 1회 (임베딩 요청 1회 + index.search(N × d) 1회, FAISS BLAS 배치 경로)
+- faiss only: 임베딩/문서 포맷팅을 뺀 index.search 자체 비교
+
+검색 결과 캐시와 임베딩 마이크로 배처는 끄고 측정합니다. (반복 실행이 캐시 히트가 되지 않도록)
+
+실행 (프로젝트 루트에서, requirements.txt의 RAG 패키지 필요):
+    python -m app.benchmarks.bench_rag_search --sizes 4 16 64 --vectors 20000
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+try:
+    import numpy as np
+    import faiss
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import Embeddings
+except ImportError:  # 선택 의존성: RAG 패키지가 설치된 환경에서만 실행
+    np = None
+    faiss = None
+    Embeddings = object
+
+
+class SimulatedEmbeddings(Embeddings):
+    """원격 임베딩 API 대신 지연 시간만 흉내 내고 임의 벡터를 반환합니다."""
+
+    def __init__(self, dim: int, latency_ms: float, per_query_ms: float, seed: int = 0):
+        self.dim = dim
+        self.latency = latency_ms / 1000
+        self.per_query = per_query_ms / 1000
+        self.rng = np.random.default_rng(seed)
+        self.calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        time.sleep(self.latency + self.per_query * len(texts))
+        return self.rng.standard_normal((len(texts), self.dim), dtype=np.float32).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def build_vector_store(vectors: int, dim: int, embeddings: SimulatedEmbeddings, seed: int = 0) -> "FAISS":
+    """정규화 벡터의 내적(코사인) 평면 인덱스와 청크 docstore로 LangChain FAISS 벡터 스토어를 만듭니다."""
+    data = np.random.default_rng(seed).standard_normal((vectors, dim), dtype=np.float32)
+    faiss.normalize_L2(data)
+    index = faiss.IndexFlatIP(dim)
+    index.add(data)
+    docstore = InMemoryDocstore({
+        str(i): Document(page_content=f"chunk {i} " + "x" * 600, metadata={"file_name": f"book_{i % 20}.pdf"})
+        for i in range(vectors)
+    })
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id={i: str(i) for i in range(vectors)},
+    )
+
+
+def build_generator(vector_store: "FAISS"):
+    """
+    검색 경로에 필요한 속성만 채운 ContentGenerator를 만듭니다.
+
+    __init__은 Gemini API 키와 벡터 DB 경로가 필요하므로 호출하지 않습니다.
+    """
+    from app.services.generator import ContentGenerator
+
+    generator = ContentGenerator.__new__(ContentGenerator)
+    generator.vector_store = vector_store
+    generator.embedding_cache = None
+    generator.retrieval_cache = None
+    generator.embedding_batcher = None
+    return generator
+
+
+async def search_single(generator, queries: List[str], k: int) -> List[str]:
+    return [await generator.search_context(query, k) for query in queries]
+
+
+async def search_batched(generator, queries: List[str], k: int) -> List[str]:
+    return await generator.search_context_many(queries, k)
+
+
+async def run_size(generator, size: int, k: int, repeat: int) -> Dict[str, float]:
+    """같은 쿼리 N개를 두 방식으로 repeat번 검색하여 평균 시간(ms)과 FAISS 검색만의 시간을 잽니다."""
+    queries = [f"query {i}" for i in range(size)]
+    embeddings = generator.vector_store.embedding_function
+    timings = {"single": 0.0, "batched": 0.0}
+    calls = {"single": 0, "batched": 0}
+    for _ in range(repeat):
+        for name, search in (("single", search_single), ("batched", search_batched)):
+            before = embeddings.calls
+            started = time.perf_counter()
+            contexts = await search(generator, queries, k)
+            timings[name] += time.perf_counter() - started
+            calls[name] += embeddings.calls - before
+            if not all(contexts):
+                raise SystemExit(f"{name} search returned empty context (see logs)")
+
+    # 임베딩 지연을 뺀 FAISS 검색 자체 비교
+    index = generator.vector_store.index
+    vectors = np.random.default_rng(1).standard_normal((size, index.d), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for row in range(size):
+            index.search(vectors[row:row + 1], k)
+    faiss_single = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(repeat):
+        index.search(vectors, k)
+    faiss_batched = time.perf_counter() - started
+
+    return {
+        "single_ms": timings["single"] / repeat * 1000,
+        "batched_ms": timings["batched"] / repeat * 1000,
+        "single_embed_calls": calls["single"] / repeat,
+        "batched_embed_calls": calls["batched"] / repeat,
+        "faiss_single_ms": faiss_single / repeat * 1000,
+        "faiss_batched_ms": faiss_batched / repeat * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    print(f"vectors={args.vectors} dim={args.dim} k={args.k} "
+          f"embed_latency={args.embed_latency_ms}ms+{args.embed_per_query_ms}ms/query repeat={args.repeat}")
+    embeddings = SimulatedEmbeddings(args.dim, args.embed_latency_ms, args.embed_per_query_ms)
+    generator = build_generator(build_vector_store(args.vectors, args.dim, embeddings))
+    for size in args.sizes:
+        result = await run_size(generator, size, args.k, args.repeat)
+        print(
+            f"N={size:>3}: search_context x N={result['single_ms']:>9.1f}ms "
+            f"({result['single_embed_calls']:.0f} embed calls) "
+            f"search_context_many={result['batched_ms']:>8.1f}ms ({result['batched_embed_calls']:.0f} embed call) "
+            f"({result['single_ms'] / result['batched_ms']:.1f}x) | "
+            f"faiss only: single={result['faiss_single_ms']:>7.2f}ms batched={result['faiss_batched_ms']:>6.2f}ms "
+            f"({result['faiss_single_ms'] / max(result['faiss_batched_ms'], 1e-9):.1f}x)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RAG search_context vs search_context_many benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64], help="한 번에 검색할 쿼리 수 N")
+    parser.add_argument("--vectors", type=int, default=20000, help="인덱스 벡터 수 (청크 수)")
+    parser.add_argument("--dim", type=int, default=768, help="임베딩 차원 (text-embedding-004: 768)")
+    parser.add_argument("--k", type=int, default=3, help="쿼리당 결과 수")
+    parser.add_argument("--embed-latency-ms", type=float, default=80.0, help="임베딩 요청당 지연 (0이면 검색 코드만 비교)")
+    parser.add_argument("--embed-per-query-ms", type=float, default=0.5, help="임베딩 쿼리당 추가 지연")
+    parser.add_argument("--repeat", type=int, default=3, help="크기별 반복 횟수")
+    args = parser.parse_args()
+
+    if np is None or faiss is None:
+        raise SystemExit("numpy, faiss and langchain-community are required (pip install -r requirements.txt)")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
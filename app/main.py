@@ -12,14 +12,17 @@ API 엔드포인트:
 - POST /generate-objectives: 학습 목표 제안
 - POST /generate-course: 커리큘럼 생성
 - POST /generate-chapter-content: 챕터 상세 콘텐츠 생성
+- POST /generate-chapter-content/stream: 챕터 상세 콘텐츠 스트리밍 생성 (SSE)
 - POST /grade-quiz: 퀴즈 채점
 - GET /courses: 코스 목록 조회
+- GET /metrics: 캐시/생성 작업 운영 지표
+- GET /history/stats: 일별/요청 종류별 생성 통계 (오래된 기간은 집계 테이블에서 조회)
 - 기타 관리 엔드포인트들
 
 작성자: PopPins II 개발팀
 버전: 1.0.0
 """
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Response, Header
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Any
@@ -27,23 +30,40 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import logging
 from logging.handlers import RotatingFileHandler
 import json
 
 # DB imports
-from sqlalchemy.orm import Session
-from app.database import engine, Base, get_db
-from app.models import GenerationLog, QuizResult, UserFeedback, Course as DBCourse, Chapter as DBChapter, UserPreference
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, configure_mappers
+from app.database import engine, async_engine, Base, get_db, get_async_db, get_read_db, AsyncSessionLocal
+from app.models import GenerationLog, QuizResult, UserFeedback, Course as DBCourse, Chapter as DBChapter, ChapterSection, UserPreference
 
 # Import ContentGenerator service
 from app.services.generator import ContentGenerator
+from app.services.llm_scheduler import llm_priority, PRIORITY_BULK
+from app.services.llm_cache import llm_cache_bypass
+from app.services.db_maintenance import DatabaseMaintenance, generation_log_daily_stats
 
 # Import utility functions
-from app.utils.cache import create_chapter_cache_key
+from app.utils.cache import create_chapter_cache_key, TieredCache
+from app.utils.singleflight import SingleFlight
+from app.utils.pagination import decode_cursor, keyset_before, split_page
+from app.migrations import run_migrations, migration_status
 from app.utils.errors import validate_generator_initialized, handle_generation_error, validate_async_results
-from app.utils.db_helpers import save_course_to_db, save_chapter_content_to_db, calculate_course_progress
+from app.utils.db_helpers import (
+    save_course_to_db_async,
+    save_chapter_content_to_db_async,
+    load_chapter_content_from_db_async,
+    course_progress_from_counts,
+    list_courses_with_progress,
+    load_course_chapter_summaries,
+    load_generation_log_payload,
+    load_chapter_section_from_db,
+    CHAPTER_SECTIONS,
+)
 
 # 환경 변수 로드 (.env 파일에서)
 load_dotenv()
@@ -101,16 +121,33 @@ app.add_middleware(
     allow_credentials=True,  # 쿠키/인증 정보 허용
     allow_methods=["*"],  # 모든 HTTP 메서드 허용 (GET, POST, DELETE 등)
     allow_headers=["*"],  # 모든 헤더 허용
-    expose_headers=["Content-Disposition"],  # 파일 다운로드 시 파일명 확인을 위해 필요
+    expose_headers=["Content-Disposition", "X-Next-Cursor", "ETag"],  # 다운로드 파일명, 커서 페이지네이션 다음 커서, 섹션 콘텐츠 해시
 )
 
 # ============================================================================
 # 데이터베이스 초기화
 # ============================================================================
+# 모델 관계(relationship/back_populates) 설정 오류를 첫 쿼리가 아닌 시작 시점에 드러냄
+configure_mappers()
+
 # SQLAlchemy 모델을 기반으로 데이터베이스 테이블 생성
 # 이미 테이블이 존재하면 무시됨
 Base.metadata.create_all(bind=engine)
 
+# 기존 DB에 새 인덱스 등 스키마 변경 적용 (create_all은 기존 테이블을 바꾸지 않음)
+# DB_AUTO_MIGRATE=false이면 배포 단계에서 `python -m app.migrations upgrade`로 직접 실행
+if os.getenv("DB_AUTO_MIGRATE", "true").lower() == "true":
+    try:
+        run_migrations(engine)
+    except Exception as e:
+        logger.error(f"스키마 마이그레이션 실패: {e}", exc_info=True)
+
+# 생성 이력 집계/보존 기간 정리, VACUUM, ANALYZE (DB_MAINTENANCE_WINDOW 시간대에만 실행)
+# 여러 워커가 각자 실행해도 그룹 단위 트랜잭션이라 중복 집계되지 않음
+db_maintenance = DatabaseMaintenance.from_env()
+if os.getenv("DB_MAINTENANCE_ENABLED", "true").lower() == "true":
+    db_maintenance.start()
+
 # ============================================================================
 # ContentGenerator 초기화
 # ============================================================================
@@ -146,19 +183,32 @@ except Exception as e:
     logger.error("  3. Network connectivity issues")
     generator = None  # None으로 설정하여 초기화 실패 상태 표시
 
+# 챕터 생성 모드 (선택사항)
+# true: 개념/실습/퀴즈/심화 학습을 한 번의 Gemini 호출로 생성 (generate_chapter_bundle)
+# false: 섹션별로 4번 병렬 호출 (기본값)
+USE_CHAPTER_BUNDLE = os.getenv("USE_CHAPTER_BUNDLE", "false").lower() == "true"
+
 # ============================================================================
-# 메모리 캐시
+# 챕터 캐시
 # ============================================================================
-# 챕터 콘텐츠를 메모리에 캐시하여 동일한 요청 시 재생성 방지
+# 챕터 콘텐츠를 캐시하여 동일한 요청 시 재생성 방지
 # 키: 문자열 (create_chapter_cache_key로 생성)
-# 값: ChapterContent 객체
-# 주의: 서버 재시작 시 캐시는 초기화됨 (영구 저장을 원하면 Redis 등 사용)
-# 변경 이유: 튜플 키 대신 문자열 키 사용으로 해시 계산 비용 절감
-# 타입 힌트는 나중에 정의되는 ChapterContent를 참조하므로 문자열로 처리
-from typing import TYPE_CHECKING
-if TYPE_CHECKING:
-    from app.main import ChapterContent
-chapter_cache: dict[str, 'ChapterContent'] = {}
+# 값: ChapterContent.model_dump() JSON
+# - 메모리 계층: 바이트 기준 LRU + TTL (CHAPTER_CACHE_MAX_MB, CHAPTER_CACHE_TTL_SECONDS)
+# - 디스크 계층: SQLite 파일 (CHAPTER_CACHE_PATH), 서버 재시작/배포 후에도 유지
+#   CHAPTER_CACHE_PATH를 빈 값으로 설정하면 메모리 전용으로 동작
+chapter_cache = TieredCache(
+    "chapter",
+    max_memory_bytes=int(float(os.getenv("CHAPTER_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    ttl_seconds=float(os.getenv("CHAPTER_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+    disk_path=os.getenv("CHAPTER_CACHE_PATH", "./cache/chapter_cache.db") or None,
+    max_disk_bytes=int(float(os.getenv("CHAPTER_CACHE_DISK_MAX_MB", "1024")) * 1024 * 1024)
+)
+
+# 진행 중인 챕터 생성 작업 (키: 챕터 캐시 키)
+# 같은 챕터에 대한 동시 요청(여러 탭, 같은 반 학생들, 다운로드 엔드포인트)은 하나의 생성 작업을 공유
+# 공유 작업은 첫 요청의 우선순위(예: /generate-study-material의 bulk)를 물려받지 않고 호출 종류별 기본 우선순위로 실행
+chapter_flights = SingleFlight(isolate_context=True)
 
 
 # ============================================================================
@@ -335,6 +385,18 @@ class HistoryDetail(HistoryItem):
     generated_content: str
 
 
+class HistoryStatsItem(BaseModel):
+    day: str  # UTC 날짜 (YYYY-MM-DD)
+    request_type: str
+    count: int
+    latency_samples: int
+    latency_p50_ms: Optional[int] = None
+    latency_p95_ms: Optional[int] = None
+    latency_p99_ms: Optional[int] = None
+    payload_bytes: int
+    source: str  # rollup: 집계 테이블, raw: 원본 로그, mixed: 둘 다
+
+
 class ObjectiveItem(BaseModel):
     id: int
     title: str
@@ -350,6 +412,7 @@ class FeedbackRequest(BaseModel):
     chapter_title: str
     rating: int  # 1-5
     comment: Optional[str] = None
+    course_title: Optional[str] = None  # 학습 컨텍스트 범위 (코스별)
 
 
 class QuizResultItem(BaseModel):
@@ -456,7 +519,7 @@ async def generate_objectives(request: StudyTopicRequest):
 
 
 @app.post("/generate-course", response_model=CourseResponse)
-async def generate_course_only(request: StudyTopicRequest, db: Session = Depends(get_db)):
+async def generate_course_only(request: StudyTopicRequest, db: AsyncSession = Depends(get_async_db)):
     """
     1단계: 커리큘럼(목차)만 먼저 생성합니다.
     
@@ -475,17 +538,17 @@ async def generate_course_only(request: StudyTopicRequest, db: Session = Depends
             - max_chapters: 최대 챕터 수
             - selected_objective: 선택된 학습 목표 (선택사항)
             - language: 출력 언어
-        db (Session): 데이터베이스 세션 (FastAPI 의존성 주입)
+        db (AsyncSession): 비동기 데이터베이스 세션 (FastAPI 의존성 주입)
     
     Returns:
         CourseResponse: 생성된 커리큘럼 정보
             - course:
-                - id: 데이터베이스에 저장된 코스 ID
+                - id: 데이터베이스에 저장된 코스 ID (저장 실패 시 0)
                 - topic: 코스 제목
                 - description: 코스 설명
                 - level: 난이도
                 - chapters: 챕터 목록
-                    - chapterId: 챕터 ID
+                    - chapterId: 챕터 ID (저장 실패 시 0, 이 경우 챕터 요청에 chapter_id를 보내지 않음)
                     - chapterTitle: 챕터 제목
                     - chapterDescription: 챕터 설명
     
@@ -542,7 +605,7 @@ async def generate_course_only(request: StudyTopicRequest, db: Session = Depends
         )
         
         # 데이터베이스에 저장 (헬퍼 함수 사용 - 중복 제거)
-        course_id = save_course_to_db(
+        saved = await save_course_to_db_async(
             db=db,
             topic=request.topic,
             description=course_description,
@@ -550,9 +613,16 @@ async def generate_course_only(request: StudyTopicRequest, db: Session = Depends
             chapters_data=result["course"]["chapters"]
         )
         
-        # 저장 성공 시 ID 반영 (실패해도 응답은 반환)
-        if course_id:
-            result["course"]["id"] = course_id
+        # 저장 성공 시 코스/챕터 ID를 DB 기본 키로 반영 (실패해도 응답은 반환)
+        # 이후 챕터 요청은 chapter_id로 저장된 콘텐츠를 바로 조회할 수 있음
+        # 저장에 실패하면 모델이 매긴 순번이 다른 코스의 기본 키로 쓰이지 않도록 ID를 0으로 비움
+        if saved:
+            course_id, chapter_ids = saved
+        else:
+            course_id, chapter_ids = 0, [0] * len(result["course"]["chapters"])
+        result["course"]["id"] = course_id
+        for chapter, chapter_id in zip(result["course"]["chapters"], chapter_ids):
+            chapter["chapterId"] = chapter_id
             
         return CourseResponse(**result)
     except HTTPException:
@@ -567,10 +637,276 @@ class ChapterRequest(BaseModel):
     chapter_title: str
     chapter_description: str
     chapter_index: Optional[int] = None
+    chapter_id: Optional[int] = None  # 챕터 ID (DB 기본 키, 있으면 저장된 콘텐츠를 먼저 조회)
     force_refresh: Optional[bool] = False  # 강제 재생성 여부
 
+
+async def _get_cached_chapter(cache_key: str, chapter_id: Optional[int] = None) -> Optional[ChapterContent]:
+    """챕터 캐시(메모리 → 디스크)에서 콘텐츠를 조회합니다. 없으면 None. (디스크 계층은 thread pool에서 조회)"""
+    data = await chapter_cache.aget_json(cache_key)
+    if data is None:
+        return None
+    try:
+        content = ChapterContent(**data)
+    except Exception as error:
+        logger.warning(f"캐시된 챕터 콘텐츠 형식 오류로 무시합니다: {error}")
+        await chapter_cache.adelete(cache_key)
+        return None
+    if chapter_id is not None:
+        content.chapter.chapterId = chapter_id  # 같은 제목의 다른 코스 챕터가 캐시를 공유할 수 있음
+    return content
+
+
+async def _load_chapter_from_db(request: ChapterRequest, cache_key: str) -> Optional[ChapterContent]:
+    """
+    DB에 저장된 챕터 콘텐츠(chapter_sections)를 기본 키로 조회합니다. (생성 전 read-through)
+
+    요청한 코스/챕터 제목과 일치하는 챕터만 조회하고, 성공하면 챕터 캐시도 채웁니다.
+    저장된 콘텐츠가 없거나, 제목이 다르거나, 불완전하면 None.
+    """
+    chapter_id = request.chapter_id
+    async with AsyncSessionLocal() as db:
+        data = await load_chapter_content_from_db_async(db, chapter_id, request.chapter_title, request.course_title)
+    if data is None:
+        return None
+    try:
+        content = ChapterContent(**data)
+    except Exception as error:
+        logger.warning(f"저장된 챕터 콘텐츠 형식 오류로 재생성합니다: ID {chapter_id} - {error}")
+        return None
+    await chapter_cache.aset_json(cache_key, content.model_dump())
+    return content
+
+
+async def _finalize_chapter_content(
+    request: ChapterRequest,
+    cache_key,
+    db: AsyncSession,
+    concept_data,
+    exercise_data,
+    quiz_data,
+    advanced_data
+) -> ChapterContent:
+    """
+    섹션별 생성 결과를 ChapterContent로 조립하고, 모두 성공한 경우 캐시와 DB에 저장합니다.
+
+    실패한 섹션(Exception)은 에러 안내 콘텐츠로 대체되며, 이 경우 캐시/DB 저장을 건너뜁니다.
+    일반 생성(/generate-chapter-content)과 스트리밍 생성(/generate-chapter-content/stream)이 공유합니다.
+    """
+    has_error = False
+
+    # 에러 처리
+    if isinstance(concept_data, Exception):
+        logger.error(f"Concept generation failed: {concept_data}")
+        concept_data = {"title": "Error", "description": "Failed to generate concept", "contents": "Error occurred."}
+        has_error = True
+    
+    if isinstance(exercise_data, Exception):
+        logger.error(f"Exercise generation failed: {exercise_data}")
+        exercise_data = {"title": "Error", "description": "Failed to generate exercise", "contents": "Error occurred."}
+        has_error = True
+        
+    if isinstance(quiz_data, Exception):
+        logger.error(f"Quiz generation failed: {quiz_data}")
+        quiz_data = {"quizes": []}
+        has_error = True
+
+    if isinstance(advanced_data, Exception):
+        logger.error(f"Advanced learning generation failed: {advanced_data}")
+        advanced_data = {"quizes": [{"quiz": "Error: Failed to generate advanced learning content."}]}
+        has_error = True
+
+    logger.info(f"챕터 콘텐츠 생성 완료: {request.chapter_title}")
+
+    # 5. 응답 생성
+    result = ChapterContent(
+        chapter=Chapter(
+            chapterId=request.chapter_id or 0,  # chapter_id 없이 요청한 경우 0
+            chapterTitle=request.chapter_title,
+            chapterDescription=request.chapter_description
+        ),
+        concept=ConceptResponse(**concept_data),
+        exercise=ExerciseResponse(**exercise_data),
+        quiz=QuizResponse(**quiz_data),
+        advanced_learning=AdvancedLearningResponse(**advanced_data)
+    )
+
+    # 캐시에 저장 (에러가 없을 때만)
+    if not has_error:
+        await chapter_cache.aset_json(cache_key, result.model_dump())
+        logger.debug(f"캐시에 저장: {request.chapter_title}")
+        
+        # DB에 저장 (기본 키 조회, chapter_id 없이 요청한 경우 저장 대상 챕터를 특정할 수 없어 건너뜀)
+        if request.chapter_id is not None:
+            await save_chapter_content_to_db_async(
+                db=db,
+                chapter_id=request.chapter_id,
+                chapter_title=request.chapter_title,
+                course_title=request.course_title,
+                concept_data=concept_data,
+                exercise_data=exercise_data,
+                quiz_data=quiz_data,
+                advanced_data=advanced_data
+            )
+        else:
+            logger.debug(f"chapter_id가 없어 DB 저장을 건너뜁니다: {request.chapter_title}")
+    else:
+        logger.warning(f"생성 중 에러가 발생하여 캐시/DB 저장을 건너뜁니다: {request.chapter_title}")
+
+    return result
+
+
+async def _generate_chapter_content(request: ChapterRequest, cache_key) -> ChapterContent:
+    """
+    챕터의 4개 섹션을 생성하고 캐시/DB에 저장합니다.
+
+    chapter_flights를 통해 호출되므로 같은 캐시 키의 동시 요청은 이 작업 하나를 공유합니다.
+    """
+    logger.info(f"챕터 콘텐츠 생성 시작 (Force Refresh: {request.force_refresh}): {request.chapter_title}")
+    try:
+        # Fetch learning context (adaptive learning)
+        learning_context = generator.get_learning_context(request.course_title, request.chapter_title)
+        if learning_context:
+            logger.info(f"학습 컨텍스트 적용: {len(learning_context)} chars")
+
+        # 4. 콘텐츠 생성
+        # 강제 재생성이면 LLM 응답 캐시도 건너뜀 (새 응답으로 덮어씀)
+        with llm_cache_bypass(request.force_refresh):
+            if USE_CHAPTER_BUNDLE:
+                # 통합 모드: 4개 섹션을 한 번의 호출로 생성 (깨진 섹션만 섹션별 생성으로 폴백)
+                bundle = await generator.generate_chapter_bundle(
+                    request.course_title, request.course_description,
+                    request.chapter_title, request.chapter_description,
+                    learning_context
+                )
+                results = (bundle["concept"], bundle["exercise"], bundle["quiz"], bundle["advanced_learning"])
+            else:
+                # 4개 섹션의 참고 자료를 배치 임베딩 1회 + FAISS 검색 1회로 미리 가져옴
+                retrieval_plan = await generator.plan_chapter_retrieval(request.chapter_title, request.chapter_description)
+
+                concept_task = generator.generate_concept(
+                    request.course_title, request.course_description,
+                    request.chapter_title, request.chapter_description,
+                    learning_context, rag_context=retrieval_plan["concept"]
+                )
+                exercise_task = generator.generate_exercise(
+                    request.course_title, request.course_description,
+                    request.chapter_title, request.chapter_description,
+                    learning_context, rag_context=retrieval_plan["exercise"]
+                )
+                quiz_task = generator.generate_quiz(
+                    request.course_title, request.chapter_title,
+                    request.chapter_description, request.course_description,
+                    learning_context, rag_context=retrieval_plan["quiz"]
+                )
+                advanced_task = generator.generate_advanced_learning(
+                    request.course_title, request.chapter_title,
+                    request.chapter_description, request.course_description,
+                    learning_context, rag_context=retrieval_plan["advanced_learning"]
+                )
+
+                # 모든 태스크 병렬 실행
+                results = await asyncio.gather(concept_task, exercise_task, quiz_task, advanced_task, return_exceptions=True)
+
+        concept_data, exercise_data, quiz_data, advanced_data = results
+
+        # 공유 작업은 개별 요청의 세션보다 오래 살 수 있으므로 전용 세션으로 저장
+        async with AsyncSessionLocal() as db:
+            return await _finalize_chapter_content(
+                request, cache_key, db,
+                concept_data, exercise_data, quiz_data, advanced_data
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"챕터 콘텐츠 생성 중 예상치 못한 오류: {request.chapter_title} - {type(e).__name__}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"챕터 콘텐츠 생성 실패: {str(e)}")
+
+
+async def _stream_chapter_content(request: ChapterRequest, cache_key, events: asyncio.Queue) -> ChapterContent:
+    """
+    챕터의 4개 섹션을 생성하면서 진행 이벤트를 events 큐에 넣고, 완료되면 캐시/DB에 저장합니다.
+
+    _generate_chapter_content의 스트리밍 버전이며 chapter_flights를 통해 호출되므로,
+    같은 캐시 키의 다른 요청(스트리밍/일반)은 이 작업의 결과(ChapterContent)를 함께 기다립니다.
+
+    events 항목: (이벤트 이름, 데이터) 튜플, 작업이 끝나면(성공/실패) None
+    """
+    logger.info(f"챕터 콘텐츠 스트리밍 생성 시작: {request.chapter_title}")
+    try:
+        learning_context = generator.get_learning_context(request.course_title, request.chapter_title)
+        retrieval_plan = await generator.plan_chapter_retrieval(request.chapter_title, request.chapter_description)
+
+        results: dict = {}
+
+        async def run_concept():
+            try:
+                async for item in generator.stream_concept(
+                    request.course_title, request.course_description,
+                    request.chapter_title, request.chapter_description,
+                    learning_context, rag_context=retrieval_plan["concept"]
+                ):
+                    if item["type"] == "delta":
+                        await events.put(("concept_delta", {"text": item["text"]}))
+                    else:
+                        results["concept"] = item["data"]
+                        await events.put(("section", {"section": "concept", "data": item["data"]}))
+            except Exception as error:
+                results["concept"] = error
+                await events.put(("error", {"section": "concept", "detail": str(error)}))
+
+        async def run_section(section: str, make_coro):
+            try:
+                results[section] = await make_coro()
+                await events.put(("section", {"section": section, "data": results[section]}))
+            except Exception as error:
+                results[section] = error
+                await events.put(("error", {"section": section, "detail": str(error)}))
+
+        # 태스크는 생성 시점의 컨텍스트를 복사하므로, 강제 재생성이면 LLM 응답 캐시를 건너뛰도록 지정
+        with llm_cache_bypass(request.force_refresh):
+            tasks = [
+                asyncio.create_task(run_concept()),
+                asyncio.create_task(run_section("exercise", lambda: generator.generate_exercise(
+                    request.course_title, request.course_description,
+                    request.chapter_title, request.chapter_description,
+                    learning_context, rag_context=retrieval_plan["exercise"]
+                ))),
+                asyncio.create_task(run_section("quiz", lambda: generator.generate_quiz(
+                    request.course_title, request.chapter_title,
+                    request.chapter_description, request.course_description,
+                    learning_context, rag_context=retrieval_plan["quiz"]
+                ))),
+                asyncio.create_task(run_section("advanced_learning", lambda: generator.generate_advanced_learning(
+                    request.course_title, request.chapter_title,
+                    request.chapter_description, request.course_description,
+                    learning_context, rag_context=retrieval_plan["advanced_learning"]
+                ))),
+            ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        # 공유 작업은 개별 요청보다 오래 살 수 있으므로 전용 세션으로 저장
+        async with AsyncSessionLocal() as db:
+            return await _finalize_chapter_content(
+                request, cache_key, db,
+                results["concept"], results["exercise"], results["quiz"], results["advanced_learning"]
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"챕터 콘텐츠 스트리밍 생성 중 예상치 못한 오류: {request.chapter_title} - {type(e).__name__}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"챕터 콘텐츠 생성 실패: {str(e)}")
+    finally:
+        await events.put(None)
+
+
 @app.post("/generate-chapter-content", response_model=ChapterContent)
-async def generate_chapter_content_only(request: ChapterRequest, db: Session = Depends(get_db)):
+async def generate_chapter_content_only(request: ChapterRequest):
     """
     2단계: 특정 챕터의 상세 내용(개념, 실습, 퀴즈)을 생성합니다.
     
@@ -578,9 +914,11 @@ async def generate_chapter_content_only(request: ChapterRequest, db: Session = D
     개념 설명, 실습 과제, 퀴즈 문제를 병렬로 생성하여 성능을 최적화합니다.
     
     캐싱 전략:
-    1. 메모리 캐시 확인 (가장 빠름)
-    2. 없으면 AI 생성 (개념, 실습, 퀴즈 병렬 처리)
-    3. 생성 후 메모리 캐시 및 데이터베이스에 저장
+    1. 챕터 캐시 확인 (메모리 → 디스크)
+    2. chapter_id가 있으면 DB에 저장된 콘텐츠 확인 (기본 키 조회)
+    3. 같은 챕터가 이미 생성 중이면 그 작업의 결과를 함께 기다림 (single-flight)
+    4. 없으면 AI 생성 (개념, 실습, 퀴즈 병렬 처리)
+    5. 생성 후 캐시 및 데이터베이스에 저장
     
     Args:
         request (ChapterRequest): 챕터 콘텐츠 생성 요청
@@ -588,7 +926,7 @@ async def generate_chapter_content_only(request: ChapterRequest, db: Session = D
             - course_description: 코스 설명
             - chapter_title: 챕터 제목
             - chapter_description: 챕터 설명
-        db (Session): 데이터베이스 세션
+            - chapter_id: 챕터 ID (선택, DB 조회/저장에 사용)
     
     Returns:
         ChapterContent: 챕터의 전체 콘텐츠
@@ -605,6 +943,7 @@ async def generate_chapter_content_only(request: ChapterRequest, db: Session = D
     Performance:
         - 개념, 실습, 퀴즈를 asyncio.gather로 병렬 생성
         - 캐시 히트 시 즉시 반환 (AI 호출 없음)
+        - 동시에 들어온 동일 챕터 요청은 하나의 생성 작업을 공유 (/download-chapter 등 포함)
         - 학습 컨텍스트(최근 퀴즈 결과, 피드백)를 활용한 개인화
     
     Example:
@@ -637,118 +976,110 @@ async def generate_chapter_content_only(request: ChapterRequest, db: Session = D
     validate_generator_initialized(generator)
 
     # 캐시 키 생성 (튜플로 통일)
-    cache_key = (
+    cache_key = create_chapter_cache_key(
         request.course_title,
         request.chapter_title,
         request.chapter_description,
     )
 
     # 1. 메모리 캐시 확인 (force_refresh가 아닐 때만)
-    if not request.force_refresh and cache_key in chapter_cache:
-        logger.info(f"캐시에서 로드: {request.chapter_title}")
-        return chapter_cache[cache_key]
+    if not request.force_refresh:
+        cached = await _get_cached_chapter(cache_key, request.chapter_id)
+        if cached is not None:
+            logger.info(f"캐시에서 로드: {request.chapter_title}")
+            return cached
 
-    # 2. DB 확인 (이미 생성된 콘텐츠가 있는지)
-    # Note: This requires searching by title/course which might be ambiguous if multiple courses have same title.
-    # Ideally we should pass chapter_id, but the current frontend request doesn't send it.
-    # We will skip DB read for now and rely on generation/cache, but we WILL save to DB.
-    # Future improvement: Pass chapter_id in request.
+    # 2. DB 확인 (chapter_id가 있으면 기본 키로 저장된 콘텐츠 조회, 재시작 후에도 재생성 불필요)
+    if not request.force_refresh and request.chapter_id is not None:
+        stored = await _load_chapter_from_db(request, cache_key)
+        if stored is not None:
+            logger.info(f"DB에서 로드: {request.chapter_title} (ID: {request.chapter_id})")
+            return stored
 
-    logger.info(f"챕터 콘텐츠 생성 시작 (Force Refresh: {request.force_refresh}): {request.chapter_title}")
-    try:
-        # Fetch learning context (adaptive learning)
-        learning_context = generator.get_learning_context(request.course_title)
-        if learning_context:
-            logger.info(f"학습 컨텍스트 적용: {len(learning_context)} chars")
+    # 3. 동일한 챕터가 이미 생성 중이면 새로 생성하지 않고 그 결과를 기다림 (single-flight)
+    return await chapter_flights.do(cache_key, lambda: _generate_chapter_content(request, cache_key))
 
-        # 4. 콘텐츠 생성 (병렬 실행)
-        concept_task = generator.generate_concept(
-            request.course_title, request.course_description,
-            request.chapter_title, request.chapter_description,
-            learning_context
-        )
-        exercise_task = generator.generate_exercise(
-            request.course_title, request.course_description,
-            request.chapter_title, request.chapter_description,
-            learning_context
-        )
-        quiz_task = generator.generate_quiz(
-            request.course_title, request.chapter_title,
-            request.chapter_description, request.course_description,
-            learning_context
-        )
-        advanced_task = generator.generate_advanced_learning(
-            request.course_title, request.chapter_title,
-            request.chapter_description, request.course_description,
-            learning_context
-        )
 
-        # 모든 태스크 병렬 실행
-        results = await asyncio.gather(concept_task, exercise_task, quiz_task, advanced_task, return_exceptions=True)
+def _sse_event(event: str, data: Any) -> str:
+    """Server-Sent Events 형식의 이벤트 문자열을 만듭니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-        concept_data, exercise_data, quiz_data, advanced_data = results
 
-        has_error = False
+@app.post("/generate-chapter-content/stream")
+async def generate_chapter_content_stream(request: ChapterRequest):
+    """
+    챕터 콘텐츠를 Server-Sent Events(SSE)로 스트리밍 생성합니다.
 
-        # 에러 처리
-        if isinstance(concept_data, Exception):
-            logger.error(f"Concept generation failed: {concept_data}")
-            concept_data = {"title": "Error", "description": "Failed to generate concept", "contents": "Error occurred."}
-            has_error = True
-        
-        if isinstance(exercise_data, Exception):
-            logger.error(f"Exercise generation failed: {exercise_data}")
-            exercise_data = {"title": "Error", "description": "Failed to generate exercise", "contents": "Error occurred."}
-            has_error = True
-            
-        if isinstance(quiz_data, Exception):
-            logger.error(f"Quiz generation failed: {quiz_data}")
-            quiz_data = {"quizes": []}
-            has_error = True
-
-        if isinstance(advanced_data, Exception):
-            logger.error(f"Advanced learning generation failed: {advanced_data}")
-            advanced_data = {"quizes": [{"quiz": "Error: Failed to generate advanced learning content."}]}
-            has_error = True
-
-        logger.info(f"챕터 콘텐츠 생성 완료: {request.chapter_title}")
-
-        # 5. 응답 생성
-        result = ChapterContent(
-            chapter=Chapter(
-                chapterId=0,  # 임시 ID (실제 DB 연동 시 변경)
-                chapterTitle=request.chapter_title,
-                chapterDescription=request.chapter_description
-            ),
-            concept=ConceptResponse(**concept_data),
-            exercise=ExerciseResponse(**exercise_data),
-            quiz=QuizResponse(**quiz_data),
-            advanced_learning=AdvancedLearningResponse(**advanced_data)
-        )
+    /generate-chapter-content는 4개 섹션이 모두 끝나야 응답하지만, 이 엔드포인트는
+    개념 설명 마크다운을 토큰이 도착하는 대로 전달하고 각 섹션이 끝날 때마다 이벤트를 보냅니다.
 
-        # 캐시에 저장 (에러가 없을 때만)
-        if not has_error:
-            chapter_cache[cache_key] = result
-            logger.debug(f"캐시에 저장: {request.chapter_title}")
-            
-            # DB에 저장 (헬퍼 함수 사용 - 중복 제거 및 가독성 향상)
-            save_chapter_content_to_db(
-                db=db,
-                course_title=request.course_title,
-                chapter_title=request.chapter_title,
-                concept_data=concept_data,
-                exercise_data=exercise_data,
-                quiz_data=quiz_data
-            )
+    이벤트 종류:
+        - concept_delta: {"text": "..."} 개념 설명 contents의 새로 도착한 부분
+        - section: {"section": "concept" | "exercise" | "quiz" | "advanced_learning", "data": {...}}
+        - error: {"section": "...", "detail": "..."} 해당 섹션 생성 실패 (나머지 섹션은 계속 진행)
+        - done: ChapterContent 전체 (/generate-chapter-content 응답과 동일한 형식)
+
+    Note:
+        - 캐시 히트 시 section 이벤트와 done 이벤트를 즉시 보냅니다
+        - 같은 챕터가 이미 생성 중이면(스트리밍/일반) 그 작업이 끝난 뒤 section/done 이벤트를 보냅니다
+        - 스트리밍 생성도 chapter_flights에 등록되므로, 생성 중 들어온 같은 챕터의 요청은 LLM을 다시 호출하지 않습니다
+        - 저장 규칙(에러가 없을 때만 캐시/DB 저장)은 일반 생성 엔드포인트와 같습니다
+        - POST 요청이므로 브라우저에서는 EventSource 대신 fetch 스트림으로 읽어야 합니다
+    """
+    from fastapi.responses import StreamingResponse
+
+    validate_generator_initialized(generator)
+
+    cache_key = create_chapter_cache_key(
+        request.course_title,
+        request.chapter_title,
+        request.chapter_description,
+    )
+
+    async def event_stream():
+        cached = None if request.force_refresh else await _get_cached_chapter(cache_key, request.chapter_id)
+        if cached is not None:
+            logger.info(f"캐시에서 로드 (stream): {request.chapter_title}")
+        elif not request.force_refresh and request.chapter_id is not None and (
+            cached := await _load_chapter_from_db(request, cache_key)
+        ) is not None:
+            logger.info(f"DB에서 로드 (stream): {request.chapter_title} (ID: {request.chapter_id})")
+
+        if cached is not None:
+            for section in ("concept", "exercise", "quiz", "advanced_learning"):
+                yield _sse_event("section", {"section": section, "data": getattr(cached, section).model_dump()})
+            yield _sse_event("done", cached.model_dump())
+            return
+
+        # 스트리밍 생성도 chapter_flights에 등록하여, 같은 챕터의 다른 요청(스트리밍/일반)은 이 작업의 결과를 기다림
+        # 이미 생성 중이면 그 작업이 끝난 뒤 section/done 이벤트를 보냄
+        events: asyncio.Queue = asyncio.Queue()
+        task, started = chapter_flights.start(
+            cache_key, lambda: _stream_chapter_content(request, cache_key, events)
+        )
+        if started:
+            while (item := await events.get()) is not None:
+                yield _sse_event(*item)
         else:
-            logger.warning(f"생성 중 에러가 발생하여 캐시/DB 저장을 건너뜁니다: {request.chapter_title}")
+            logger.info(f"진행 중인 생성 작업 결과 대기 (stream): {request.chapter_title}")
 
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"챕터 콘텐츠 생성 중 예상치 못한 오류: {request.chapter_title} - {type(e).__name__}: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"챕터 콘텐츠 생성 실패: {str(e)}")
+        # 클라이언트 연결이 끊겨도 공유 작업은 계속 진행되어 캐시/DB에 저장됨 (다른 대기자에게 결과 전달)
+        try:
+            result = await asyncio.shield(task)
+        except HTTPException as error:
+            yield _sse_event("error", {"section": None, "detail": error.detail})
+            return
+
+        if not started:
+            for section in ("concept", "exercise", "quiz", "advanced_learning"):
+                yield _sse_event("section", {"section": section, "data": getattr(result, section).model_dump()})
+        yield _sse_event("done", result.model_dump())
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # 기존 엔드포인트 (하위 호환성 유지)
@@ -756,24 +1087,38 @@ async def generate_chapter_content_only(request: ChapterRequest, db: Session = D
 async def generate_study_material(request: StudyTopicRequest):
     """
     공부 주제를 입력받아 자습 과제를 생성합니다. (일괄 생성 - 느림)
+
+    일괄 생성이므로 커리큘럼 생성 등 이 요청만의 모델 호출은 bulk 우선순위로 실행하여,
+    동시에 들어온 대화형 요청(채점, 챕터 열람)이 먼저 처리되도록 합니다.
+    챕터 콘텐츠 생성은 다른 사용자가 합류할 수 있는 공유 작업(chapter_flights)이므로 기본 우선순위로 실행됩니다.
     """
     try:
-        # 1. 강의 커리큘럼 생성
-        course_response = await generate_course_only(request)
-        course = course_response.course
-
-        # 2. 각 챕터별 콘텐츠 생성
-        chapters_content = []
-        for chapter in course.chapters:
-            chapter_request = ChapterRequest(
-                course_title=request.topic,
-                course_description=request.course_description or request.topic,
-                chapter_title=chapter.chapterTitle,
-                chapter_description=chapter.chapterDescription,
-            )
-
-            content = await generate_chapter_content_only(chapter_request)
-            chapters_content.append(content)
+        with llm_priority(PRIORITY_BULK):
+            # 1. 강의 커리큘럼 생성 (엔드포인트 함수를 직접 호출하므로 DB 세션도 직접 전달)
+            async with AsyncSessionLocal() as db:
+                course_response = await generate_course_only(request, db)
+            course = course_response.course
+
+            # 모든 챕터의 참고 자료를 한 번의 배치 검색으로 미리 가져와 검색 결과 캐시에 저장
+            # (아래 챕터별 생성의 plan_chapter_retrieval은 캐시에서 바로 반환)
+            if generator.retrieval_cache is not None:
+                await generator.plan_chapter_retrievals(
+                    [(chapter.chapterTitle, chapter.chapterDescription) for chapter in course.chapters]
+                )
+
+            # 2. 각 챕터별 콘텐츠 생성
+            chapters_content = []
+            for chapter in course.chapters:
+                chapter_request = ChapterRequest(
+                    course_title=request.topic,
+                    course_description=request.course_description or request.topic,
+                    chapter_title=chapter.chapterTitle,
+                    chapter_description=chapter.chapterDescription,
+                    chapter_id=chapter.chapterId or None,  # 코스 저장 실패 시 0 (DB 조회/저장 건너뜀)
+                )
+
+                content = await generate_chapter_content_only(chapter_request)
+                chapters_content.append(content)
 
         return StudyMaterialResponse(course=course, chapters=chapters_content)
     except Exception as e:
@@ -797,6 +1142,71 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.on_event("shutdown")
+def flush_generation_logs():
+    """서버 종료 시 큐에 남은 생성 로그를 모두 저장합니다."""
+    if generator:
+        generator.log_writer.stop()
+
+
+@app.on_event("shutdown")
+def stop_db_maintenance():
+    """서버 종료 시 DB 유지보수 스레드를 멈춥니다."""
+    db_maintenance.stop()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """서버 종료 시 비동기 DB 엔진의 연결을 정리합니다."""
+    await async_engine.dispose()
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    캐시 및 생성 작업 관련 운영 지표를 반환합니다.
+
+    Returns:
+        dict:
+            - chapter_cache: 챕터 캐시 계층별 히트/미스/제거 카운터, 메모리 사용량
+            - chapter_flights: 진행 중/시작/병합된 챕터 생성 작업 수
+            - llm_scheduler: 우선순위별 대기열 길이/대기 시간, 동시성 한도, 429 횟수, RPM/TPM 잔량
+            - llm_retry: 재시도/타임아웃/헤징 횟수
+            - llm_response_cache: 응답 캐시 히트/미스, 동일 프롬프트 병합 통계 (비활성화 시 None)
+            - generation_log_writer: 생성 로그 큐 길이, 저장/버림/실패 행 수
+            - learning_context: 학습 컨텍스트 요약 기록/조회 횟수, 코스/챕터 범위 수
+            - embedding_cache: 검색 쿼리 임베딩 캐시 히트율, 원격 임베딩 호출 수 (RAG/캐시 비활성화 시 None)
+            - retrieval_cache: 검색 결과 캐시 히트율, 현재 인덱스 버전 (RAG/캐시 비활성화 시 None)
+            - embedding_batcher: 요청 간 임베딩 배치 수, 평균 배치 크기 (RAG/배처 비활성화 시 None)
+              (생성기 초기화 실패 시 None)
+            - db_maintenance: 집계/삭제한 로그 수, vacuum/ANALYZE 횟수, 마지막 실행 결과
+    """
+    return {
+        "chapter_cache": chapter_cache.stats(),
+        "chapter_flights": chapter_flights.stats(),
+        "llm_scheduler": generator.scheduler.stats() if generator else None,
+        "llm_retry": generator.retry_policy.stats() if generator else None,
+        "llm_response_cache": generator.response_cache.stats() if generator and generator.response_cache else None,
+        "generation_log_writer": generator.log_writer.stats() if generator else None,
+        "learning_context": generator.learning_context.stats() if generator else None,
+        "embedding_cache": generator.embedding_cache.stats() if generator and generator.embedding_cache else None,
+        "retrieval_cache": generator.retrieval_cache.stats() if generator and generator.retrieval_cache else None,
+        "embedding_batcher": generator.embedding_batcher.stats() if generator and generator.embedding_batcher else None,
+        "db_maintenance": db_maintenance.stats(),
+    }
+
+
+@app.get("/migrations/status")
+def get_migration_status():
+    """
+    DB 스키마 마이그레이션 상태를 반환합니다.
+
+    Returns:
+        dict: current_version, latest_version, applied(적용 시각 포함), pending 목록
+    """
+    return migration_status(engine)
+
+
 # 챕터 다운로드 엔드포인트
 @app.post("/download-chapter", response_model=DownloadResponse)
 async def download_chapter(request: ChapterRequest):
@@ -804,15 +1214,14 @@ async def download_chapter(request: ChapterRequest):
     챕터 콘텐츠를 Markdown 형식으로 반환합니다.
     """
     # 캐시에서 가져오거나 생성
-    cache_key = (
+    cache_key = create_chapter_cache_key(
         request.course_title,
         request.chapter_title,
         request.chapter_description,
     )
 
-    if cache_key in chapter_cache:
-        content = chapter_cache[cache_key]
-    else:
+    content = await _get_cached_chapter(cache_key, request.chapter_id)
+    if content is None:
         # 없으면 생성
         content = await generate_chapter_content_only(request)
 
@@ -886,15 +1295,14 @@ async def download_chapter_scorm(request: ChapterRequest):
     from app.services.scorm_service import ScormService
     
     # 캐시에서 가져오거나 생성
-    cache_key = (
+    cache_key = create_chapter_cache_key(
         request.course_title,
         request.chapter_title,
         request.chapter_description,
     )
 
-    if cache_key in chapter_cache:
-        content = chapter_cache[cache_key]
-    else:
+    content = await _get_cached_chapter(cache_key, request.chapter_id)
+    if content is None:
         content = await generate_chapter_content_only(request)
 
     # SCORM 패키지 생성
@@ -934,10 +1342,11 @@ class QuizGradingRequest(BaseModel):
     answer: str
     chapter_title: str
     chapter_description: str
+    course_title: Optional[str] = None  # 학습 컨텍스트 범위 (코스별)
 
 
 @app.post("/grade-quiz")
-async def grade_quiz(request: QuizGradingRequest, db: Session = Depends(get_db)):
+async def grade_quiz(request: QuizGradingRequest, db: AsyncSession = Depends(get_async_db)):
     """
     퀴즈 답안을 AI로 채점하고 결과를 저장합니다.
     
@@ -959,6 +1368,7 @@ async def grade_quiz(request: QuizGradingRequest, db: Session = Depends(get_db))
         # 채점 결과를 DB에 저장 (에러 발생해도 응답은 반환)
         try:
             quiz_result = QuizResult(
+                course_title=request.course_title,
                 chapter_title=request.chapter_title,
                 score=grading_result.get("score", 0),
                 weak_points=json.dumps(grading_result.get("improvements", []), ensure_ascii=False),
@@ -968,11 +1378,18 @@ async def grade_quiz(request: QuizGradingRequest, db: Session = Depends(get_db))
                 timestamp=datetime.now(timezone.utc)
             )
             db.add(quiz_result)
-            db.commit()
+            await db.commit()
             logger.info(f"퀴즈 채점 결과 저장 완료: {request.chapter_title}")
+            # 저장된 결과를 학습 컨텍스트 요약에 반영 (다음 챕터 생성부터 사용)
+            generator.learning_context.record_quiz(
+                quiz_result.chapter_title,
+                quiz_result.score,
+                quiz_result.weak_points,
+                course_title=request.course_title
+            )
         except Exception as db_error:
             logger.error(f"퀴즈 채점 결과 저장 실패: {db_error}", exc_info=True)
-            db.rollback()
+            await db.rollback()
 
         return grading_result
     except HTTPException:
@@ -994,6 +1411,7 @@ def submit_feedback(request: FeedbackRequest, db: Session = Depends(get_db)):
             - chapter_title: 챕터 제목
             - rating: 평점 (1-5)
             - comment: 코멘트 (선택사항)
+            - course_title: 코스 제목 (선택사항, 코스별 학습 컨텍스트에 사용)
         db (Session): 데이터베이스 세션
     
     Returns:
@@ -1021,6 +1439,7 @@ def submit_feedback(request: FeedbackRequest, db: Session = Depends(get_db)):
     """
     try:
         feedback = UserFeedback(
+            course_title=request.course_title,
             chapter_title=request.chapter_title,
             rating=request.rating,
             comment=request.comment,
@@ -1028,19 +1447,71 @@ def submit_feedback(request: FeedbackRequest, db: Session = Depends(get_db)):
         )
         db.add(feedback)
         db.commit()
+        if generator:
+            generator.learning_context.record_feedback(
+                request.chapter_title,
+                request.rating,
+                request.comment,
+                course_title=request.course_title
+            )
         return {"status": "success", "message": "Feedback saved"}
     except Exception as e:
         logger.error(f"피드백 저장 실패: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"피드백 저장 실패: {str(e)}")
 
 
+# 커서 페이지네이션 응답 헤더 (다음 페이지가 없으면 생략)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _parse_cursor(cursor: Optional[str]):
+    """쿼리 파라미터 cursor를 (시각, id)로 변환합니다. 형식이 잘못되면 400."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _paginate_latest(query, timestamp_column, id_column, skip: int, limit: int, cursor: Optional[str], response: Response):
+    """
+    최신순((시각, id) 내림차순) 페이지를 조회하고, 다음 페이지가 있으면 X-Next-Cursor 헤더를 설정합니다.
+
+    cursor가 있으면 keyset 조건으로 이어서 조회하고(skip 무시), 없으면 기존 offset 방식으로 조회합니다.
+    """
+    parsed = _parse_cursor(cursor)
+    query = query.order_by(timestamp_column.desc(), id_column.desc())
+    if parsed is not None:
+        query = query.filter(keyset_before(timestamp_column, id_column, parsed))
+    else:
+        query = query.offset(skip)
+    rows, next_cursor = split_page(
+        query.limit(limit + 1).all(), limit,
+        key=lambda row: (getattr(row, timestamp_column.key), getattr(row, id_column.key))
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
 # History Endpoints
 @app.get("/history", response_model=List[HistoryItem])
-def get_history(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
+def get_history(
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
     """
     생성 이력을 조회합니다.
+
+    cursor를 주면 이전 페이지의 X-Next-Cursor 이후 항목을 조회합니다. (skip보다 깊은 페이지에서 빠름)
     """
-    logs = db.query(GenerationLog).order_by(GenerationLog.timestamp.desc()).offset(skip).limit(limit).all()
+    logs = _paginate_latest(
+        db.query(GenerationLog), GenerationLog.timestamp, GenerationLog.id, skip, limit, cursor, response
+    )
     return [
         HistoryItem(
             id=log.id,
@@ -1052,14 +1523,31 @@ def get_history(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
         ) for log in logs
     ]
 
+@app.get("/history/stats", response_model=List[HistoryStatsItem])
+def get_history_stats(days: int = 30, request_type: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """
+    최근 days일의 일별/요청 종류별 생성 통계(건수, 지연 시간 p50/p95/p99, 본문 바이트)를 조회합니다.
+
+    보존 기간(GENERATION_LOG_RETENTION_DAYS)이 지나 정리된 날짜는 generation_log_rollups 집계 테이블에서 읽으므로
+    긴 기간을 조회해도 원본 로그 전체를 훑지 않습니다.
+    """
+    if days < 1 or days > 3660:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 3660")
+    since = (datetime.now(timezone.utc) - timedelta(days=days - 1)).date()
+    return [HistoryStatsItem(**row) for row in generation_log_daily_stats(db, since, request_type)]
+
+
 @app.get("/history/{log_id}", response_model=HistoryDetail)
-def get_history_detail(log_id: int, db: Session = Depends(get_db)):
+def get_history_detail(log_id: int, db: Session = Depends(get_read_db)):
     """
     특정 생성 이력의 상세 내용을 조회합니다.
+
+    프롬프트/결과 본문은 압축된 별도 테이블에 있으므로 이 엔드포인트에서만 읽어 압축을 풉니다.
     """
     log = db.query(GenerationLog).filter(GenerationLog.id == log_id).first()
     if not log:
         raise HTTPException(status_code=404, detail="Log not found")
+    prompt_context, generated_content = load_generation_log_payload(db, log)
     
     return HistoryDetail(
         id=log.id,
@@ -1068,8 +1556,8 @@ def get_history_detail(log_id: int, db: Session = Depends(get_db)):
         topic=log.topic,
         model_name=log.model_name,
         latency_ms=log.latency_ms,
-        prompt_context=log.prompt_context,
-        generated_content=log.generated_content
+        prompt_context=prompt_context or "",
+        generated_content=generated_content or ""
     )
 
 
@@ -1112,11 +1600,21 @@ class CourseListItem(BaseModel):
     progress: int
     
 @app.get("/quiz-results", response_model=QuizResultListResponse)
-def get_quiz_results(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
+def get_quiz_results(
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
     """
     사용자의 퀴즈 채점 결과 목록을 조회합니다.
+
+    cursor를 주면 이전 페이지의 X-Next-Cursor 이후 항목을 조회합니다.
     """
-    results = db.query(QuizResult).order_by(QuizResult.timestamp.desc()).offset(skip).limit(limit).all()
+    results = _paginate_latest(
+        db.query(QuizResult), QuizResult.timestamp, QuizResult.id, skip, limit, cursor, response
+    )
     return {"results": results}
     created_at: str
     chapter_count: int
@@ -1124,7 +1622,13 @@ def get_quiz_results(skip: int = 0, limit: int = 50, db: Session = Depends(get_d
     progress: int
 
 @app.get("/courses", response_model=List[CourseListItem])
-def get_courses(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
+def get_courses(
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
     """
     저장된 코스 목록을 조회합니다.
     
@@ -1134,7 +1638,8 @@ def get_courses(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
     Args:
         skip (int): 건너뛸 레코드 수 (페이지네이션용), 기본값 0
         limit (int): 반환할 최대 레코드 수, 기본값 20
-        db (Session): 데이터베이스 세션
+        cursor (str, optional): 이전 응답의 X-Next-Cursor 헤더 값 (있으면 skip 무시)
+        db (Session): 읽기 전용 데이터베이스 세션 (get_read_db)
     
     Returns:
         List[CourseListItem]: 코스 목록
@@ -1154,6 +1659,7 @@ def get_courses(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
     Note:
         - 진행률은 (완료된 챕터 수 / 전체 챕터 수) * 100으로 계산됩니다
         - 챕터가 하나도 없으면 진행률은 0입니다
+        - 다음 페이지가 있으면 응답 헤더 X-Next-Cursor에 커서가 담깁니다
     
     Example:
         Response:
@@ -1171,19 +1677,18 @@ def get_courses(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
             ...
         ]
     """
-    # 코스 목록 조회
-    courses = (
-        db.query(DBCourse)
-        .order_by(DBCourse.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    # 코스 목록 + 챕터 수/완료 수를 집계 쿼리 한 번으로 조회 (챕터 content 블롭은 읽지 않음)
+    rows, next_cursor = split_page(
+        list_courses_with_progress(db, skip=skip, limit=limit + 1, cursor=_parse_cursor(cursor)),
+        limit,
+        key=lambda row: (row[0].created_at, row[0].id)
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
-    # 진행률 계산 및 응답 생성 (헬퍼 함수 사용 - 시간복잡도 개선)
     result = []
-    for course in courses:
-        total_chapters, completed_chapters, progress = calculate_course_progress(course.chapters)
+    for course, chapter_count, completed_count in rows:
+        total_chapters, completed_chapters, progress = course_progress_from_counts(chapter_count, completed_count)
         
         result.append(CourseListItem(
             id=course.id,
@@ -1199,7 +1704,7 @@ def get_courses(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
     return result
 
 @app.get("/courses/{course_id}", response_model=CourseResponse)
-def get_course_detail(course_id: int, db: Session = Depends(get_db)):
+def get_course_detail(course_id: int, db: Session = Depends(get_read_db)):
     """
     특정 코스의 상세 정보를 조회합니다.
     """
@@ -1214,7 +1719,7 @@ def get_course_detail(course_id: int, db: Session = Depends(get_db)):
             chapterTitle=chapter.title,
             chapterDescription=chapter.description
         )
-        for chapter in db_course.chapters
+        for chapter in load_course_chapter_summaries(db, course_id)
     ]
         
     return CourseResponse(
@@ -1228,6 +1733,44 @@ def get_course_detail(course_id: int, db: Session = Depends(get_db)):
     )
 
 
+@app.get("/chapters/{chapter_id}/sections/{section}")
+def get_chapter_section(
+    chapter_id: int,
+    section: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    저장된 챕터의 섹션 하나를 조회합니다.
+
+    해당 섹션 행만 읽고 압축을 풀므로 챕터 전체를 읽거나 파싱하지 않습니다.
+    ETag는 섹션 JSON의 SHA-256이며, If-None-Match가 같으면 본문 없이 304를 반환합니다.
+
+    Args:
+        chapter_id (int): 챕터 ID
+        section (str): concept, exercise, quiz, advanced_learning 중 하나
+
+    Returns:
+        dict: {"chapterId", "section", "contentHash", "content"}
+
+    Raises:
+        HTTPException: 알 수 없는 섹션(400), 저장된 섹션 없음(404)
+    """
+    if section not in CHAPTER_SECTIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown section: {section}")
+    found = load_chapter_section_from_db(db, chapter_id, section)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Chapter section not found")
+    data, content_hash = found
+
+    etag = f'"{content_hash}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return {"chapterId": chapter_id, "section": section, "contentHash": content_hash, "content": data}
+
+
 @app.delete("/courses/{course_id}")
 def delete_course(course_id: int, db: Session = Depends(get_db)):
     """
@@ -1238,6 +1781,8 @@ def delete_course(course_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Course not found")
     
     # Delete chapters first (if cascade not set in DB)
+    chapter_ids = db.query(DBChapter.id).filter(DBChapter.course_id == course_id)
+    db.query(ChapterSection).filter(ChapterSection.chapter_id.in_(chapter_ids.scalar_subquery())).delete(synchronize_session=False)
     db.query(DBChapter).filter(DBChapter.course_id == course_id).delete()
     
     # Delete course
@@ -0,0 +1,19 @@
+"""
+PopPins II - 스키마 마이그레이션
+
+버전별 스키마 변경(인덱스 추가 등)을 기존 DB에 적용합니다.
+
+사용법:
+    python -m app.migrations status     # 적용/대기 중인 마이그레이션 확인
+    python -m app.migrations upgrade    # 대기 중인 마이그레이션 모두 적용
+    python -m app.migrations train-dict --out ./cache/payload.zdict  # 본문 압축용 zstd 사전 학습
+"""
+from .runner import run_migrations, migration_status
+from .versions import MIGRATIONS, Migration
+
+__all__ = [
+    'run_migrations',
+    'migration_status',
+    'MIGRATIONS',
+    'Migration',
+]
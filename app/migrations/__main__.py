@@ -0,0 +1,82 @@
+"""
+마이그레이션 CLI
+
+    python -m app.migrations status
+    python -m app.migrations upgrade [--target N]
+    python -m app.migrations train-dict --out ./cache/payload.zdict [--samples 2000]
+    python -m app.migrations maintain [--budget-seconds 0]
+
+DATABASE_URL 환경 변수(.env 포함)가 가리키는 DB에 실행합니다.
+"""
+import argparse
+import json
+import logging
+
+from sqlalchemy import select
+
+from app.database import Base, engine
+from app.migrations.runner import migration_status, run_migrations
+from app.models import GenerationLog, GenerationLogPayload
+from app.services.db_maintenance import DatabaseMaintenance
+from app.utils.compression import TextCompressor, default_compressor
+
+
+def train_dictionary(out_path: str, sample_count: int, dict_size: int) -> None:
+    """최근 생성 이력 본문으로 zstd 사전을 학습하여 파일로 저장합니다. (PAYLOAD_ZSTD_DICT_PATH로 지정)"""
+    compressor = default_compressor()
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(
+                GenerationLog.__table__.c.prompt_context,
+                GenerationLog.__table__.c.generated_content,
+                GenerationLogPayload.prompt_context,
+                GenerationLogPayload.generated_content,
+            )
+            .select_from(GenerationLog.__table__)
+            .outerjoin(GenerationLogPayload, GenerationLogPayload.log_id == GenerationLog.id)
+            .order_by(GenerationLog.id.desc())
+            .limit(sample_count)
+        ).all()
+    samples = []
+    for prompt, generated, packed_prompt, packed_generated in rows:
+        for text in (prompt, generated, compressor.decompress(packed_prompt), compressor.decompress(packed_generated)):
+            if text:
+                samples.append(text)
+    dictionary = TextCompressor.train_dictionary(samples, dict_size)
+    with open(out_path, "wb") as f:
+        f.write(dictionary)
+    print(f"Trained {len(dictionary)} byte dictionary from {len(samples)} samples -> {out_path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description="PopPins II schema migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="적용/대기 중인 마이그레이션 출력")
+    upgrade = subparsers.add_parser("upgrade", help="대기 중인 마이그레이션 적용")
+    upgrade.add_argument("--target", type=int, default=None, help="이 버전까지만 적용")
+    train = subparsers.add_parser("train-dict", help="생성 이력 본문으로 zstd 압축 사전 학습")
+    train.add_argument("--out", required=True, help="사전 파일 경로 (PAYLOAD_ZSTD_DICT_PATH)")
+    train.add_argument("--samples", type=int, default=2000, help="사용할 최근 이력 수")
+    train.add_argument("--dict-size", type=int, default=112640, help="사전 크기 (바이트)")
+    maintain = subparsers.add_parser("maintain", help="생성 이력 집계/정리, VACUUM, ANALYZE를 지금 한 번 실행")
+    maintain.add_argument("--budget-seconds", type=float, default=0, help="최대 실행 시간 (0이면 제한 없음)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    if args.command == "train-dict":
+        train_dictionary(args.out, args.samples, args.dict_size)
+        return
+    if args.command == "maintain":
+        maintenance = DatabaseMaintenance.from_env()
+        completed = maintenance.run_once(time_budget_seconds=args.budget_seconds)
+        print(json.dumps({"completed": completed, **maintenance.stats()}, ensure_ascii=False, indent=2))
+        return
+    if args.command == "upgrade":
+        Base.metadata.create_all(bind=engine)  # 테이블이 없는 새 DB
+        applied = run_migrations(engine, target=args.target)
+        print(f"Applied: {applied or 'nothing to apply'}")
+    print(json.dumps(migration_status(engine), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+스키마 마이그레이션 실행기
+
+변경 이유:
+- Base.metadata.create_all은 없는 테이블만 만들고, 기존 history.db에는 새 인덱스/컬럼을 추가하지 않아
+  스키마/성능 개선이 배포된 DB에 반영되지 않았음
+- 적용한 버전을 schema_migrations 테이블에 기록하고, 아직 적용하지 않은 마이그레이션만 순서대로 실행
+- 서버 시작 시 자동 실행(DB_AUTO_MIGRATE) 또는 CLI(python -m app.migrations)로 실행
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.migrations.versions import MIGRATIONS, Migration
+
+logger = logging.getLogger("pop_pins_api")
+
+# 모델 Base와 분리된 메타데이터 (create_all 대상이 아님)
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _applied_versions(bind: Engine) -> Dict[int, Dict[str, Any]]:
+    _metadata.create_all(bind, tables=[schema_migrations])
+    with bind.connect() as connection:
+        rows = connection.execute(select(schema_migrations).order_by(schema_migrations.c.version)).all()
+    return {
+        row.version: {"version": row.version, "name": row.name, "applied_at": row.applied_at.isoformat()}
+        for row in rows
+    }
+
+
+def run_migrations(bind: Engine, target: Optional[int] = None) -> List[int]:
+    """
+    아직 적용하지 않은 마이그레이션을 버전 순서대로 실행합니다.
+
+    마이그레이션마다 별도 트랜잭션에서 스키마 변경과 schema_migrations 기록을 함께 commit합니다.
+    여러 워커가 동시에 시작해 같은 버전을 적용하면 먼저 기록한 쪽만 남고 나머지는 건너뜁니다.
+
+    Args:
+        bind: 대상 엔진
+        target: 이 버전까지만 적용 (None이면 최신까지)
+
+    Returns:
+        List[int]: 이번에 적용한 버전 목록
+    """
+    applied = _applied_versions(bind)
+    done: List[int] = []
+    for migration in MIGRATIONS:
+        if migration.version in applied or (target is not None and migration.version > target):
+            continue
+        if _apply(bind, migration):
+            done.append(migration.version)
+    return done
+
+
+def _apply(bind: Engine, migration: Migration) -> bool:
+    try:
+        with bind.begin() as connection:
+            already = connection.execute(
+                select(schema_migrations.c.version).where(schema_migrations.c.version == migration.version)
+            ).first()
+            if already:
+                return False
+            migration.upgrade(connection)
+            connection.execute(insert(schema_migrations).values(
+                version=migration.version,
+                name=migration.name,
+                applied_at=datetime.now(timezone.utc),
+            ))
+    except IntegrityError:
+        logger.info(f"Migration {migration.version} ({migration.name}) was applied by another process")
+        return False
+    logger.info(f"Applied migration {migration.version} ({migration.name})")
+    return True
+
+
+def migration_status(bind: Engine) -> Dict[str, Any]:
+    """
+    현재 스키마 버전과 적용/대기 중인 마이그레이션 목록을 반환합니다.
+
+    Returns:
+        dict:
+            - current_version: 적용된 최고 버전 (없으면 0)
+            - latest_version: 코드에 정의된 최신 버전
+            - applied: [{"version", "name", "applied_at"}]
+            - pending: [{"version", "name"}]
+    """
+    applied = _applied_versions(bind)
+    return {
+        "current_version": max(applied, default=0),
+        "latest_version": max((m.version for m in MIGRATIONS), default=0),
+        "applied": list(applied.values()),
+        "pending": [
+            {"version": m.version, "name": m.name}
+            for m in MIGRATIONS if m.version not in applied
+        ],
+    }
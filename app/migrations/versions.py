@@ -0,0 +1,259 @@
+"""
+스키마 마이그레이션 목록
+
+새 마이그레이션은 MIGRATIONS 끝에 다음 버전 번호로 추가합니다. (이미 배포된 항목은 수정하지 않음)
+테이블/컬럼/인덱스는 모델(app/models.py)에도 같은 이름으로 선언하여
+새 DB는 create_all로, 기존 DB는 마이그레이션으로 같은 스키마가 되도록 합니다.
+
+마이그레이션이 만드는 스키마는 아래 _metadata에 적용 당시 모습 그대로 고정합니다.
+모델을 참조하면 나중에 모델이 바뀔 때 이미 배포된 마이그레이션의 DDL도 함께 바뀌기 때문입니다.
+기존 테이블은 인덱스/데이터 이전에 필요한 컬럼만 선언합니다. (이 MetaData로 create하지 않음)
+"""
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+import json
+
+from sqlalchemy import (
+    BigInteger, Column, Date, DateTime, ForeignKey, Index, Integer, LargeBinary, MetaData, String, Table, Text,
+    inspect, insert, or_, select, update
+)
+from sqlalchemy.engine import Connection
+
+from app.utils.compression import default_compressor
+from app.utils.db_helpers import CHAPTER_SECTIONS, encode_chapter_section
+
+
+class Migration:
+    """
+    버전 번호가 붙은 스키마 변경 한 건
+
+    Attributes:
+        version (int): 1부터 증가하는 버전 번호 (적용 순서)
+        name (str): 설명용 이름
+        tables (List[Table]): 생성할 테이블 (이미 있으면 건너뜀)
+        columns (List[Column]): 기존 테이블에 추가할 nullable 컬럼 (이미 있으면 건너뜀)
+        indexes (List[Index]): 생성할 인덱스 (이미 있으면 건너뜀)
+        data (Callable, optional): 테이블/인덱스 생성 후 실행할 데이터 이전 함수 (connection을 받음)
+    """
+
+    def __init__(
+        self,
+        version: int,
+        name: str,
+        tables: Optional[List[Table]] = None,
+        columns: Optional[List[Column]] = None,
+        indexes: Optional[List[Index]] = None,
+        data: Optional[Callable[[Connection], None]] = None
+    ):
+        self.version = version
+        self.name = name
+        self.tables = tables or []
+        self.columns = columns or []
+        self.indexes = indexes or []
+        self.data = data
+
+    def upgrade(self, connection: Connection) -> None:
+        for table in self.tables:
+            table.create(connection, checkfirst=True)
+        for column in self.columns:
+            _add_column(connection, column)
+        for index in self.indexes:
+            index.create(connection, checkfirst=True)
+        if self.data is not None:
+            self.data(connection)
+
+
+def _add_column(connection: Connection, column: Column) -> None:
+    """ALTER TABLE ... ADD COLUMN (nullable 컬럼만, 이미 있으면 건너뜀)"""
+    table = column.table
+    existing = {info["name"] for info in inspect(connection).get_columns(table.name)}
+    if column.name in existing:
+        return
+    column_type = column.type.compile(dialect=connection.dialect)
+    connection.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}')
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+_metadata = MetaData()
+
+# 기존 테이블 (마이그레이션 이전부터 있던 테이블, 필요한 컬럼만)
+_courses = Table(
+    "courses", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("created_at", DateTime),
+)
+_chapters = Table(
+    "chapters", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("course_id", Integer),
+    Column("title", String),
+    Column("content", Text),
+)
+_generation_logs = Table(
+    "generation_logs", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("timestamp", DateTime),
+    Column("request_type", String),
+    Column("prompt_context", Text),
+    Column("generated_content", Text),
+)
+_quiz_results = Table(
+    "quiz_results", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("timestamp", DateTime),
+    Column("course_title", String, nullable=True),  # 5: learning_context_course_scope
+)
+_user_feedback = Table(
+    "user_feedback", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("timestamp", DateTime),
+    Column("course_title", String, nullable=True),  # 5: learning_context_course_scope
+)
+
+# 3: compressed_generation_log_payloads
+_generation_log_payloads = Table(
+    "generation_log_payloads", _metadata,
+    Column("log_id", Integer, ForeignKey("generation_logs.id", ondelete="CASCADE"), primary_key=True),
+    Column("prompt_context", LargeBinary),
+    Column("generated_content", LargeBinary),
+)
+
+# 4: chapter_sections
+_chapter_sections = Table(
+    "chapter_sections", _metadata,
+    Column("chapter_id", Integer, ForeignKey("chapters.id", ondelete="CASCADE"), primary_key=True),
+    Column("section", String, primary_key=True),
+    Column("content", LargeBinary, nullable=False),
+    Column("content_hash", String(64), nullable=False),
+    Column("updated_at", DateTime, default=_utcnow),
+)
+
+# 6: generation_log_rollups
+_generation_log_rollups = Table(
+    "generation_log_rollups", _metadata,
+    Column("day", Date, primary_key=True),
+    Column("request_type", String, primary_key=True),
+    Column("count", Integer, nullable=False, default=0),
+    Column("latency_samples", Integer, nullable=False, default=0),
+    Column("latency_p50_ms", Integer, nullable=True),
+    Column("latency_p95_ms", Integer, nullable=True),
+    Column("latency_p99_ms", Integer, nullable=True),
+    Column("payload_bytes", BigInteger, nullable=False, default=0),
+    Column("updated_at", DateTime, default=_utcnow),
+)
+
+
+def _move_generation_log_payloads(connection: Connection, batch_size: int = 500) -> None:
+    """generation_logs의 비압축 본문을 압축하여 generation_log_payloads로 옮기고 원래 컬럼은 비웁니다."""
+    logs = _generation_logs
+    payloads = _generation_log_payloads
+    compressor = default_compressor()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(logs.c.id, logs.c.prompt_context, logs.c.generated_content)
+            .where(
+                logs.c.id > last_id,
+                or_(logs.c.prompt_context.isnot(None), logs.c.generated_content.isnot(None))
+            )
+            .order_by(logs.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        connection.execute(insert(payloads), [
+            {
+                "log_id": row.id,
+                "prompt_context": compressor.compress(row.prompt_context),
+                "generated_content": compressor.compress(row.generated_content),
+            }
+            for row in rows
+        ])
+        connection.execute(
+            update(logs)
+            .where(logs.c.id.in_([row.id for row in rows]))
+            .values(prompt_context=None, generated_content=None)
+        )
+        last_id = rows[-1].id
+
+
+def _split_chapter_content(connection: Connection, batch_size: int = 200) -> None:
+    """chapters.content(JSON 한 덩어리)를 섹션별 압축 행으로 나눠 chapter_sections에 저장하고 원래 컬럼은 비웁니다."""
+    chapters = _chapters
+    sections = _chapter_sections
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(chapters.c.id, chapters.c.content)
+            .where(chapters.c.id > last_id, chapters.c.content.isnot(None))
+            .order_by(chapters.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        section_rows = []
+        moved_ids = []
+        for row in rows:
+            try:
+                content = json.loads(row.content)
+            except ValueError:
+                continue  # 손상된 콘텐츠는 그대로 두고 다음 생성 때 교체
+            for name in CHAPTER_SECTIONS:
+                if content.get(name):
+                    packed, content_hash = encode_chapter_section(content[name])
+                    section_rows.append({
+                        "chapter_id": row.id, "section": name, "content": packed, "content_hash": content_hash,
+                    })
+            moved_ids.append(row.id)
+        if section_rows:
+            connection.execute(insert(sections), section_rows)
+        if moved_ids:
+            connection.execute(update(chapters).where(chapters.c.id.in_(moved_ids)).values(content=None))
+        last_id = rows[-1].id
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "lookup_indexes", indexes=[
+        # 챕터 조회/저장 (course_id 단독 조회도 이 인덱스의 앞부분으로 처리)
+        Index("ix_chapters_course_id_title", _chapters.c.course_id, _chapters.c.title),
+        # 학습 컨텍스트: 최신 피드백 조회
+        Index("ix_user_feedback_timestamp", _user_feedback.c.timestamp),
+        # 요청 종류별 기간 조회 (생성 이력/통계)
+        Index(
+            "ix_generation_logs_request_type_timestamp",
+            _generation_logs.c.request_type, _generation_logs.c.timestamp
+        ),
+    ]),
+    Migration(2, "keyset_pagination_indexes", indexes=[
+        # 최신순 커서 페이지네이션 (courses.created_at, quiz_results.timestamp 단독 조회도 처리)
+        Index("ix_generation_logs_timestamp_id", _generation_logs.c.timestamp, _generation_logs.c.id),
+        Index("ix_quiz_results_timestamp_id", _quiz_results.c.timestamp, _quiz_results.c.id),
+        Index("ix_courses_created_at_id", _courses.c.created_at, _courses.c.id),
+    ]),
+    Migration(
+        3, "compressed_generation_log_payloads",
+        tables=[_generation_log_payloads],
+        # 기존 본문을 압축 테이블로 이전 (파일 크기는 VACUUM 후 줄어듦)
+        data=_move_generation_log_payloads,
+    ),
+    Migration(
+        4, "chapter_sections",
+        tables=[_chapter_sections],
+        # 기존 챕터 콘텐츠를 섹션별 압축 행으로 분리
+        data=_split_chapter_content,
+    ),
+    Migration(
+        5, "learning_context_course_scope",
+        # 학습 컨텍스트 코스 범위 (이전 행은 NULL → 전역 요약에만 반영)
+        columns=[_quiz_results.c.course_title, _user_feedback.c.course_title],
+    ),
+    Migration(
+        6, "generation_log_rollups",
+        # 보존 기간이 지난 생성 이력의 일별 집계 (app/services/db_maintenance.py가 채움)
+        tables=[_generation_log_rollups],
+    ),
+]
@@ -5,17 +5,20 @@ PopPins II - 데이터베이스 모델 정의
 
 모델 목록:
 - GenerationLog: AI 콘텐츠 생성 이력
+- GenerationLogPayload: 생성 이력의 프롬프트/결과 본문 (zstd 압축, 별도 테이블)
+- GenerationLogRollup: 보존 기간이 지난 생성 이력의 일별/요청 종류별 집계
 - QuizResult: 퀴즈 채점 결과
 - UserFeedback: 사용자 피드백
 - Course: 코스 정보
 - Chapter: 챕터 정보
+- ChapterSection: 챕터 섹션별 콘텐츠 (zstd 압축, 콘텐츠 해시)
 - UserPreference: 사용자 학습 선호도
 
 작성자: PopPins II 개발팀
 버전: 1.0.0
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime, timezone
 from .database import Base
 
@@ -34,11 +37,16 @@ class GenerationLog(Base):
         request_type (str): 요청 타입 (인덱스)
             가능한 값: "course", "concept", "exercise", "quiz", "objectives", "grading"
         topic (str): 주제/토픽 (인덱스)
-        prompt_context (Text): 사용된 프롬프트/컨텍스트 (JSON 문자열)
-        generated_content (Text): 생성된 콘텐츠 (JSON 문자열)
+        prompt_context (Text): 이전 버전에서 저장한 프롬프트 (새 행은 payload 테이블에 압축 저장, 지연 로딩)
+        generated_content (Text): 이전 버전에서 저장한 생성 결과 (새 행은 payload 테이블에 압축 저장, 지연 로딩)
         model_name (str): 사용된 AI 모델 이름
             예: "gemini-2.5-flash"
         latency_ms (int, optional): 생성 소요 시간 (밀리초)
+        payload (relationship): 압축된 프롬프트/결과 본문 (GenerationLogPayload, 1:1)
+
+    Note:
+        목록 조회(/history)는 메타데이터만 읽도록 본문 컬럼은 deferred이고,
+        본문은 상세 조회(/history/{id})에서만 load_generation_log_payload로 읽습니다.
     """
     __tablename__ = "generation_logs"
 
@@ -46,11 +54,70 @@ class GenerationLog(Base):
     timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     request_type = Column(String, index=True)  # course, concept, exercise, quiz
     topic = Column(String, index=True)
-    prompt_context = Column(Text)  # JSON string of the prompt/context used
-    generated_content = Column(Text)  # JSON string of the result
+    prompt_context = deferred(Column(Text))  # 이전 버전 행 전용 (새 행은 payload.prompt_context)
+    generated_content = deferred(Column(Text))  # 이전 버전 행 전용 (새 행은 payload.generated_content)
     model_name = Column(String)
     latency_ms = Column(Integer, nullable=True)  # 생성 소요 시간 (밀리초)
 
+    # 최신순 커서 페이지네이션 (/history): ORDER BY timestamp DESC, id DESC
+    # 요청 종류별 기간 조회: WHERE request_type = ? ORDER BY timestamp
+    __table_args__ = (
+        Index("ix_generation_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_generation_logs_request_type_timestamp", "request_type", "timestamp"),
+    )
+
+    payload = relationship("GenerationLogPayload", uselist=False, lazy="raise_on_sql")
+
+class GenerationLogPayload(Base):
+    """
+    생성 이력 본문 모델
+
+    GenerationLog의 큰 텍스트(프롬프트, 생성 결과)를 zstd로 압축하여 별도 테이블에 저장합니다.
+    압축/해제는 app/utils/compression.py의 TextCompressor 형식을 따릅니다.
+
+    테이블명: generation_log_payloads
+
+    Attributes:
+        log_id (int): generation_logs.id (기본 키, 1:1)
+        prompt_context (LargeBinary): 압축된 프롬프트/컨텍스트
+        generated_content (LargeBinary): 압축된 생성 결과
+    """
+    __tablename__ = "generation_log_payloads"
+
+    log_id = Column(Integer, ForeignKey("generation_logs.id", ondelete="CASCADE"), primary_key=True)
+    prompt_context = Column(LargeBinary)
+    generated_content = Column(LargeBinary)
+
+class GenerationLogRollup(Base):
+    """
+    생성 이력 일별 집계 모델
+
+    보존 기간(GENERATION_LOG_RETENTION_DAYS)이 지난 GenerationLog를 삭제하기 전에
+    날짜(UTC)와 요청 종류별로 요약해 둡니다. 긴 기간의 이력 통계(/history/stats)는 이 테이블에서 읽습니다.
+
+    테이블명: generation_log_rollups
+
+    Attributes:
+        day (Date): 집계 날짜 (UTC, 기본 키)
+        request_type (str): 요청 타입 (기본 키, 값이 없던 행은 "unknown")
+        count (int): 생성 횟수
+        latency_samples (int): latency_ms가 기록된 행 수 (백분위 병합 가중치)
+        latency_p50_ms / latency_p95_ms / latency_p99_ms (int, optional): 생성 소요 시간 백분위
+        payload_bytes (int): 압축 저장된 프롬프트/결과 본문 크기 합계 (바이트)
+        updated_at (DateTime): 마지막 집계 시각 (UTC)
+    """
+    __tablename__ = "generation_log_rollups"
+
+    day = Column(Date, primary_key=True)
+    request_type = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    latency_samples = Column(Integer, nullable=False, default=0)
+    latency_p50_ms = Column(Integer, nullable=True)
+    latency_p95_ms = Column(Integer, nullable=True)
+    latency_p99_ms = Column(Integer, nullable=True)
+    payload_bytes = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
 class QuizResult(Base):
     """
     퀴즈 채점 결과 모델
@@ -62,6 +129,7 @@ class QuizResult(Base):
     
     Attributes:
         id (int): 기본 키 (자동 증가)
+        course_title (str, optional): 코스 제목 (학습 컨텍스트 범위)
         chapter_title (str): 챕터 제목 (인덱스)
         score (int): 점수 (0-100)
         weak_points (Text): 약점 목록 (JSON 문자열)
@@ -71,6 +139,7 @@ class QuizResult(Base):
     __tablename__ = "quiz_results"
 
     id = Column(Integer, primary_key=True, index=True)
+    course_title = Column(String, nullable=True)  # 학습 컨텍스트 코스 범위 (이전 버전 행은 NULL)
     chapter_title = Column(String, index=True)
     score = Column(Integer)  # 0-100 점수
     weak_points = Column(Text)  # JSON string of weak points
@@ -79,6 +148,9 @@ class QuizResult(Base):
     user_answer = Column(Text, nullable=True)  # 사용자 제출 답안
     timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
+    # 최신순 커서 페이지네이션 (/quiz-results)
+    __table_args__ = (Index("ix_quiz_results_timestamp_id", "timestamp", "id"),)
+
 class UserFeedback(Base):
     """
     사용자 피드백 모델
@@ -90,6 +162,7 @@ class UserFeedback(Base):
     
     Attributes:
         id (int): 기본 키 (자동 증가)
+        course_title (str, optional): 코스 제목 (학습 컨텍스트 범위)
         chapter_title (str): 챕터 제목 (인덱스)
         rating (int): 평점 (1-5)
             1: 매우 불만족, 5: 매우 만족
@@ -99,11 +172,15 @@ class UserFeedback(Base):
     __tablename__ = "user_feedback"
 
     id = Column(Integer, primary_key=True, index=True)
+    course_title = Column(String, nullable=True)  # 학습 컨텍스트 코스 범위 (이전 버전 행은 NULL)
     chapter_title = Column(String, index=True)
     rating = Column(Integer)  # 1-5 평점
     comment = Column(Text, nullable=True)  # 선택적 코멘트
     timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
+    # 학습 컨텍스트의 최신 피드백 조회
+    __table_args__ = (Index("ix_user_feedback_timestamp", "timestamp"),)
+
 class Course(Base):
     """
     코스 모델
@@ -135,6 +212,9 @@ class Course(Base):
     level = Column(String)  # 초급, 중급, 고급
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
+    # 최신순 커서 페이지네이션 (/courses)
+    __table_args__ = (Index("ix_courses_created_at_id", "created_at", "id"),)
+
     # SQLAlchemy relationship: 이 코스의 모든 챕터를 자동으로 로드
     chapters = relationship("Chapter", back_populates="course")
 
@@ -154,9 +234,9 @@ class Chapter(Base):
         title (str): 챕터 제목
             예: "리스트 기초", "리스트 메서드"
         description (Text): 챕터 설명
-        content (Text, optional): 생성된 콘텐츠 (JSON 문자열)
+        content (Text, optional): 이전 버전에서 저장한 콘텐츠 (JSON 문자열)
             형식: {"concept": {...}, "exercise": {...}, "quiz": {...}}
-            사용자가 챕터를 학습할 때 생성되어 저장됨
+            새로 생성된 콘텐츠는 섹션별로 chapter_sections에 저장됨
         is_completed (int): 완료 여부
             0: 미완료, 1: 완료
             SQLite는 Boolean 타입이 없어 Integer 사용
@@ -170,12 +250,39 @@ class Chapter(Base):
     course_id = Column(Integer, ForeignKey("courses.id"))  # 외래키: courses 테이블 참조
     title = Column(String)
     description = Column(Text)
-    content = Column(Text, nullable=True)  # JSON string of generated content (concept, exercise, quiz)
+    content = deferred(Column(Text, nullable=True))  # 이전 버전 행 전용 (새 콘텐츠는 chapter_sections)
     is_completed = Column(Integer, default=0)  # 0: False, 1: True (SQLite doesn't have native Boolean)
 
+    # 코스별 챕터 조회/집계 (course_id 단독 조건도 이 인덱스의 앞부분으로 처리)
+    __table_args__ = (Index("ix_chapters_course_id_title", "course_id", "title"),)
+
     # SQLAlchemy relationship: 이 챕터가 속한 코스 정보
     course = relationship("Course", back_populates="chapters")
 
+class ChapterSection(Base):
+    """
+    챕터 섹션 콘텐츠 모델
+
+    챕터의 4개 섹션(concept, exercise, quiz, advanced_learning)을 섹션별 행으로 저장합니다.
+    섹션 하나만 읽을 때 챕터 전체를 읽거나 파싱하지 않도록 JSON을 섹션 단위로 zstd 압축합니다.
+
+    테이블명: chapter_sections
+
+    Attributes:
+        chapter_id (int): chapters.id (복합 기본 키)
+        section (str): 섹션 이름 (복합 기본 키)
+        content (LargeBinary): 압축된 섹션 JSON (app/utils/compression.py 형식)
+        content_hash (str): 압축 전 섹션 JSON의 SHA-256 (캐시 검증/ETag)
+        updated_at (DateTime): 저장 시각 (UTC)
+    """
+    __tablename__ = "chapter_sections"
+
+    chapter_id = Column(Integer, ForeignKey("chapters.id", ondelete="CASCADE"), primary_key=True)
+    section = Column(String, primary_key=True)
+    content = Column(LargeBinary, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
 class UserPreference(Base):
     """
     사용자 학습 선호도 모델
@@ -0,0 +1,294 @@
+"""
+메모리 맵 FAISS 인덱스 + 청크 저장소 (오프셋 테이블 + JSON 레코드)
+
+변경 이유:
+- setup_rag의 FAISS.load_local(..., allow_dangerous_deserialization=True)은 index.faiss 전체(약 120MB)를 메모리로 읽고
+  교재 20여 권, 수만 개 청크의 LangChain docstore(index.pkl)를 pickle로 복원함
+  → 서버 시작이 느리고 uvicorn 워커마다 같은 데이터가 따로 메모리에 올라감 (pickle 로드 자체도 신뢰 문제)
+- 청크 본문/메타데이터를 FAISS 번호 순서의 오프셋 테이블 + UTF-8 JSON 레코드 파일로 옮기고(pickle 없음)
+  인덱스와 함께 mmap으로 열어, 워커들이 OS 페이지 캐시를 공유하고 시작 시에는 파일만 엶
+- 청크는 검색 결과로 필요할 때만 해당 레코드를 읽어 Document로 만듦
+
+파일 (벡터 DB 디렉터리 안):
+- chunks.idx: 매직 8바이트 + 청크 수(u64) + 구축 당시 index.faiss 크기/수정 시각(u64, u64 ns)
+  + 끝 오프셋 배열(u64 × (N + 1), 리틀 엔디언)
+- chunks.bin: 청크별 {"page_content": ..., "metadata": {...}} UTF-8 JSON을 이어 붙인 파일
+
+구축 (기존 벡터 DB에서 1회, 벡터 DB를 다시 만들 때마다):
+    python -m app.services.chunk_store --db ../python_textbook_gemini_db_semantic
+
+index.faiss의 크기나 수정 시각이 구축 당시와 다르면(벡터 DB를 다시 만들거나 복사함) 청크 저장소를 쓰지 않고
+기존 load_local로 읽습니다. 벡터 수만 비교하면 같은 수의 다른 청크로 다시 만든 인덱스와 어긋난 본문을 반환하기 때문입니다.
+"""
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import faiss
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.documents import Document
+except ImportError:  # RAG 선택 의존성
+    faiss = None
+    FAISS = None
+    Document = None
+
+logger = logging.getLogger("pop_pins_api")
+
+INDEX_FILE = "chunks.idx"
+DATA_FILE = "chunks.bin"
+FAISS_FILE = "index.faiss"
+_MAGIC = b"PPCHNK02"
+_HEADER = struct.Struct("<8sQQQ")
+_OFFSET = struct.Struct("<Q")
+
+
+def has_chunk_store(db_path: Path) -> bool:
+    return (db_path / INDEX_FILE).exists() and (db_path / DATA_FILE).exists()
+
+
+def index_fingerprint(db_path: Path) -> Tuple[int, int]:
+    """index.faiss의 (크기, 수정 시각 ns)를 반환합니다. 청크 저장소가 같은 인덱스로 구축되었는지 확인하는 데 사용합니다."""
+    stat = (db_path / FAISS_FILE).stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_chunk_store(
+    db_path: Path,
+    chunks: Iterable[Tuple[str, Dict[str, Any]]],
+    fingerprint: Tuple[int, int]
+) -> int:
+    """
+    (본문, 메타데이터)를 FAISS 번호 순서대로 받아 chunks.idx/chunks.bin을 만듭니다.
+
+    임시 파일에 쓴 뒤 교체하므로 실행 중인 서버가 읽던 파일은 그대로 유지됩니다.
+
+    Args:
+        db_path: 벡터 DB 디렉터리
+        chunks: FAISS 번호 순서의 (본문, 메타데이터)
+        fingerprint: 청크를 읽은 index.faiss의 index_fingerprint (헤더에 기록)
+
+    Returns:
+        int: 저장한 청크 수
+    """
+    data_tmp = db_path / f"{DATA_FILE}.tmp"
+    index_tmp = db_path / f"{INDEX_FILE}.tmp"
+    offsets = [0]
+    with open(data_tmp, "wb") as data:
+        for text, metadata in chunks:
+            record = json.dumps({"page_content": text, "metadata": metadata}, ensure_ascii=False).encode("utf-8")
+            data.write(record)
+            offsets.append(offsets[-1] + len(record))
+    with open(index_tmp, "wb") as index:
+        index.write(_HEADER.pack(_MAGIC, len(offsets) - 1, *fingerprint))
+        index.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+    os.replace(data_tmp, db_path / DATA_FILE)
+    os.replace(index_tmp, db_path / INDEX_FILE)
+    return len(offsets) - 1
+
+
+class ChunkStore:
+    """
+    chunks.idx/chunks.bin을 mmap으로 열어 번호로 청크를 읽습니다. (읽기 전용, 스레드 안전)
+
+    오프셋 배열은 복사하지 않고 mmap 위의 memoryview로 읽으므로 청크 수와 관계없이 여는 비용이 일정합니다.
+
+    Example:
+        store = ChunkStore(Path("../python_textbook_gemini_db_semantic"))
+        text, metadata = store.get(42)
+    """
+
+    def __init__(self, db_path: Path):
+        with open(db_path / INDEX_FILE, "rb") as f:
+            self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(db_path / DATA_FILE, "rb") as f:
+            # 빈 파일은 mmap할 수 없음 (청크 0개)
+            self._data_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        magic, count, index_size, index_mtime_ns = _HEADER.unpack_from(self._index_map, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Not a chunk store index (or an older format, rebuild it): {db_path / INDEX_FILE}")
+        self.count = count
+        self.index_fingerprint = (index_size, index_mtime_ns)  # 구축 당시 index.faiss (크기, 수정 시각 ns)
+        if sys.byteorder == "little":
+            self._offsets = memoryview(self._index_map)[_HEADER.size:_HEADER.size + (count + 1) * 8].cast("Q")
+        else:
+            self._offsets = None  # 빅 엔디언 환경은 struct로 하나씩 읽음
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _span(self, position: int) -> Tuple[int, int]:
+        if self._offsets is not None:
+            return self._offsets[position], self._offsets[position + 1]
+        base = _HEADER.size + position * 8
+        return _OFFSET.unpack_from(self._index_map, base)[0], _OFFSET.unpack_from(self._index_map, base + 8)[0]
+
+    def get(self, position: int) -> Tuple[str, Dict[str, Any]]:
+        """
+        번호(FAISS 인덱스 순서)의 청크 (본문, 메타데이터)를 반환합니다.
+
+        Raises:
+            IndexError: 범위를 벗어난 번호
+        """
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+        start, end = self._span(position)
+        record = json.loads(self._data_map[start:end].decode("utf-8"))
+        return record["page_content"], record["metadata"]
+
+
+class PositionDocstoreIds:
+    """
+    FAISS 번호 → docstore ID 매핑 (ID는 번호 문자열)
+
+    LangChain FAISS의 index_to_docstore_id(dict) 자리에 넣어, 청크 수만큼의 dict를 만들지 않습니다.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def __getitem__(self, position: int) -> str:
+        if not 0 <= position < self.count:
+            raise KeyError(position)
+        return str(position)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.count))
+
+    def __contains__(self, position: object) -> bool:
+        return isinstance(position, int) and 0 <= position < self.count
+
+    def keys(self) -> Iterable[int]:
+        return range(self.count)
+
+    def values(self) -> Iterator[str]:
+        return (str(position) for position in range(self.count))
+
+    def items(self) -> Iterator[Tuple[int, str]]:
+        return ((position, str(position)) for position in range(self.count))
+
+    def get(self, position: int, default: Optional[str] = None) -> Optional[str]:
+        return str(position) if position in self else default
+
+
+class MmapDocstore:
+    """
+    ChunkStore를 LangChain docstore 인터페이스(search)로 감쌉니다.
+
+    InMemoryDocstore와 같이 없는 ID는 문자열을 반환합니다. (검색 코드가 isinstance(doc, str)로 걸러냄)
+    """
+
+    def __init__(self, store: ChunkStore):
+        self.store = store
+
+    def search(self, search: str) -> Any:
+        try:
+            text, metadata = self.store.get(int(search))
+        except (ValueError, IndexError):
+            return f"ID {search} not found."
+        return Document(page_content=text, metadata=metadata)
+
+
+def read_index_mmap(index_path: Path) -> Tuple[Any, bool]:
+    """
+    FAISS 인덱스를 메모리 맵으로 엽니다.
+
+    평면 인덱스(IndexFlat*)는 IO_FLAG_MMAP_IFC(faiss 1.9 이상), IVF 인덱스는 IO_FLAG_MMAP으로 벡터/역색인을
+    mmap합니다. 지원하지 않는 faiss 버전이나 인덱스 종류면 일반 로드로 대체합니다.
+
+    Returns:
+        Tuple[index, bool]: (인덱스, mmap 적용 여부)
+    """
+    flags = faiss.IO_FLAG_READ_ONLY | faiss.IO_FLAG_MMAP | getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+    try:
+        return faiss.read_index(str(index_path), flags), True
+    except RuntimeError as error:
+        logger.warning(f"FAISS index could not be memory-mapped, reading into memory: {error}")
+        return faiss.read_index(str(index_path)), False
+
+
+def load_mmap_vector_store(db_path: Path, embeddings: Any) -> Any:
+    """
+    index.faiss와 청크 저장소(chunks.idx/chunks.bin)를 mmap으로 열어 LangChain FAISS 벡터 스토어를 만듭니다.
+    (pickle 로드 없음)
+
+    Raises:
+        FileNotFoundError: 청크 저장소가 아직 없는 경우 (python -m app.services.chunk_store로 구축)
+        ValueError: index.faiss가 구축 당시와 다르거나 인덱스 벡터 수와 청크 수가 다른 경우
+            (벡터 DB를 다시 만든 뒤 구축하지 않음)
+    """
+    if not has_chunk_store(db_path):
+        raise FileNotFoundError(f"Chunk store not found in {db_path}")
+    store = ChunkStore(db_path)
+    current = index_fingerprint(db_path)
+    if store.index_fingerprint != current:
+        raise ValueError(
+            f"{FAISS_FILE} (size, mtime_ns) is {current} but the chunk store was built from {store.index_fingerprint}; "
+            "rebuild the chunk store"
+        )
+    index, mapped = read_index_mmap(db_path / FAISS_FILE)
+    if index.ntotal != len(store):
+        raise ValueError(
+            f"Chunk store has {len(store)} chunks but the FAISS index has {index.ntotal} vectors; rebuild the chunk store"
+        )
+    logger.info(f"Opened FAISS index ({index.ntotal} vectors, mmap={mapped}) and chunk store ({len(store)} chunks)")
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=MmapDocstore(store),
+        index_to_docstore_id=PositionDocstoreIds(len(store)),
+    )
+
+
+def build_chunk_store(db_path: Path) -> int:
+    """
+    기존 LangChain 벡터 DB(index.pkl)의 docstore를 FAISS 번호 순서대로 청크 저장소로 옮깁니다.
+
+    pickle을 한 번 읽어야 하므로 신뢰할 수 있는 벡터 DB에만 실행합니다. 임베딩 호출은 하지 않습니다.
+    index.faiss의 크기/수정 시각은 읽기 전에 기록하므로, 구축 중에 인덱스가 바뀌면 서버가 이 저장소를 쓰지 않습니다.
+
+    Returns:
+        int: 저장한 청크 수
+    """
+    fingerprint = index_fingerprint(db_path)
+    vector_store = FAISS.load_local(str(db_path), embeddings=None, allow_dangerous_deserialization=True)
+    count = vector_store.index.ntotal
+
+    def chunks() -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for position in range(count):
+            doc = vector_store.docstore.search(vector_store.index_to_docstore_id[position])
+            if isinstance(doc, str):
+                raise ValueError(f"Docstore is missing chunk {position}: {doc}")
+            yield doc.page_content, doc.metadata
+
+    return write_chunk_store(db_path, chunks(), fingerprint)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.chunk_store",
+        description="Build the mmap chunk store from an existing LangChain FAISS vector DB",
+    )
+    parser.add_argument("--db", default=os.getenv("VECTOR_DB_PATH", "../python_textbook_gemini_db_semantic"),
+                        help="벡터 DB 디렉터리 (index.faiss, index.pkl)")
+    args = parser.parse_args()
+    if FAISS is None:
+        raise SystemExit("langchain-community and faiss are required (pip install -r requirements.txt)")
+
+    db_path = Path(args.db)
+    count = build_chunk_store(db_path)
+    size = (db_path / DATA_FILE).stat().st_size + (db_path / INDEX_FILE).stat().st_size
+    print(f"Wrote {count} chunks ({size / 1024 / 1024:.1f} MB) to {db_path / DATA_FILE}, {db_path / INDEX_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+"""
+DB 유지보수 스케줄러 (생성 이력 집계/보존 기간 정리, VACUUM, ANALYZE)
+
+변경 이유:
+- generation_logs/generation_log_payloads는 챕터 생성마다 4행 이상 늘어나기만 하고 정리되지 않았으며,
+  history.db에는 VACUUM/ANALYZE가 한 번도 실행되지 않아 삭제/이전(마이그레이션 3, 4)된 공간이 반환되지 않고
+  쿼리 플래너 통계도 없었음
+- 보존 기간이 지난 로그는 날짜(UTC)·요청 종류별 집계(건수, 지연 시간 p50/p95/p99, 본문 바이트)로
+  generation_log_rollups에 남긴 뒤 삭제 → 긴 기간의 이력 통계는 집계 테이블에서 읽음
+- 트래픽이 적은 시간대(DB_MAINTENANCE_WINDOW)에만 정리, incremental vacuum, ANALYZE를 실행
+"""
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.database import engine as default_engine, is_sqlite_url
+from app.models import GenerationLog, GenerationLogPayload, GenerationLogRollup
+
+logger = logging.getLogger("pop_pins_api")
+
+UNKNOWN_REQUEST_TYPE = "unknown"  # request_type이 없던 행의 집계 키
+
+_logs = GenerationLog.__table__
+_payloads = GenerationLogPayload.__table__
+_rollups = GenerationLogRollup.__table__
+
+
+class _GroupChanged(Exception):
+    """집계한 행과 삭제한 행 수가 다름 (트랜잭션 롤백용)"""
+
+
+def _utcnow() -> datetime:
+    # DB에는 timezone 없는 UTC 시각으로 저장되므로 비교도 naive UTC로 함
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+
+def _percentile(sorted_values: List[int], q: float) -> Optional[int]:
+    """정렬된 값의 nearest-rank 백분위 (값이 없으면 None)"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(-(-q * len(sorted_values) // 100)))  # ceil(q/100 * n)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_generation_logs(rows: Iterable[Tuple[Optional[int], Optional[int]]]) -> Dict[str, Any]:
+    """
+    (latency_ms, payload_bytes) 행들을 한 집계 값으로 요약합니다.
+
+    Returns:
+        dict: count, latency_samples, latency_p50_ms, latency_p95_ms, latency_p99_ms, payload_bytes
+    """
+    count = 0
+    payload_bytes = 0
+    latencies: List[int] = []
+    for latency_ms, size in rows:
+        count += 1
+        payload_bytes += size or 0
+        if latency_ms is not None:
+            latencies.append(latency_ms)
+    latencies.sort()
+    return {
+        "count": count,
+        "latency_samples": len(latencies),
+        "latency_p50_ms": _percentile(latencies, 50),
+        "latency_p95_ms": _percentile(latencies, 95),
+        "latency_p99_ms": _percentile(latencies, 99),
+        "payload_bytes": payload_bytes,
+    }
+
+
+def merge_summaries(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    같은 날짜/요청 종류의 두 집계를 합칩니다.
+
+    건수와 바이트는 더하고, 백분위는 원본 값이 없으므로 latency_samples 가중 평균으로 근사합니다.
+    (보존 기간 경계의 날짜처럼 집계 행과 원본 로그가 함께 있는 경우에만 발생)
+    """
+    merged = {
+        "count": first["count"] + second["count"],
+        "latency_samples": first["latency_samples"] + second["latency_samples"],
+        "payload_bytes": first["payload_bytes"] + second["payload_bytes"],
+    }
+    for key in ("latency_p50_ms", "latency_p95_ms", "latency_p99_ms"):
+        weighted = [
+            (summary[key], summary["latency_samples"])
+            for summary in (first, second)
+            if summary[key] is not None and summary["latency_samples"]
+        ]
+        total = sum(weight for _, weight in weighted)
+        merged[key] = round(sum(value * weight for value, weight in weighted) / total) if total else None
+    return merged
+
+
+def _payload_bytes_column():
+    return (
+        func.coalesce(func.length(_payloads.c.prompt_context), 0)
+        + func.coalesce(func.length(_payloads.c.generated_content), 0)
+    )
+
+
+def _type_condition(request_type: str):
+    if request_type == UNKNOWN_REQUEST_TYPE:
+        return _logs.c.request_type.is_(None) | (_logs.c.request_type == UNKNOWN_REQUEST_TYPE)
+    return _logs.c.request_type == request_type
+
+
+def generation_log_daily_stats(
+    db: Session,
+    since: date,
+    request_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    since(UTC 날짜)부터의 일별/요청 종류별 생성 통계를 반환합니다.
+
+    보존 기간이 지나 삭제된 날짜는 generation_log_rollups에서, 최근 날짜는 generation_logs 원본에서 계산하고
+    같은 날짜/종류에 둘 다 있으면(보존 기간 경계) 합칩니다. 원본을 읽는 범위는 보존 기간으로 제한되므로
+    기간이 길어져도 조회 비용이 크게 늘지 않습니다.
+
+    Returns:
+        List[dict]: 날짜 오름차순, 같은 날짜는 request_type 순
+            (day, request_type, count, latency_samples, latency_p50_ms, latency_p95_ms, latency_p99_ms,
+             payload_bytes, source: "rollup" | "raw" | "mixed")
+    """
+    stats: Dict[Tuple[date, str], Dict[str, Any]] = {}
+
+    rollup_query = select(_rollups).where(_rollups.c.day >= since)
+    if request_type:
+        rollup_query = rollup_query.where(_rollups.c.request_type == request_type)
+    for row in db.execute(rollup_query):
+        stats[(row.day, row.request_type)] = {
+            "count": row.count,
+            "latency_samples": row.latency_samples,
+            "latency_p50_ms": row.latency_p50_ms,
+            "latency_p95_ms": row.latency_p95_ms,
+            "latency_p99_ms": row.latency_p99_ms,
+            "payload_bytes": row.payload_bytes,
+            "source": "rollup",
+        }
+
+    raw_query = (
+        select(_logs.c.timestamp, _logs.c.request_type, _logs.c.latency_ms, _payload_bytes_column())
+        .select_from(_logs.outerjoin(_payloads, _payloads.c.log_id == _logs.c.id))
+        .where(_logs.c.timestamp >= _day_start(since))
+    )
+    if request_type:
+        raw_query = raw_query.where(_type_condition(request_type))
+    raw_rows: Dict[Tuple[date, str], List[Tuple[Optional[int], Optional[int]]]] = {}
+    for timestamp, row_type, latency_ms, size in db.execute(raw_query):
+        key = (timestamp.date(), row_type or UNKNOWN_REQUEST_TYPE)
+        raw_rows.setdefault(key, []).append((latency_ms, size))
+
+    for key, rows in raw_rows.items():
+        summary = summarize_generation_logs(rows)
+        if key in stats:
+            stats[key] = {**merge_summaries(stats[key], summary), "source": "mixed"}
+        else:
+            stats[key] = {**summary, "source": "raw"}
+
+    return [
+        {"day": day.isoformat(), "request_type": row_type, **values}
+        for (day, row_type), values in sorted(stats.items())
+    ]
+
+
+def _parse_window(value: str) -> Optional[Tuple[int, int]]:
+    """"03:00-05:00" → (180, 300) 분 단위. 빈 값이면 None (항상 실행)"""
+    if not value.strip():
+        return None
+    start, end = value.split("-", 1)
+    return _minutes(start), _minutes(end)
+
+
+def _minutes(clock: str) -> int:
+    hours, minutes = clock.strip().split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _parse_retention_overrides(value: str) -> Dict[str, int]:
+    """"grading=30,course=365" → {"grading": 30, "course": 365}"""
+    overrides = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, days = item.split("=", 1)
+            overrides[name.strip()] = int(days)
+    return overrides
+
+
+class DatabaseMaintenance:
+    """
+    백그라운드 DB 유지보수 스케줄러
+
+    interval_minutes마다 깨어나 현재 시각(서버 로컬 시간)이 window 안이고 오늘 작업을 아직 끝내지 않았으면
+    run_once()를 실행합니다. 한 번에 time_budget_seconds만 사용하고, 남은 집계/정리는 같은 시간대의 다음 주기에 이어갑니다.
+
+    run_once() 단계:
+    1. 집계 + 정리: 보존 기간이 지난 날짜를 (날짜, 요청 종류) 단위로 generation_log_rollups에 합산하고
+       해당 로그/본문을 같은 트랜잭션에서 삭제 (삭제 행 수가 집계한 행 수와 다르면 다른 워커가 먼저 처리한 것으로 보고 롤백)
+    2. SQLite incremental vacuum: 빈 페이지를 최대 vacuum_pages개 반환
+       (auto_vacuum이 INCREMENTAL이 아닌 기존 DB는 최초 1회 전체 VACUUM으로 전환, convert_auto_vacuum)
+    3. ANALYZE: 쿼리 플래너 통계 갱신 (SQLite는 analysis_limit으로 테이블당 검사 행 수 제한)
+
+    Attributes:
+        retention_days (int): 기본 보존 기간 (0이면 집계/정리 안 함)
+        retention_overrides (Dict[str, int]): 요청 종류별 보존 기간
+        window (Tuple[int, int], optional): 실행 시간대 (자정 기준 분, 자정을 넘는 구간 허용)
+
+    Example:
+        maintenance = DatabaseMaintenance.from_env()
+        maintenance.start()
+        maintenance.run_once()  # 시간대와 관계없이 즉시 실행 (CLI)
+        maintenance.stop()
+    """
+
+    def __init__(
+        self,
+        bind: Optional[Engine] = None,
+        retention_days: int = 90,
+        retention_overrides: Optional[Dict[str, int]] = None,
+        window: Optional[Tuple[int, int]] = (3 * 60, 5 * 60),
+        interval_minutes: float = 30,
+        time_budget_seconds: float = 600,
+        vacuum_pages: int = 2000,
+        convert_auto_vacuum: bool = True,
+        analysis_limit: int = 1000
+    ):
+        self.bind = bind or default_engine
+        self.retention_days = retention_days
+        self.retention_overrides = retention_overrides or {}
+        self.window = window
+        self.interval_minutes = interval_minutes
+        self.time_budget_seconds = time_budget_seconds
+        self.vacuum_pages = vacuum_pages
+        self.convert_auto_vacuum = convert_auto_vacuum
+        self.analysis_limit = analysis_limit
+        self.is_sqlite = is_sqlite_url(str(self.bind.url))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._completed_on: Optional[date] = None  # 마지막으로 모든 단계를 끝낸 날짜 (로컬)
+        self._counters: Dict[str, Any] = {
+            "runs": 0,
+            "rolled_up_groups": 0,
+            "pruned_logs": 0,
+            "skipped_groups": 0,
+            "vacuumed_pages": 0,
+            "full_vacuums": 0,
+            "analyze_runs": 0,
+            "failures": 0,
+            "last_run_at": None,
+            "last_duration_ms": None,
+            "last_error": None,
+        }
+
+    @classmethod
+    def from_env(cls) -> "DatabaseMaintenance":
+        """환경 변수(GENERATION_LOG_RETENTION_DAYS, DB_MAINTENANCE_WINDOW 등)로 스케줄러를 만듭니다."""
+        return cls(
+            retention_days=int(os.getenv("GENERATION_LOG_RETENTION_DAYS", "90")),
+            retention_overrides=_parse_retention_overrides(os.getenv("GENERATION_LOG_RETENTION_OVERRIDES", "")),
+            window=_parse_window(os.getenv("DB_MAINTENANCE_WINDOW", "03:00-05:00")),
+            interval_minutes=float(os.getenv("DB_MAINTENANCE_INTERVAL_MINUTES", "30")),
+            time_budget_seconds=float(os.getenv("DB_MAINTENANCE_TIME_BUDGET_SECONDS", "600")),
+            vacuum_pages=int(os.getenv("DB_MAINTENANCE_VACUUM_PAGES", "2000")),
+            convert_auto_vacuum=os.getenv("DB_MAINTENANCE_CONVERT_AUTO_VACUUM", "true").lower() == "true",
+            analysis_limit=int(os.getenv("DB_MAINTENANCE_ANALYSIS_LIMIT", "1000")),
+        )
+
+    def start(self) -> None:
+        """유지보수 스레드를 시작합니다."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """유지보수 스레드를 종료합니다. (진행 중인 트랜잭션은 끝까지 실행)"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout)
+        self._thread = None
+
+    def in_window(self, now: Optional[datetime] = None) -> bool:
+        """현재 시각(서버 로컬 시간)이 실행 시간대 안인지 확인합니다."""
+        if self.window is None:
+            return True
+        now = now or datetime.now()
+        minutes = now.hour * 60 + now.minute
+        start, end = self.window
+        if start <= end:
+            return start <= minutes < end
+        return minutes >= start or minutes < end  # 자정을 넘는 시간대 (예: 23:00-02:00)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            today = datetime.now().date()
+            if self._completed_on != today and self.in_window():
+                if self.run_once():
+                    self._completed_on = today
+            self._stop.wait(self.interval_minutes * 60)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def run_once(self, time_budget_seconds: Optional[float] = None) -> bool:
+        """
+        집계/정리, vacuum, ANALYZE를 한 번 실행합니다.
+
+        Returns:
+            bool: 모든 단계를 끝냈으면 True, 시간 예산을 다 쓰거나 실패하여 남은 작업이 있으면 False
+        """
+        budget = self.time_budget_seconds if time_budget_seconds is None else time_budget_seconds
+        started = time.monotonic()
+        deadline = started + budget if budget > 0 else None
+        completed = False
+        try:
+            if self.rollup_and_prune(deadline):
+                self.vacuum()
+                self.analyze()
+                completed = True
+        except Exception as e:
+            self._count("failures")
+            with self._lock:
+                self._counters["last_error"] = str(e)
+            logger.error(f"DB maintenance failed: {e}", exc_info=True)
+        with self._lock:
+            self._counters["runs"] += 1
+            self._counters["last_run_at"] = datetime.now(timezone.utc).isoformat()
+            self._counters["last_duration_ms"] = int((time.monotonic() - started) * 1000)
+        return completed
+
+    def retention_for(self, request_type: str) -> int:
+        """요청 종류의 보존 기간(일). 0이면 정리하지 않음"""
+        return self.retention_overrides.get(request_type, self.retention_days)
+
+    def rollup_and_prune(self, deadline: Optional[float] = None) -> bool:
+        """
+        보존 기간이 지난 생성 로그를 (날짜, 요청 종류) 단위로 집계하고 삭제합니다.
+
+        Returns:
+            bool: 대상이 남지 않았으면 True, deadline을 넘겨 중단했으면 False
+        """
+        today = _utcnow().date()
+        with self.bind.connect() as connection:
+            request_types = [
+                row_type or UNKNOWN_REQUEST_TYPE
+                for row_type in connection.execute(select(_logs.c.request_type).distinct()).scalars()
+            ]
+        for request_type in sorted(set(request_types)):
+            days = self.retention_for(request_type)
+            if days <= 0:
+                continue
+            cutoff = _day_start(today - timedelta(days=days))
+            while True:
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.info("DB maintenance time budget exhausted, continuing in the next run")
+                    return False
+                with self.bind.connect() as connection:
+                    oldest = connection.execute(
+                        select(func.min(_logs.c.timestamp))
+                        .where(_type_condition(request_type), _logs.c.timestamp < cutoff)
+                    ).scalar()
+                if oldest is None:
+                    break
+                if not self._rollup_day(request_type, oldest.date()):
+                    break  # 같은 그룹을 반복하지 않도록 이 요청 종류는 다음 실행으로 미룸
+        return True
+
+    def _rollup_day(self, request_type: str, day: date) -> bool:
+        start = _day_start(day)
+        in_group = (_type_condition(request_type), _logs.c.timestamp >= start, _logs.c.timestamp < start + timedelta(days=1))
+        try:
+            deleted = self._rollup_group(request_type, day, in_group)
+        except _GroupChanged:
+            # 집계 후 다른 워커가 같은 행을 정리했거나 새 행이 들어옴 → 이번 그룹은 다음 실행에서 다시 처리
+            self._count("skipped_groups")
+            return False
+        self._count("rolled_up_groups")
+        self._count("pruned_logs", deleted)
+        return True
+
+    def _rollup_group(self, request_type: str, day: date, in_group) -> int:
+        """한 (날짜, 요청 종류) 그룹을 한 트랜잭션에서 집계 + 삭제하고 삭제한 로그 수를 반환합니다."""
+        with self.bind.begin() as connection:
+            rows = connection.execute(
+                select(_logs.c.latency_ms, _payload_bytes_column())
+                .select_from(_logs.outerjoin(_payloads, _payloads.c.log_id == _logs.c.id))
+                .where(*in_group)
+            ).all()
+            summary = summarize_generation_logs(rows)
+            group_ids = select(_logs.c.id).where(*in_group).scalar_subquery()
+            # SQLite는 외래 키 CASCADE를 기본으로 적용하지 않으므로 본문 행을 직접 삭제
+            connection.execute(delete(_payloads).where(_payloads.c.log_id.in_(group_ids)))
+            deleted = connection.execute(delete(_logs).where(*in_group)).rowcount
+            if deleted != summary["count"]:
+                raise _GroupChanged()
+            self._merge_rollup(connection, day, request_type, summary)
+        return deleted
+
+    def _merge_rollup(self, connection: Connection, day: date, request_type: str, summary: Dict[str, Any]) -> None:
+        key = (_rollups.c.day == day, _rollups.c.request_type == request_type)
+        existing = connection.execute(select(_rollups).where(*key)).first()
+        values = dict(summary)
+        if existing is not None:
+            values = merge_summaries(dict(existing._mapping), summary)
+            connection.execute(update(_rollups).where(*key).values(**values, updated_at=_utcnow()))
+        else:
+            connection.execute(insert(_rollups).values(day=day, request_type=request_type, **values, updated_at=_utcnow()))
+
+    def vacuum(self) -> None:
+        """SQLite 빈 페이지를 반환합니다. (서버 DB는 자체 autovacuum 사용)"""
+        if not self.is_sqlite:
+            return
+        with self.bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            auto_vacuum = connection.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+            if auto_vacuum != 2:  # 0=NONE, 1=FULL, 2=INCREMENTAL
+                if not self.convert_auto_vacuum:
+                    return
+                # auto_vacuum 모드 변경은 전체 VACUUM 후에 적용됨 (DB 파일 전체를 다시 씀, 최초 1회)
+                connection.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+                connection.exec_driver_sql("VACUUM")
+                self._count("full_vacuums")
+                logger.info("Converted SQLite database to auto_vacuum=INCREMENTAL with a full VACUUM")
+                return
+            free_pages = connection.exec_driver_sql("PRAGMA freelist_count").scalar() or 0
+            pages = min(free_pages, self.vacuum_pages) if self.vacuum_pages > 0 else free_pages
+            if pages:
+                connection.exec_driver_sql(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+                self._count("vacuumed_pages", pages)
+
+    def analyze(self) -> None:
+        """쿼리 플래너 통계를 갱신합니다."""
+        with self.bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            if self.is_sqlite and self.analysis_limit > 0:
+                connection.exec_driver_sql(f"PRAGMA analysis_limit={int(self.analysis_limit)}")
+            connection.exec_driver_sql("ANALYZE")
+        self._count("analyze_runs")
+
+    def stats(self) -> Dict[str, Any]:
+        """실행 횟수, 집계/삭제/vacuum 카운터, 마지막 실행 결과와 현재 설정을 반환합니다."""
+        with self._lock:
+            return {
+                **self._counters,
+                "running": self._thread is not None and self._thread.is_alive(),
+                "completed_on": self._completed_on.isoformat() if self._completed_on else None,
+                "retention_days": self.retention_days,
+                "retention_overrides": dict(self.retention_overrides),
+            }
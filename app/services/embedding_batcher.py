@@ -0,0 +1,168 @@
+"""
+요청 간 임베딩 마이크로 배처
+
+변경 이유:
+- 요청 하나 안의 쿼리는 search_context_many로 한 번에 임베딩하지만, 동시에 들어온 여러 사용자 요청은
+  각자 원격 임베딩 API를 호출함 (수업 시간처럼 같은 시각에 챕터를 여는 경우 초당 수십 건)
+- 짧은 시간(window_ms) 동안 또는 max_batch_size개가 모일 때까지 쿼리를 모아 embed_documents 1회로 보내고
+  각 호출자의 future에 결과를 돌려줌 → 원격 호출 수와 요청 수 제한(429) 압력을 줄임
+- 동시에 진행하는 배치 수도 제한하여 순간적인 호출 폭주를 완만하게 함
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger("pop_pins_api")
+
+
+class EmbeddingMicroBatcher:
+    """
+    asyncio 이벤트 루프에서 임베딩 요청을 모아 한 번에 처리합니다.
+
+    - embed(texts): 쿼리들을 대기열에 넣고, 배치 처리 결과가 나오면 같은 순서로 벡터를 반환
+    - 첫 쿼리가 들어온 뒤 window_ms가 지나거나 대기 쿼리가 max_batch_size개가 되면 배치를 보냄
+    - 배치 안의 중복 쿼리는 한 번만 보냄
+    - embed_fn은 동기 함수이며 thread pool에서 실행 (예: ContentGenerator._embed_queries, 쿼리 임베딩 캐시 포함)
+
+    Attributes:
+        window_ms (float): 쿼리를 모으는 최대 시간
+        max_batch_size (int): 배치당 최대 쿼리 수
+        max_concurrency (int): 동시에 진행하는 배치 수
+
+    Example:
+        batcher = EmbeddingMicroBatcher.from_env(generator._embed_queries)
+        vectors = await batcher.embed(["리스트 기초 개념 설명", "리스트 기초 실습 연습"])
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        window_ms: float = 8,
+        max_batch_size: int = 64,
+        max_concurrency: int = 4
+    ):
+        self.embed_fn = embed_fn
+        self.window_ms = window_ms
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[str, "asyncio.Future[Any]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._lock = threading.Lock()  # stats()는 다른 스레드에서도 호출될 수 있음
+        self._counters = {
+            "queries": 0,
+            "batches": 0,
+            "batched_queries": 0,
+            "deduplicated": 0,
+            "size_flushes": 0,
+            "timer_flushes": 0,
+            "failures": 0,
+            "max_batch": 0,
+        }
+
+    @classmethod
+    def from_env(cls, embed_fn: Callable[[List[str]], List[List[float]]]) -> Optional["EmbeddingMicroBatcher"]:
+        """환경 변수(EMBEDDING_BATCH_*)로 배처를 만듭니다. EMBEDDING_BATCH_ENABLED=false이면 None."""
+        if os.getenv("EMBEDDING_BATCH_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            embed_fn,
+            window_ms=float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "8")),
+            max_batch_size=int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64")),
+            max_concurrency=int(os.getenv("EMBEDDING_BATCH_MAX_CONCURRENCY", "4")),
+        )
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        # 이벤트 루프마다 대기열/세마포어를 새로 만듦 (테스트 등에서 루프가 바뀌는 경우)
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        쿼리들을 다른 요청의 쿼리와 함께 배치로 임베딩합니다.
+
+        Raises:
+            Exception: 배치의 embed_fn 호출이 실패하면 같은 예외
+        """
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text, future))
+            futures.append(future)
+        self._count("queries", len(texts))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._count("size_flushes")
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._on_timer)
+        return list(await asyncio.gather(*futures))
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._count("timer_flushes")
+        self._flush()
+
+    def _flush(self) -> None:
+        """대기 중인 쿼리를 max_batch_size개씩 배치 작업으로 보냅니다."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            task = self._loop.create_task(self._run_batch(batch))
+            self._tasks.add(task)  # 완료 전 가비지 컬렉션 방지
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, "asyncio.Future[Any]"]]) -> None:
+        waiting = [(text, future) for text, future in batch if not future.done()]  # 취소된 호출자 제외
+        if not waiting:
+            return
+        unique: Dict[str, int] = {}
+        for text, _ in waiting:
+            unique.setdefault(text, len(unique))
+        texts = list(unique)
+
+        async with self._semaphore:
+            try:
+                vectors = await asyncio.get_running_loop().run_in_executor(None, self.embed_fn, texts)
+            except Exception as error:
+                self._count("failures")
+                logger.error(f"Embedding batch of {len(texts)} queries failed: {error}")
+                for _, future in waiting:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+
+        with self._lock:
+            self._counters["batches"] += 1
+            self._counters["batched_queries"] += len(texts)
+            self._counters["deduplicated"] += len(waiting) - len(texts)
+            self._counters["max_batch"] = max(self._counters["max_batch"], len(texts))
+        for text, future in waiting:
+            if not future.done():
+                future.set_result(vectors[unique[text]])
+
+    def stats(self) -> Dict[str, Any]:
+        """요청 쿼리 수, 배치 수와 평균 크기, 배치를 보낸 이유(크기/시간)별 횟수를 반환합니다."""
+        with self._lock:
+            counters = dict(self._counters)
+        counters["avg_batch"] = round(counters["batched_queries"] / counters["batches"], 2) if counters["batches"] else 0.0
+        counters["pending"] = len(self._pending)
+        return counters
@@ -0,0 +1,159 @@
+"""
+검색 쿼리 임베딩 캐시
+
+변경 이유:
+- search_context/plan_chapter_retrieval은 FAISS 검색 전에 매번 쿼리를 원격 임베딩 API(text-embedding-004)로 보냄
+  (요청당 수백 ms, 요청 수 제한 대상)
+- 검색 쿼리는 "챕터 제목 + 설명 + 고정 접미사" 형태라 같은 문자열이 반복되므로,
+  (임베딩 모델, 작업 종류, 정규화된 쿼리)를 키로 float32 벡터를 TieredCache(메모리 LRU + SQLite)에 저장
+- 캐시 히트 시 검색은 원격 호출 없이 로컬 FAISS 조회만 수행
+- FAISS 벡터 스토어와 임베딩 클라이언트 사이에 끼워 넣는 래퍼로 구현하여 검색 코드는 그대로 사용
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import unicodedata
+from array import array
+from typing import Any, Dict, List, Optional
+
+from app.utils.cache import TieredCache
+
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError:  # RAG 의존성이 없으면 래퍼도 사용되지 않음
+    Embeddings = object
+
+logger = logging.getLogger("pop_pins_api")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """캐시 키용 쿼리 정규화: 유니코드 NFC, 연속 공백을 한 칸으로, 앞뒤 공백 제거"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def embedding_cache_key(model_name: str, task_type: str, text: str) -> str:
+    """(임베딩 모델, 작업 종류, 정규화된 쿼리)의 SHA-256 해시를 반환합니다."""
+    payload = f"{model_name}\x00{task_type}\x00{normalize_query(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def pack_vector(vector: List[float]) -> bytes:
+    """벡터를 float32 바이트로 저장합니다. (768차원 → 3KB)"""
+    return array("f", vector).tobytes()
+
+
+def unpack_vector(value: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(value)
+    return vector.tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    검색 쿼리 임베딩을 캐시하는 임베딩 클라이언트 래퍼
+
+    - embed_query / embed_queries: 캐시를 먼저 조회하고, 없는 쿼리만 한 번의 embed_documents 요청으로 임베딩
+    - embed_documents: 문서(인덱스 구축용) 임베딩은 캐시하지 않고 그대로 전달
+
+    Attributes:
+        inner: 실제 임베딩 클라이언트 (GoogleGenerativeAIEmbeddings, OpenAIEmbeddings 등)
+        model_name (str): 캐시 키에 포함할 임베딩 모델 이름 (모델이 바뀌면 기존 항목은 사용되지 않음)
+        query_kwargs (dict): 쿼리 임베딩 요청에 넘길 추가 인자 (Gemini: task_type="RETRIEVAL_QUERY")
+        cache (TieredCache): float32 벡터 저장소
+
+    Example:
+        embeddings = CachedEmbeddings.from_env(
+            GoogleGenerativeAIEmbeddings(model="models/text-embedding-004"),
+            model_name="models/text-embedding-004",
+            query_kwargs={"task_type": "RETRIEVAL_QUERY"},
+        )
+        vector_store = FAISS.load_local(path, embeddings, ...)
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        model_name: str,
+        cache: TieredCache,
+        query_kwargs: Optional[Dict[str, Any]] = None
+    ):
+        self.inner = inner
+        self.model_name = model_name
+        self.cache = cache
+        self.query_kwargs = query_kwargs or {}
+        self._task_type = str(self.query_kwargs.get("task_type", "query"))
+        self._lock = threading.Lock()
+        self._counters = {"queries": 0, "remote_calls": 0, "remote_queries": 0}
+
+    @classmethod
+    def from_env(
+        cls,
+        inner: Any,
+        model_name: str,
+        query_kwargs: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        환경 변수(EMBEDDING_CACHE_*)로 래퍼를 만듭니다.
+
+        EMBEDDING_CACHE_ENABLED=false이면 inner를 그대로 반환합니다.
+        벡터는 모델이 같으면 바뀌지 않으므로 만료 시간 없이 용량 기준으로만 제거합니다.
+        """
+        if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() != "true":
+            return inner
+        disk_max_mb = float(os.getenv("EMBEDDING_CACHE_DISK_MAX_MB", "256"))
+        cache = TieredCache(
+            "query_embedding",
+            max_memory_bytes=int(float(os.getenv("EMBEDDING_CACHE_MAX_MB", "16")) * 1024 * 1024),
+            disk_path=os.getenv("EMBEDDING_CACHE_PATH", "./cache/embedding_cache.db") or None,
+            max_disk_bytes=int(disk_max_mb * 1024 * 1024) if disk_max_mb > 0 else None,
+        )
+        return cls(inner, model_name, cache, query_kwargs)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        여러 검색 쿼리를 임베딩합니다. 캐시에 없는 쿼리만 한 번의 요청으로 보냅니다.
+
+        같은 배치 안의 중복 쿼리(정규화 후 같은 문자열)도 한 번만 요청합니다.
+        """
+        self._count("queries", len(texts))
+        keys = [embedding_cache_key(self.model_name, self._task_type, text) for text in texts]
+        vectors: Dict[str, List[float]] = {}
+        missing: Dict[str, str] = {}  # 키 → 요청할 쿼리 (첫 등장 원문)
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                vectors[key] = unpack_vector(cached)
+            else:
+                missing[key] = text
+
+        if missing:
+            embedded = self.inner.embed_documents(list(missing.values()), **self.query_kwargs)
+            self._count("remote_calls")
+            self._count("remote_queries", len(missing))
+            for key, vector in zip(missing, embedded):
+                vectors[key] = list(vector)
+                self.cache.set(key, pack_vector(vector))
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_queries([text])[0]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.inner.embed_documents(texts)
+
+    def stats(self) -> Dict[str, Any]:
+        """쿼리 수, 원격 임베딩 호출/쿼리 수, 캐시 계층별 히트율을 반환합니다."""
+        with self._lock:
+            counters = dict(self._counters)
+        return {**counters, "model": self.model_name, "cache": self.cache.stats()}
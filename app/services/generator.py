@@ -28,22 +28,42 @@ import asyncio
 import time
 import google.generativeai as genai
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Callable, Tuple
 from dotenv import load_dotenv
 from datetime import datetime, timezone
 
 # DB imports
 from sqlalchemy.orm import Session
-from app.models import GenerationLog, QuizResult, UserFeedback
+from app.models import GenerationLog, GenerationLogPayload, QuizResult, UserFeedback
 from app.database import SessionLocal
+from app.utils.compression import default_compressor
+from app.utils.json_stream import JsonStringFieldExtractor
+from app.services.llm_scheduler import (
+    LLMScheduler,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_STANDARD,
+    resolve_priority,
+)
+from app.services.llm_retry import RetryPolicy, is_retryable_error
+from app.services.llm_cache import LLMResponseCache, response_cache_key, is_cache_bypassed
+from app.services.log_writer import GenerationLogWriter
+from app.services.learning_context import LearningContextStore
+from app.services.embedding_cache import CachedEmbeddings
+from app.services.retrieval_cache import RetrievalCache, index_version
+from app.services.embedding_batcher import EmbeddingMicroBatcher
+from app.services.chunk_store import has_chunk_store, load_mmap_vector_store
 
 # RAG imports (선택적 의존성)
 try:
+    import numpy as np
+    import faiss
     from langchain_community.vectorstores import FAISS
     from langchain_google_genai import GoogleGenerativeAIEmbeddings
     RAG_AVAILABLE = True
 except ImportError:
     RAG_AVAILABLE = False
+    np = None
+    faiss = None
     FAISS = None
     GoogleGenerativeAIEmbeddings = None
 
@@ -57,6 +77,191 @@ except ImportError:
 load_dotenv()
 logger = logging.getLogger("pop_pins_api")
 
+# RAG 참고 자료 청크당 프롬프트에 넣는 최대 글자 수 (검색 결과 캐시 키에도 포함)
+RAG_CHUNK_CHAR_LIMIT = 500
+
+# 챕터 섹션별 RAG 검색 쿼리 접미사 ("{chapter_title} {chapter_desc} {suffix}")
+CHAPTER_SECTION_QUERY_SUFFIXES = {
+    "concept": "개념 설명",
+    "exercise": "실습 연습",
+    "quiz": "객관식 퀴즈",
+    "advanced_learning": "심화 학습 주관식 문제",
+}
+
+# 호출 종류별 기본 LLM 우선순위 (엔드포인트에서 llm_priority()로 지정하면 그 값이 우선)
+# 사용자가 화면에서 바로 기다리는 호출(채점, 개념 설명, 학습 목표)을 먼저 실행
+REQUEST_PRIORITIES = {
+    "grading": PRIORITY_INTERACTIVE,
+    "concept": PRIORITY_INTERACTIVE,
+    "objectives": PRIORITY_INTERACTIVE,
+}
+
+
+# 호출 종류별 생성 설정 (응답 캐시 키에도 포함되므로 값을 바꾸면 해당 종류의 기존 캐시는 자연히 무효화됨)
+GENERATION_SETTINGS = {
+    "objectives": {"temperature": 0.7, "max_output_tokens": 2048},
+    "course": {"temperature": 0.7, "max_output_tokens": 4096},
+    "concept": {"temperature": 0.7, "max_output_tokens": 8192},
+    "exercise": {"temperature": 0.7, "max_output_tokens": 8192},
+    "quiz": {"temperature": 0.7, "max_output_tokens": 8192},
+    "advanced_learning": {"temperature": 0.7, "max_output_tokens": 8192},
+    "chapter_bundle": {"temperature": 0.7, "max_output_tokens": 24576, "response_mime_type": "application/json"},
+    "grading": {"temperature": 0.3, "max_output_tokens": 4096},
+}
+
+# 고정 시스템 메시지
+# 로그(GenerationLog)에는 프롬프트만 저장되므로, 응답 캐시 warm-start 시 이 값으로 전체 입력을 재구성함
+CONCEPT_SYSTEM_MESSAGE = """당신은 JSON 응답 전용 AI입니다.
+입력 데이터는 다음 형식으로 주어집니다:
+	"courseTitle": "string",
+	"courseDescription": "string",
+	"chapterTitle": "string",
+	"chapterDescription": "string"
+
+작업:
+You are an experienced educational content creator, skilled at transforming course details and specific prompts into comprehensive and well-structured self-study materials. Your goal is to generate 800~1000 words worth of high-quality educational content in a markdown format that is easy for self-learners to understand. Use headings, subheadings, bullet points, etc. for easier understanding.
+IMPORTANT: Ensure the JSON response is complete and valid. Do not truncate the output. Prioritize finishing the JSON structure over exceeding the word count.
+If reference materials are provided, use them to create accurate and comprehensive content that aligns with the reference materials.
+output language: ko
+
+출력 형식 (반드시 JSON):
+{
+  "title": "string",
+  "description": "string",
+  "contents": "string"
+}
+
+⚠️ 규칙:
+- 반드시 위 JSON 구조만 출력하세요.
+- 절대로 {"output": {...}} 또는 문자열(JSON string) 형태로 감싸지 마세요.
+- 대화형 멘트, 설명, 사족 없이 오직 JSON 데이터만 출력하세요.
+- "contents" 필드는 markdown 문서 본문으로 채우세요 .
+⚠️ 출력 시 절대로 Markdown 코드블록(```json`, ``` 등)을 포함하지 마세요.
+⚠️ 절대로 {"output": {...}} 형태로 감싸지 말고, 
+오직 {"title": "...", "description": "...", "contents": "..."} 구조로만 출력하세요."""
+
+EXERCISE_SYSTEM_MESSAGE = """당신은 JSON 응답 전용 AI입니다.
+입력 데이터는 다음 형식으로 주어집니다:
+	"courseTitle": "string",
+	"courseDescription": "string",
+	"chapterTitle": "string",
+	"chapterDescription": "string"
+
+작업:
+You are an AI assistant specializing in education and personalized learning. Your task is to generate approximately three distinct, personalized self-study exercises. These exercises should focus on basic concepts relevant to the provided chapter ID, course title, course description, and the user's learning profile details. The output should be clearly structured, presenting each of the three exercises distinctly.
+If reference materials are provided, use them to create exercises that align with the concepts covered in the reference materials.
+# Step by Step instructions
+1. Review the provided Chapter ID, Course Title, Course Description, and Prompt to understand the context and the learner's profile details.
+2. Generate the first personalized self-study exercise, focusing on basic concepts relevant to the Chapter ID, Course Title, Course Description, and the chapter's description.
+3. Generate the second personalized self-study exercise, ensuring it is distinct from the first and also focuses on basic concepts relevant to the Chapter ID, Course Title, Course Description, and the learner's profile details.
+4. Generate the third personalized self-study exercise, ensuring it is distinct from the previous two and also focuses on basic concepts relevant to the Course Title, Course Description, Chapter title, and its description.
+5. Review the three generated exercises. Are there approximately three distinct exercises? If not, go back to step 2 and adjust or regenerate the exercises as needed to meet the count and distinctness requirements.
+6. Ensure each exercise is clearly structured and presented individually.
+output language: ko
+
+출력 형식 (반드시 JSON):
+{
+  "title": "string",
+  "description": "string",
+  "contents": "string"
+}
+
+⚠️ 규칙:
+- 반드시 위 JSON 구조만 출력하세요.
+- 절대로 {"output": {...}} 또는 문자열(JSON string) 형태로 감싸지 마세요.
+- 대화형 멘트, 설명, 사족 없이 오직 JSON 데이터만 출력하세요.
+- "contents" 필드는 markdown 문서 본문으로 채우세요 .
+⚠️ 출력 시 절대로 Markdown 코드블록(```json`, ``` 등)을 포함하지 마세요.
+⚠️ 절대로 {"output": {...}} 형태로 감싸지 말고, 
+오직 {"title": "...", "description": "...", "contents": "..."} 구조로만 출력하세요."""
+
+QUIZ_SYSTEM_MESSAGE = """당신은 JSON 응답 전용 AI입니다.
+입력 데이터는 다음 형식으로 주어집니다:
+	"courseTitle": "string",
+	"chapterTitle": "string"
+
+작업:
+You are an expert quiz generator. Create 5 multiple-choice questions (4 options each) based on the chapter content.
+Output must be a JSON object with a "quizes" array.
+Each item in "quizes" must have:
+- "question": string
+- "options": array of 4 strings
+- "answer": string (must be one of the options)
+- "explanation": string (explanation of the correct answer)
+
+output language: ko
+
+출력 형식 (반드시 JSON):
+{
+  "quizes": [
+    {
+      "question": "string",
+      "options": ["string", "string", "string", "string"],
+      "answer": "string",
+      "explanation": "string"
+    },
+    ... (5 items)
+  ]
+}
+
+⚠️ 규칙:
+- 반드시 위 JSON 구조만 출력하세요.
+- 절대로 {"output": {...}} 또는 문자열(JSON string) 형태로 감싸지 마세요.
+"""
+
+ADVANCED_LEARNING_SYSTEM_MESSAGE = """당신은 JSON 응답 전용 AI입니다.
+입력 데이터는 다음 형식으로 주어집니다:
+	"courseTitle": "string",
+	"courseDescription": "string",
+	"chapterTitle": "string",
+	"chapterDescription": "string"
+
+작업:
+You are an expert educational content creator. Your task is to generate three subjective essay-type "Advanced Learning" questions that provoke thoughtful responses and deep understanding.
+For each question, also provide a comprehensive model answer that demonstrates depth of understanding and critical thinking.
+The output must be a JSON array named `quizes`, containing three objects, each with:
+- `quiz` (string): The question
+- `model_answer` (string): A detailed model answer (200-300 words in Korean)
+
+output language: ko
+
+출력 형식 (반드시 JSON):
+{
+  "quizes" : [
+    {
+      "quiz" : "string",
+      "model_answer" : "string"
+    },
+    {
+      "quiz" : "string",
+      "model_answer" : "string"
+    },
+    {
+      "quiz" : "string",
+      "model_answer" : "string"
+    }
+  ]
+}
+
+⚠️ 규칙:
+- 반드시 위 JSON 구조만 출력하세요.
+- 절대로 {"output": {...}} 또는 문자열(JSON string) 형태로 감싸지 마세요.
+- model_answer는 학습자가 스스로 답을 작성한 후 참고할 수 있는 모범적인 답안이어야 합니다.
+"""
+
+GRADING_SYSTEM_MESSAGE = """당신은 교육 전문가입니다. 학생의 답안을 공정하고 건설적으로 채점하고 피드백을 제공하세요.
+점수는 0-100 사이로 주되, 답안의 완성도, 정확성, 이해도를 종합적으로 평가하세요.
+
+⚠️ 중요: 반드시 완전한 JSON 형식으로 응답하세요. JSON이 잘리지 않도록 주의하세요.
+반드시 다음 구조를 완전히 포함하세요:
+{
+  "score": 숫자,
+  "feedback": "문자열",
+  "correct_points": ["문자열 배열"],
+  "improvements": ["문자열 배열"]
+}"""
+
+
 class ContentGenerator:
     """
     AI 기반 교육 콘텐츠 생성기
@@ -73,6 +278,14 @@ class ContentGenerator:
     Attributes:
         model: Google Gemini GenerativeModel 인스턴스
         vector_store: FAISS 벡터 스토어 (RAG용, 선택적)
+        embedding_cache (CachedEmbeddings): 검색 쿼리 임베딩 캐시 (RAG 비활성화 또는 EMBEDDING_CACHE_ENABLED=false이면 None)
+        retrieval_cache (RetrievalCache): 인덱스 버전별 검색 결과(FAISS 행 번호) 캐시 (RAG 비활성화 또는 RETRIEVAL_CACHE_ENABLED=false이면 None)
+        embedding_batcher (EmbeddingMicroBatcher): 동시 요청의 검색 쿼리 임베딩을 모아 보내는 배처 (RAG 비활성화 또는 EMBEDDING_BATCH_ENABLED=false이면 None)
+        scheduler (LLMScheduler): 모든 모델 호출의 동시성/RPM/TPM/우선순위를 관리하는 스케줄러
+        retry_policy (RetryPolicy): 모든 모델 호출의 재시도/백오프/타임아웃/헤징 정책
+        response_cache (LLMResponseCache): 프롬프트 해시 기반 응답 캐시 (LLM_RESPONSE_CACHE_ENABLED=false이면 None)
+        log_writer (GenerationLogWriter): 생성 로그를 일괄 저장하는 백그라운드 기록기
+        learning_context (LearningContextStore): 코스/챕터 범위별 최근 퀴즈 결과·피드백 요약
         model_name (str): 사용할 Gemini 모델 이름
         safety_settings (list): Gemini API 안전 설정
             모든 카테고리를 BLOCK_NONE으로 설정하여 콘텐츠 생성이 차단되지 않도록 함
@@ -96,9 +309,20 @@ class ContentGenerator:
         """
         self.model = None
         self.vector_store = None
+        self.embedding_cache = None
+        self.retrieval_cache = None
+        self.embedding_batcher = None
         self.model_name = "gemini-2.5-flash"
+        self.scheduler = LLMScheduler.from_env()  # 모든 generate_content_async 호출은 이 스케줄러를 거침
+        self.retry_policy = RetryPolicy.from_env()
+        self.response_cache = LLMResponseCache.from_env()
+        self.log_writer = GenerationLogWriter.from_env()
+        self.learning_context = LearningContextStore.from_env()
         self.setup_gemini()  # Gemini API 설정
         self.setup_rag()  # RAG 벡터 스토어 로드 (선택적)
+        self.warm_response_cache()  # 생성 이력으로 응답 캐시 미리 채우기 (선택적)
+        self.warm_learning_context()  # 저장된 퀴즈 결과/피드백으로 학습 컨텍스트 요약 채우기
+        self.log_writer.start()  # 생성 로그 백그라운드 기록 스레드 시작
         
         # Safety settings: 콘텐츠 생성이 안전 필터에 의해 차단되지 않도록 설정
         # finish_reason: 2 (SAFETY) 오류 방지
@@ -156,11 +380,16 @@ class ContentGenerator:
             USE_RAG: RAG 사용 여부 (true/false), 기본값 "true"
             VECTOR_DB_PATH: 벡터 DB 경로, 기본값 "../python_textbook_gemini_db_semantic"
             VECTOR_DB_EMBEDDING_MODEL: 임베딩 모델 (gemini/openai), 기본값 "gemini"
+            EMBEDDING_CACHE_*: 검색 쿼리 임베딩 캐시 설정 (app/services/embedding_cache.py)
+            RETRIEVAL_CACHE_*: 검색 결과 캐시 설정 (app/services/retrieval_cache.py)
+            EMBEDDING_BATCH_*: 요청 간 임베딩 마이크로 배처 설정 (app/services/embedding_batcher.py)
+            VECTOR_DB_MMAP: 인덱스/청크 저장소 mmap 로드 사용 여부 (true/false), 기본값 "true"
         
         Note:
             - RAG는 선택적 기능이므로 로드 실패해도 서비스는 계속 작동합니다
             - 벡터 DB가 없으면 RAG 없이 일반 생성 모드로 동작합니다
             - allow_dangerous_deserialization=True: 신뢰할 수 있는 소스의 벡터 DB만 로드해야 함
+              (청크 저장소(app/services/chunk_store.py)를 구축하면 pickle을 읽지 않음)
         """
         use_rag = os.getenv("USE_RAG", "true").lower() == "true"
         if not use_rag or not RAG_AVAILABLE:
@@ -179,17 +408,44 @@ class ContentGenerator:
             # 임베딩 모델 선택 (Gemini 또는 OpenAI)
             if embedding_model == "gemini":
                 api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-                embeddings = GoogleGenerativeAIEmbeddings(model="models/text-embedding-004", google_api_key=api_key)
+                embedding_name = "models/text-embedding-004"
+                embeddings = GoogleGenerativeAIEmbeddings(model=embedding_name, google_api_key=api_key)
+                # embed_documents의 기본 task_type은 문서용이므로 쿼리 임베딩에는 RETRIEVAL_QUERY를 명시
+                query_kwargs = {"task_type": "RETRIEVAL_QUERY"}
             elif embedding_model == "openai" and OPENAI_EMBEDDINGS_AVAILABLE:
                 api_key = os.getenv("OPENAI_API_KEY")
-                embeddings = OpenAIEmbeddings(model="text-embedding-3-small", openai_api_key=api_key)
+                embedding_name = "text-embedding-3-small"
+                embeddings = OpenAIEmbeddings(model=embedding_name, openai_api_key=api_key)
+                query_kwargs = {}
             else:
                 logger.warning(f"Unsupported or missing embedding model: {embedding_model}")
                 return
 
+            # 벡터 스토어와 임베딩 클라이언트 사이의 쿼리 임베딩 캐시 (히트 시 원격 호출 없이 FAISS 조회만 수행)
+            embeddings = CachedEmbeddings.from_env(embeddings, model_name=embedding_name, query_kwargs=query_kwargs)
+            self.embedding_cache = embeddings if isinstance(embeddings, CachedEmbeddings) else None
+
             # FAISS 벡터 스토어 로드
-            self.vector_store = FAISS.load_local(str(db_path), embeddings, allow_dangerous_deserialization=True)
+            # 청크 저장소가 있으면 인덱스와 함께 mmap으로 열어 pickle 로드 없이 바로 시작 (워커 간 페이지 캐시 공유)
+            self.vector_store = None
+            if os.getenv("VECTOR_DB_MMAP", "true").lower() == "true":
+                if has_chunk_store(db_path):
+                    try:
+                        self.vector_store = load_mmap_vector_store(db_path, embeddings)
+                    except (OSError, ValueError, RuntimeError) as e:
+                        logger.warning(f"Memory-mapped vector DB load failed, falling back to load_local: {e}")
+                else:
+                    logger.info(f"No chunk store in {db_path}; run `python -m app.services.chunk_store` for mmap loading")
+            if self.vector_store is None:
+                self.vector_store = FAISS.load_local(str(db_path), embeddings, allow_dangerous_deserialization=True)
             logger.info(f"RAG Vector DB loaded from {db_path}")
+
+            # 검색 결과 캐시: 벡터 DB 파일/메타데이터가 바뀌면 버전이 달라져 이전 결과는 사용되지 않음
+            version = index_version(db_path)
+            self.retrieval_cache = RetrievalCache.from_env(version, truncation=f"chars:{RAG_CHUNK_CHAR_LIMIT}")
+            # 동시 요청의 쿼리 임베딩을 짧은 시간 동안 모아 한 번에 요청 (쿼리 임베딩 캐시를 거쳐 원격 호출)
+            self.embedding_batcher = EmbeddingMicroBatcher.from_env(self._embed_queries)
+            logger.info(f"RAG index version: {version}")
         except Exception as e:
             logger.error(f"Failed to load Vector DB: {e}")
             self.vector_store = None  # RAG 없이 계속 진행
@@ -202,32 +458,339 @@ class ContentGenerator:
         
         Args:
             request_type (str): 요청 타입
-                가능한 값: "course", "concept", "exercise", "quiz", "objectives", "grading"
+                가능한 값: "course", "concept", "exercise", "quiz", "advanced_learning", "chapter_bundle", "objectives", "grading"
             topic (str): 주제/토픽
             prompt_context (str): 사용된 프롬프트/컨텍스트 (JSON 문자열)
             generated_content (str): 생성된 콘텐츠 (JSON 문자열)
             latency_ms (int): 생성 소요 시간 (밀리초)
         
         Note:
+            - 큐에 넣기만 하고 바로 반환합니다. 실제 저장은 log_writer 스레드가 일괄 처리합니다
+              (async 메서드 안에서 SQLite commit/fsync로 이벤트 루프가 막히지 않도록)
             - 로그 저장 실패해도 콘텐츠 생성은 계속 진행됩니다 (에러만 로깅)
-            - 각 요청마다 새로운 DB 세션을 생성하여 사용
         """
+        self.log_writer.submit({
+            "request_type": request_type,
+            "topic": topic,
+            "prompt_context": prompt_context,
+            "generated_content": generated_content,
+            "model_name": self.model_name,
+            "latency_ms": latency_ms,
+            "timestamp": datetime.now(timezone.utc),
+        })
+
+    @staticmethod
+    def _estimate_tokens(contents: str, max_output_tokens: int) -> int:
+        """TPM 버킷에서 미리 차감할 토큰 수를 추정합니다. (입력 + 최대 출력의 절반, 응답 후 실제 값으로 보정)"""
+        return len(contents) // 3 + max_output_tokens // 2
+
+    @staticmethod
+    def _usage_tokens(response: Any) -> Optional[int]:
+        usage = getattr(response, "usage_metadata", None)
+        return getattr(usage, "total_token_count", None) if usage is not None else None
+
+    @staticmethod
+    def _finished_normally(response: Any) -> bool:
+        """응답이 정상 종료(STOP)되었는지 확인합니다. 출력 한도 초과/안전 필터로 잘린 응답은 캐시하지 않습니다."""
+        candidates = getattr(response, "candidates", None)
+        if not candidates:
+            return False
+        reason = getattr(candidates[0], "finish_reason", None)
+        return getattr(reason, "name", reason) in ("STOP", 1)
+
+    async def _call_model(
+        self,
+        request_type: str,
+        contents: str,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        Gemini를 호출하고 응답 텍스트를 반환합니다. 모든 비스트리밍 모델 호출의 단일 진입점입니다.
+
+        - 같은 (모델, 프롬프트, 생성 설정)의 응답이 캐시에 있으면 호출하지 않고 반환하며,
+          같은 프롬프트가 이미 호출 중이면 그 결과를 함께 기다림 (response_cache)
+        - 각 시도는 스케줄러 슬롯을 받은 뒤 타임아웃을 걸고 실행되며,
+          일시적 오류(429, 5xx, 타임아웃)는 retry_policy에 따라 백오프 후 재시도(선택적으로 헤징)
+
+        Args:
+            request_type: 호출 종류 (GENERATION_SETTINGS의 키, 우선순위 기본값과 지연 통계 구분에도 사용)
+            contents: 모델에 보낼 전체 프롬프트 (시스템 메시지 + 프롬프트)
+            validate: 응답 캐시에 저장/재사용해도 되는지 검사하는 함수 (선택, LLMResponseCache.get_or_call 참고)
+
+        Returns:
+            str: 응답 텍스트
+
+        Raises:
+            ValueError: 응답이 비어 있거나 차단된 경우 (재시도하지 않음)
+        """
+        settings = GENERATION_SETTINGS[request_type]
+        generation_config = genai.types.GenerationConfig(**settings)
+        priority = resolve_priority(REQUEST_PRIORITIES.get(request_type, PRIORITY_STANDARD))
+        estimated = self._estimate_tokens(contents, settings["max_output_tokens"])
+        timeout = self.retry_policy.timeout_for(settings["max_output_tokens"])
+
+        async def attempt():
+            async with self.scheduler.slot(request_type, priority, estimated) as slot:
+                response = await asyncio.wait_for(
+                    self.model.generate_content_async(
+                        contents,
+                        generation_config=generation_config,
+                        safety_settings=self.safety_settings
+                    ),
+                    timeout=timeout
+                )
+                slot.record_usage(self._usage_tokens(response))
+            text = response.text  # 후보가 없거나 차단된 응답이면 ValueError
+            if not text:
+                raise ValueError(f"Empty response from Gemini API ({request_type})")
+            return text, self._finished_normally(response)
+
+        async def call():
+            return await self.retry_policy.run(request_type, attempt)
+
+        if self.response_cache is None:
+            text, _ = await call()
+            return text
+        key = response_cache_key(self.model_name, contents, settings)
+        return await self.response_cache.get_or_call(key, call, validate)
+
+    async def _stream_model(self, request_type: str, contents: str) -> AsyncIterator[str]:
+        """
+        _call_model의 스트리밍 버전입니다. 스트림이 끝날 때까지 슬롯을 유지하며 텍스트 조각을 내보냅니다.
+
+        응답 캐시에 있으면(또는 같은 프롬프트의 비스트리밍 호출이 진행 중이면) 전체 텍스트를 한 조각으로 내보내고,
+        새로 생성한 응답은 정상 종료된 경우 캐시에 저장합니다.
+        이미 내보낸 조각을 되돌릴 수 없으므로, 재시도는 첫 조각을 받기 전에 실패한 경우에만 합니다.
+        타임아웃은 조각 사이 대기 시간에 적용됩니다. (헤징하지 않음)
+        """
+        settings = GENERATION_SETTINGS[request_type]
+        generation_config = genai.types.GenerationConfig(**settings)
+        priority = resolve_priority(REQUEST_PRIORITIES.get(request_type, PRIORITY_STANDARD))
+        estimated = self._estimate_tokens(contents, settings["max_output_tokens"])
+        timeout = self.retry_policy.timeout_for(settings["max_output_tokens"])
+
+        key = None
+        if self.response_cache is not None:
+            key = response_cache_key(self.model_name, contents, settings)
+            cached = await self.response_cache.get(key)
+            flight = self.response_cache.flights.get(key) if cached is None and not is_cache_bypassed() else None
+            if flight is not None:
+                # 공유 작업은 shield로 기다림 (스트림 클라이언트가 끊겨도 같은 작업을 기다리는 _call_model 호출은 유지)
+                # 공유 작업이 실패하면 이 스트림은 아래에서 직접 생성 (자체 재시도 포함)
+                try:
+                    cached = await asyncio.shield(flight)
+                except Exception as error:
+                    logger.warning(f"[{request_type}] Shared call failed, streaming a fresh response: {type(error).__name__}: {error}")
+            if cached is not None:
+                yield cached
+                return
+
+        for attempt in range(self.retry_policy.max_attempts):
+            yielded = False
+            try:
+                parts = []
+                async with self.scheduler.slot(request_type, priority, estimated) as slot:
+                    response = await asyncio.wait_for(
+                        self.model.generate_content_async(
+                            contents,
+                            generation_config=generation_config,
+                            safety_settings=self.safety_settings,
+                            stream=True
+                        ),
+                        timeout=timeout
+                    )
+                    chunks = response.__aiter__()
+                    last_chunk = None
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                        except StopAsyncIteration:
+                            break
+                        last_chunk = chunk
+                        slot.record_usage(self._usage_tokens(chunk))  # 사용량은 마지막 조각에 포함됨
+                        try:
+                            text = chunk.text
+                        except ValueError:
+                            continue  # 텍스트 파트가 없는 조각 (예: 종료 메타데이터)
+                        parts.append(text)
+                        yielded = True
+                        yield text
+                if key is not None and parts and self._finished_normally(last_chunk):
+                    await self.response_cache.set(key, "".join(parts))
+                return
+            except Exception as error:
+                if yielded or not is_retryable_error(error) or attempt == self.retry_policy.max_attempts - 1:
+                    raise
+                delay = self.retry_policy.backoff(attempt, error)
+                logger.warning(
+                    f"[{request_type}] Stream attempt {attempt + 1}/{self.retry_policy.max_attempts} failed "
+                    f"({type(error).__name__}): {error} - retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+    def warm_response_cache(self) -> int:
+        """
+        최근 생성 이력(GenerationLog)으로 응답 캐시를 미리 채웁니다. (LLM_RESPONSE_CACHE_WARM_START=true일 때)
+
+        로그에는 프롬프트와 파싱된 결과(JSON)만 남으므로, 전체 입력을 재구성할 수 있는 호출 종류만 대상입니다.
+        - 학습 목표: topic과 프롬프트 언어로 _build_objectives_prompt를 다시 실행하여 프롬프트가 같을 때만
+        - 개념/실습/퀴즈/심화 학습/채점: 고정 시스템 메시지 + 저장된 프롬프트
+        캐시 값은 저장된 결과 JSON이며, 각 메서드의 파싱 함수가 그대로 처리할 수 있습니다.
+
+        Returns:
+            int: 캐시에 넣은 항목 수
+        """
+        if self.response_cache is None or os.getenv("LLM_RESPONSE_CACHE_WARM_START", "false").lower() != "true":
+            return 0
+
+        fixed_system_messages = {
+            "concept": CONCEPT_SYSTEM_MESSAGE,
+            "exercise": EXERCISE_SYSTEM_MESSAGE,
+            "quiz": QUIZ_SYSTEM_MESSAGE,
+            "advanced_learning": ADVANCED_LEARNING_SYSTEM_MESSAGE,
+            "grading": GRADING_SYSTEM_MESSAGE,
+        }
+        limit = int(os.getenv("LLM_RESPONSE_CACHE_WARM_START_LIMIT", "500"))
+        db = SessionLocal()
         try:
-            db = SessionLocal()
-            log_entry = GenerationLog(
-                request_type=request_type,
-                topic=topic,
-                prompt_context=prompt_context,
-                generated_content=generated_content,
-                model_name=self.model_name,
-                latency_ms=latency_ms,
-                timestamp=datetime.now(timezone.utc)
+            rows = (
+                db.query(
+                    GenerationLog.request_type,
+                    GenerationLog.topic,
+                    GenerationLog.prompt_context,
+                    GenerationLog.generated_content,
+                    GenerationLogPayload.prompt_context,
+                    GenerationLogPayload.generated_content,
+                )
+                .outerjoin(GenerationLogPayload, GenerationLogPayload.log_id == GenerationLog.id)
+                .filter(
+                    GenerationLog.model_name == self.model_name,
+                    GenerationLog.request_type.in_(["objectives", *fixed_system_messages])
+                )
+                .order_by(GenerationLog.id.desc())
+                .limit(limit)
+                .all()
             )
-            db.add(log_entry)
-            db.commit()
-            db.close()
         except Exception as e:
-            logger.error(f"Failed to log to DB: {e}")
+            logger.error(f"Failed to load generation logs for response cache warm-start: {e}")
+            return 0
+        finally:
+            db.close()
+
+        compressor = default_compressor()
+        entries = []
+        # 오래된 것부터 넣어 최신 결과가 남도록
+        for request_type, topic, prompt, generated, packed_prompt, packed_generated in reversed(rows):
+            if packed_prompt is not None or packed_generated is not None:
+                try:
+                    prompt = compressor.decompress(packed_prompt)
+                    generated = compressor.decompress(packed_generated)
+                except ValueError as e:
+                    logger.warning(f"Skipping generation log payload during warm-start: {e}")
+                    continue
+            if not prompt or not generated:
+                continue
+            if request_type == "objectives":
+                language = "ko" if prompt.startswith("주제 '") else "en"
+                system_message, rebuilt = self._build_objectives_prompt(topic, language)
+                if rebuilt != prompt:
+                    continue
+            else:
+                system_message = fixed_system_messages[request_type]
+            key = response_cache_key(self.model_name, f"{system_message}\n\n{prompt}", GENERATION_SETTINGS[request_type])
+            entries.append((key, generated))
+
+        count = self.response_cache.warm_start(entries)
+        logger.info(f"LLM response cache warm-start: {count} entries from {len(rows)} generation logs")
+        return count
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        여러 검색 쿼리를 한 번의 임베딩 요청으로 벡터화합니다.
+
+        Gemini 임베딩은 embed_documents의 기본 task_type이 문서용(RETRIEVAL_DOCUMENT)이므로
+        embed_query와 같은 결과가 나오도록 RETRIEVAL_QUERY를 명시합니다.
+        쿼리 임베딩 캐시를 사용하면 캐시에 없는 쿼리만 요청합니다.
+        """
+        embeddings = self.vector_store.embedding_function
+        if isinstance(embeddings, CachedEmbeddings):
+            return embeddings.embed_queries(queries)
+        if GoogleGenerativeAIEmbeddings is not None and isinstance(embeddings, GoogleGenerativeAIEmbeddings):
+            return embeddings.embed_documents(queries, task_type="RETRIEVAL_QUERY")
+        return embeddings.embed_documents(queries)
+
+    def _search_many_sync(self, queries: List[str], k: int) -> List[List[Any]]:
+        """
+        여러 쿼리를 배치 임베딩 1회 + FAISS 행렬 검색 1회로 처리합니다. (동기, thread pool에서 실행)
+
+        검색 결과 캐시에 있는 쿼리는 임베딩/검색 없이 저장된 FAISS 행 번호로 바로 docstore에서 꺼냅니다.
+
+        Returns:
+            List[List[Document]]: 쿼리별 상위 k개 문서 (쿼리 순서 유지)
+                여러 쿼리에 중복으로 걸린 청크는 docstore에서 한 번만 조회하여 같은 객체를 공유합니다.
+        """
+        positions = self._cached_positions(queries, k)
+        pending = [queries[i] for i, rows in enumerate(positions) if rows is None]
+        vectors = self._embed_queries(pending) if pending else []
+        return self._search_vectors_sync(queries, k, positions, vectors)
+
+    def _cached_positions(self, queries: List[str], k: int) -> List[Optional[List[int]]]:
+        """검색 결과 캐시에 있는 쿼리의 FAISS 행 번호 목록 (없으면 None)"""
+        if self.retrieval_cache is None:
+            return [None for _ in queries]
+        total = self.vector_store.index.ntotal
+        return [self.retrieval_cache.get(query, k, total) for query in queries]
+
+    def _search_vectors_sync(
+        self,
+        queries: List[str],
+        k: int,
+        positions: List[Optional[List[int]]],
+        vectors: List[List[float]]
+    ) -> List[List[Any]]:
+        """
+        캐시에 없던 쿼리(positions가 None인 순서대로 vectors)를 FAISS 행렬 검색 1회로 찾고,
+        모든 쿼리의 청크를 index_to_docstore_id → docstore로 꺼냅니다.
+
+        캐시에는 docstore ID가 아닌 FAISS 행 번호를 저장하므로, 같은 index.faiss를 mmap 청크 저장소(번호 ID)와
+        load_local(UUID)로 번갈아 열어도 캐시 항목을 그대로 사용할 수 있습니다.
+        """
+        pending = [i for i, rows in enumerate(positions) if rows is None]
+        if pending:
+            matrix = np.asarray(vectors, dtype=np.float32)
+            if getattr(self.vector_store, "_normalize_L2", False):
+                faiss.normalize_L2(matrix)
+
+            _, indices = self.vector_store.index.search(matrix, k)
+            for i, row in zip(pending, indices):
+                # -1은 결과가 k개보다 적은 경우
+                rows = [int(idx) for idx in row if int(idx) != -1]
+                positions[i] = rows
+                if self.retrieval_cache is not None:
+                    self.retrieval_cache.set(queries[i], k, rows)
+
+        resolved: Dict[int, Any] = {}  # FAISS 행 번호 -> Document (중복 청크는 한 번만 조회)
+        results = []
+        for rows in positions:
+            docs = []
+            for position in rows:
+                if position not in resolved:
+                    docstore_id = self.vector_store.index_to_docstore_id[position]
+                    resolved[position] = self.vector_store.docstore.search(docstore_id)
+                doc = resolved[position]
+                if doc is not None and not isinstance(doc, str):  # docstore는 누락 시 문자열을 반환
+                    docs.append(doc)
+            results.append(docs)
+        return results
+
+    def _format_context(self, docs: List[Any]) -> str:
+        """검색된 문서를 프롬프트에 포함할 수 있는 형식으로 포맷팅합니다."""
+        context_parts = []
+        for i, doc in enumerate(docs, 1):
+            source = doc.metadata.get("file_name", "Unknown")  # 출처 파일명
+            content = doc.page_content[:RAG_CHUNK_CHAR_LIMIT]  # 내용은 500자로 제한
+            context_parts.append(f"[참고 자료 {i} - 출처: {source}]\n{content}")
+        return "\n\n".join(context_parts)
 
     async def search_context(self, query: str, k: int = 3) -> str:
         """
@@ -251,27 +814,111 @@ class ContentGenerator:
             - FAISS는 동기 함수이므로 thread pool에서 실행하여 비동기로 처리
             - 검색 실패 시 빈 문자열 반환 (콘텐츠 생성은 계속 진행)
             - 각 문서의 내용은 500자로 제한하여 프롬프트 길이 관리
+            - 여러 쿼리를 검색할 때는 search_context_many를 사용 (임베딩 요청/FAISS 검색 1회)
+        """
+        return (await self.search_context_many([query], k))[0]
+
+    async def search_context_many(self, queries: List[str], k: int = 3) -> List[str]:
+        """
+        여러 쿼리의 참고 자료를 한 번에 검색합니다.
+
+        모든 쿼리를 한 번의 embed_documents 요청으로 벡터화하고, 쿼리 행렬로 FAISS index.search를 1회 실행하여
+        FAISS의 BLAS 배치 경로를 사용합니다. (검색 결과/임베딩 캐시에 있는 쿼리는 요청에서 제외)
+
+        Args:
+            queries: 검색 쿼리 목록
+            k: 쿼리별 반환할 문서 수, 기본값 3
+
+        Returns:
+            List[str]: 쿼리 순서대로 포맷팅된 참고 자료 (search_context와 같은 형식)
+                RAG가 비활성화되었거나 검색에 실패하면 모두 빈 문자열
         """
-        if not self.vector_store:
-            return ""  # RAG가 비활성화된 경우
+        results = await self._search_documents_many(queries, k)
+        return [self._format_context(docs) for docs in results]
+
+    async def _search_documents_many(self, queries: List[str], k: int) -> List[List[Any]]:
+        """_search_many_sync를 thread pool에서 실행합니다. RAG 비활성화/실패 시 쿼리마다 빈 목록"""
+        if not self.vector_store or not queries:
+            return [[] for _ in queries]  # RAG가 비활성화된 경우
         try:
             loop = asyncio.get_running_loop()
-            # 동기 FAISS 검색을 thread pool에서 실행하여 비동기 처리
-            docs = await loop.run_in_executor(None, lambda: self.vector_store.similarity_search(query, k=k))
-            
-            if not docs: 
-                return ""  # 검색 결과 없음
-            
-            # 검색 결과를 프롬프트에 포함할 수 있는 형식으로 포맷팅
-            context_parts = []
-            for i, doc in enumerate(docs, 1):
-                source = doc.metadata.get("file_name", "Unknown")  # 출처 파일명
-                content = doc.page_content[:500]  # 내용은 500자로 제한
-                context_parts.append(f"[참고 자료 {i} - 출처: {source}]\n{content}")
-            return "\n\n".join(context_parts)
+            if self.embedding_batcher is None:
+                # 동기 FAISS 검색을 thread pool에서 실행하여 비동기 처리
+                return await loop.run_in_executor(None, self._search_many_sync, queries, k)
+
+            # 결과 캐시에 없는 쿼리만 다른 요청의 쿼리와 함께 배치 임베딩한 뒤 FAISS 검색
+            positions = await loop.run_in_executor(None, self._cached_positions, queries, k)
+            pending = [queries[i] for i, rows in enumerate(positions) if rows is None]
+            vectors = await self.embedding_batcher.embed(pending) if pending else []
+            return await loop.run_in_executor(None, self._search_vectors_sync, queries, k, positions, vectors)
         except Exception as e:
-            logger.error(f"RAG search failed: {e}")
-            return ""  # 검색 실패해도 계속 진행
+            logger.error(f"RAG search failed ({len(queries)} queries): {e}")
+            return [[] for _ in queries]  # 검색 실패해도 계속 진행
+
+    @staticmethod
+    def _chapter_queries(chapter_title: str, chapter_desc: str) -> List[str]:
+        return [
+            f"{chapter_title} {chapter_desc} {suffix}"
+            for suffix in CHAPTER_SECTION_QUERY_SUFFIXES.values()
+        ]
+
+    def _build_retrieval_plan(self, results: List[List[Any]], k: int) -> Dict[str, str]:
+        plan = {
+            section: self._format_context(docs)
+            for section, docs in zip(CHAPTER_SECTION_QUERY_SUFFIXES, results)
+        }
+
+        # 공통 참고 자료: 각 섹션의 1순위, 2순위, ... 순서로 번갈아 담고 중복 청크 제거
+        shared_docs = []
+        for rank in range(k):
+            for docs in results:
+                if rank < len(docs) and all(docs[rank] is not doc for doc in shared_docs):
+                    shared_docs.append(docs[rank])
+        plan["shared"] = self._format_context(shared_docs[:k + 1])
+        return plan
+
+    async def plan_chapter_retrieval(self, chapter_title: str, chapter_desc: str, k: int = 3) -> Dict[str, str]:
+        """
+        챕터의 4개 섹션에 필요한 참고 자료를 한 번에 검색합니다. (검색 계획 단계)
+
+        섹션별 쿼리("{제목} {설명} 개념 설명", "... 실습 연습" 등)를 한 번의 배치 임베딩 요청으로 벡터화하고,
+        FAISS 행렬 검색 1회로 모든 섹션의 결과를 가져옵니다. 섹션 간에 겹치는 청크는 한 번만 조회합니다.
+
+        Args:
+            chapter_title: 챕터 제목
+            chapter_desc: 챕터 설명
+            k: 섹션별 참고 자료 수, 기본값 3
+
+        Returns:
+            Dict[str, str]: 섹션 이름("concept", "exercise", "quiz", "advanced_learning") -> 포맷팅된 참고 자료
+                "shared" 키에는 섹션별 결과를 순위 순으로 번갈아 합치고 중복을 제거한 공통 참고 자료(최대 k+1개)가 담깁니다.
+                RAG가 비활성화되었거나 검색에 실패하면 모든 값이 빈 문자열입니다.
+        """
+        return (await self.plan_chapter_retrievals([(chapter_title, chapter_desc)], k))[0]
+
+    async def plan_chapter_retrievals(self, chapters: List[Tuple[str, str]], k: int = 3) -> List[Dict[str, str]]:
+        """
+        여러 챕터의 검색 계획을 한 번의 배치 검색으로 만듭니다. (코스 전체 일괄 생성 등)
+
+        챕터 N개 × 섹션 4개의 쿼리를 embed_documents 1회 + FAISS 행렬 검색 1회로 처리합니다.
+        검색 결과는 결과 캐시에도 저장되므로, 이후 챕터별 plan_chapter_retrieval 호출은 캐시에서 바로 반환됩니다.
+
+        Args:
+            chapters: (챕터 제목, 챕터 설명) 목록
+            k: 섹션별 참고 자료 수, 기본값 3
+
+        Returns:
+            List[Dict[str, str]]: 챕터 순서대로 plan_chapter_retrieval과 같은 형식의 검색 계획
+        """
+        queries = [query for title, desc in chapters for query in self._chapter_queries(title, desc)]
+        results = await self._search_documents_many(queries, k)
+        per_chapter = len(CHAPTER_SECTION_QUERY_SUFFIXES)
+        plans = [
+            self._build_retrieval_plan(results[i * per_chapter:(i + 1) * per_chapter], k)
+            for i in range(len(chapters))
+        ]
+        logger.debug(f"RAG retrieval plan: {len(chapters)} chapters, {len(queries)} queries")
+        return plans
 
     def _clean_json(self, raw: str) -> dict:
         cleaned = raw.replace("```json", "").replace("```", "").strip()
@@ -287,8 +934,6 @@ class ContentGenerator:
                     pass
             raise ValueError(f"Failed to parse JSON: {cleaned[:100]}...")
 
-            return {"title": title, "description": description, "contents": contents}
-
     def _repair_json(self, json_str: str) -> dict:
         """Attempt to repair truncated JSON."""
         try:
@@ -373,12 +1018,13 @@ class ContentGenerator:
             
             return {"title": title, "description": description, "contents": contents}
 
-    def get_learning_context(self, course_title: str) -> str:
+    def get_learning_context(self, course_title: str, chapter_title: Optional[str] = None) -> str:
         """
-        최근 퀴즈 결과와 피드백을 조회하여 학습 컨텍스트를 생성합니다.
+        최근 퀴즈 결과와 피드백으로 만든 학습 컨텍스트를 반환합니다.
         
         Args:
-            course_title: 코스 제목 (현재는 사용하지 않지만 향후 필터링에 활용 가능)
+            course_title: 코스 제목 (이 코스의 기록만 사용, 없으면 전체 최근 기록)
+            chapter_title: 챕터 제목 (이 챕터의 기록이 있으면 우선 사용)
         
         Returns:
             str: 학습 컨텍스트 문자열 (최근 성적, 약점, 피드백 포함)
@@ -387,58 +1033,53 @@ class ContentGenerator:
             - 변수명 개선: q → quiz_result, f → feedback
             - 주석 정리 및 명확화
             - 에러 처리 개선
+            - 챕터 생성마다 실행되는 동기 쿼리 2개가 이벤트 루프를 막지 않도록 AsyncSession 사용
+            - 챕터 생성마다 실행되던 quiz_results/user_feedback 정렬 쿼리 2개와 문자열 포맷팅 제거
+              → /grade-quiz, /feedback이 저장 시 갱신하는 LearningContextStore에서 O(1)로 조회
+            - 전역 기록 대신 코스/챕터 범위로 필터링
         """
+        return self.learning_context.context(course_title=course_title, chapter_title=chapter_title)
+
+    def warm_learning_context(self) -> int:
+        """
+        DB에 저장된 최근 퀴즈 결과/피드백으로 학습 컨텍스트 요약을 다시 채웁니다. (서버 시작 시 1회)
+
+        LEARNING_CONTEXT_WARM_START_LIMIT(기본 500)건씩 오래된 것부터 적용하여 범위별 최신 기록이 남도록 합니다.
+
+        Returns:
+            int: 적용한 기록 수
+        """
+        limit = int(os.getenv("LEARNING_CONTEXT_WARM_START_LIMIT", "500"))
+        if limit <= 0:
+            return 0
+        db = SessionLocal()
         try:
-            db = SessionLocal()
-            
-            # 최근 퀴즈 결과 조회 (전역 기준, 향후 course_id로 필터링 가능)
-            recent_quiz_results = (
-                db.query(QuizResult)
-                .order_by(QuizResult.timestamp.desc())
-                .limit(3)
+            quiz_results = (
+                db.query(QuizResult.course_title, QuizResult.chapter_title, QuizResult.score, QuizResult.weak_points)
+                .order_by(QuizResult.timestamp.desc(), QuizResult.id.desc())
+                .limit(limit)
                 .all()
             )
-            
-            # 최근 피드백 조회
-            recent_feedback_list = (
-                db.query(UserFeedback)
-                .order_by(UserFeedback.timestamp.desc())
-                .limit(3)
+            feedback_list = (
+                db.query(UserFeedback.course_title, UserFeedback.chapter_title, UserFeedback.rating, UserFeedback.comment)
+                .order_by(UserFeedback.timestamp.desc(), UserFeedback.id.desc())
+                .limit(limit)
                 .all()
             )
-            
+        except Exception as e:
+            logger.error(f"Failed to load learning context from DB: {e}")
+            return 0
+        finally:
             db.close()
 
-            # 컨텍스트 문자열 생성
-            context_parts = []
-            
-            if recent_quiz_results:
-                context_parts.append("Recent Quiz Performance:")
-                for quiz_result in recent_quiz_results:
-                    weak_points = quiz_result.weak_points or "없음"
-                    context_parts.append(
-                        f"- Chapter '{quiz_result.chapter_title}': "
-                        f"Score {quiz_result.score}/100. Weak points: {weak_points}"
-                    )
-            
-            if recent_feedback_list:
-                context_parts.append("Recent User Feedback:")
-                for feedback in recent_feedback_list:
-                    comment = feedback.comment or "없음"
-                    context_parts.append(
-                        f"- Chapter '{feedback.chapter_title}': "
-                        f"Rating {feedback.rating}/5. Comment: '{comment}'"
-                    )
-            
-            return "\n".join(context_parts) if context_parts else ""
-            
-        except Exception as error:
-            logger.error(f"Failed to get learning context: {error}", exc_info=True)
-            return ""  # 컨텍스트 없이도 콘텐츠 생성 가능
+        for course_title, chapter_title, score, weak_points in reversed(quiz_results):
+            self.learning_context.record_quiz(chapter_title, score, weak_points, course_title=course_title)
+        for course_title, chapter_title, rating, comment in reversed(feedback_list):
+            self.learning_context.record_feedback(chapter_title, rating, comment, course_title=course_title)
+        return len(quiz_results) + len(feedback_list)
 
-    async def generate_learning_objectives(self, topic: str, language: str = "ko") -> dict:
-        start_time = time.time()
-        
+    def _build_objectives_prompt(self, topic: str, language: str) -> tuple:
+        """학습 목표 생성용 (system_message, prompt)를 만듭니다. 응답 캐시 warm-start에서도 사용합니다."""
         if language == "ko":
             prompt = f"주제 '{topic}'에 대한 3가지 다른 학습 경로/목표를 제안해주세요."
             lang_instruction = "IMPORTANT: All output (titles, descriptions, target_audience) MUST be in Korean."
@@ -474,66 +1115,51 @@ class ContentGenerator:
         }}
         """
 
-        
-        max_retries = 3
-        last_exception = None
+        return system_message, prompt
 
-        for attempt in range(max_retries):
-            try:
-                # API 키 재검증 (런타임에서 변경되었을 수 있음)
-                if not self.model:
-                    error_msg = "Gemini model is not initialized. ContentGenerator may have failed to initialize."
-                    logger.error(error_msg)
-                    raise ValueError(error_msg)
-                
-                logger.info(f"Generating learning objectives for topic: '{topic}' (attempt {attempt + 1}/{max_retries})")
-                
-                response = await self.model.generate_content_async(
-                    f"{system_message}\n\n{prompt}",
-                    generation_config=genai.types.GenerationConfig(temperature=0.7, max_output_tokens=2048),
-                    safety_settings=self.safety_settings
-                )
-                
-                # 응답 검증
-                if not response or not response.text:
-                    raise ValueError("Empty response from Gemini API")
-                
-                result = self._clean_json(response.text)
-                
-                # 결과 검증
-                if "objectives" not in result or not isinstance(result.get("objectives"), list):
-                    raise ValueError(f"Invalid response format: missing 'objectives' field or not a list")
-                
-                if len(result.get("objectives", [])) == 0:
-                    raise ValueError("No objectives returned in response")
-                
-                # Log to DB
-                latency = int((time.time() - start_time) * 1000)
-                self._log_to_db("objectives", topic, prompt, json.dumps(result, ensure_ascii=False), latency)
-                
-                logger.info(f"Successfully generated {len(result.get('objectives', []))} learning objectives")
-                return result
-                
-            except ValueError as ve:
-                # 검증 에러는 즉시 실패 (재시도 불필요)
-                logger.error(f"Validation error in generate_learning_objectives: {ve}")
-                raise ve
-            except Exception as e:
-                last_exception = e
-                error_type = type(e).__name__
-                logger.warning(f"Attempt {attempt + 1}/{max_retries} failed ({error_type}): {e}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(1)  # Async sleep before retry
-
-        # 모든 재시도 실패
-        error_summary = f"All {max_retries} attempts failed. Last error ({type(last_exception).__name__}): {last_exception}"
-        logger.error(error_summary)
-        logger.error("Possible causes:")
-        logger.error("  1. Invalid or expired GEMINI_API_KEY")
-        logger.error("  2. Network connectivity issues")
-        logger.error("  3. Gemini API service unavailable")
-        logger.error("  4. Rate limiting or quota exceeded")
-        raise last_exception
+    async def generate_learning_objectives(self, topic: str, language: str = "ko") -> dict:
+        start_time = time.time()
+        system_message, prompt = self._build_objectives_prompt(topic, language)
+
+        # API 키 재검증 (런타임에서 변경되었을 수 있음)
+        if not self.model:
+            error_msg = "Gemini model is not initialized. ContentGenerator may have failed to initialize."
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        logger.info(f"Generating learning objectives for topic: '{topic}'")
+
+        try:
+            # 일시적 오류 재시도(지수 백오프 + 지터)는 _call_model이 공통으로 처리
+            raw = await self._call_model("objectives", f"{system_message}\n\n{prompt}")
+        except ValueError as ve:
+            # 검증 에러는 즉시 실패 (재시도 불필요)
+            logger.error(f"Validation error in generate_learning_objectives: {ve}")
+            raise
+        except Exception as e:
+            logger.error(f"Learning objectives generation failed ({type(e).__name__}): {e}")
+            logger.error("Possible causes:")
+            logger.error("  1. Invalid or expired GEMINI_API_KEY")
+            logger.error("  2. Network connectivity issues")
+            logger.error("  3. Gemini API service unavailable")
+            logger.error("  4. Rate limiting or quota exceeded")
+            raise
+
+        result = self._clean_json(raw)
+
+        # 결과 검증
+        if "objectives" not in result or not isinstance(result.get("objectives"), list):
+            raise ValueError(f"Invalid response format: missing 'objectives' field or not a list")
+
+        if len(result.get("objectives", [])) == 0:
+            raise ValueError("No objectives returned in response")
+
+        # Log to DB
+        latency = int((time.time() - start_time) * 1000)
+        self._log_to_db("objectives", topic, prompt, json.dumps(result, ensure_ascii=False), latency)
+
+        logger.info(f"Successfully generated {len(result.get('objectives', []))} learning objectives")
+        return result
 
     async def generate_course(self, topic: str, description: str, difficulty: str, max_chapters: int, selected_objective: str = "", language: str = "ko") -> dict:
         start_time = time.time()
@@ -605,13 +1231,9 @@ If reference materials are provided, use them to structure the course chapters i
 You are working as part of an AI system, so no chit-chat and no explaining what you're doing and why.
 DO NOT start with "Okay", or "Alright" or any preambles. Just the output, please."""
 
-        response = await self.model.generate_content_async(
-            f"{system_message}\n\n{prompt}",
-            generation_config=genai.types.GenerationConfig(temperature=0.7, max_output_tokens=4096),
-            safety_settings=self.safety_settings
-        )
+        raw = await self._call_model("course", f"{system_message}\n\n{prompt}")
         
-        result = self._clean_json(response.text)
+        result = self._clean_json(raw)
         
         # Log to DB
         latency = int((time.time() - start_time) * 1000)
@@ -619,11 +1241,8 @@ DO NOT start with "Okay", or "Alright" or any preambles. Just the output, please
         
         return result
 
-    async def generate_concept(self, course_title: str, course_desc: str, chapter_title: str, chapter_desc: str, learning_context: str = "") -> dict:
-        start_time = time.time()
-        search_query = f"{chapter_title} {chapter_desc} 개념 설명"
-        rag_context = await self.search_context(search_query, k=3)
-
+    def _build_concept_prompt(self, course_title: str, course_desc: str, chapter_title: str, chapter_desc: str, learning_context: str, rag_context: str) -> tuple:
+        """개념 설명 생성용 (system_message, prompt)를 만듭니다. generate_concept와 stream_concept가 공유합니다."""
         prompt_parts = [
             f"Course Title: {course_title}",
             f"Course Description: {course_desc}",
@@ -638,42 +1257,21 @@ DO NOT start with "Okay", or "Alright" or any preambles. Just the output, please
 
         prompt = "\n".join(prompt_parts)
 
-        system_message = """당신은 JSON 응답 전용 AI입니다.
-입력 데이터는 다음 형식으로 주어집니다:
-	"courseTitle": "string",
-	"courseDescription": "string",
-	"chapterTitle": "string",
-	"chapterDescription": "string"
+        system_message = CONCEPT_SYSTEM_MESSAGE
 
-작업:
-You are an experienced educational content creator, skilled at transforming course details and specific prompts into comprehensive and well-structured self-study materials. Your goal is to generate 800~1000 words worth of high-quality educational content in a markdown format that is easy for self-learners to understand. Use headings, subheadings, bullet points, etc. for easier understanding.
-IMPORTANT: Ensure the JSON response is complete and valid. Do not truncate the output. Prioritize finishing the JSON structure over exceeding the word count.
-If reference materials are provided, use them to create accurate and comprehensive content that aligns with the reference materials.
-output language: ko
+        return system_message, prompt
 
-출력 형식 (반드시 JSON):
-{
-  "title": "string",
-  "description": "string",
-  "contents": "string"
-}
+    async def generate_concept(self, course_title: str, course_desc: str, chapter_title: str, chapter_desc: str, learning_context: str = "", rag_context: Optional[str] = None) -> dict:
+        start_time = time.time()
+        if rag_context is None:  # 검색 계획(plan_chapter_retrieval)으로 미리 받은 자료가 없을 때만 검색
+            search_query = f"{chapter_title} {chapter_desc} 개념 설명"
+            rag_context = await self.search_context(search_query, k=3)
 
-⚠️ 규칙:
-- 반드시 위 JSON 구조만 출력하세요.
-- 절대로 {"output": {...}} 또는 문자열(JSON string) 형태로 감싸지 마세요.
-- 대화형 멘트, 설명, 사족 없이 오직 JSON 데이터만 출력하세요.
-- "contents" 필드는 markdown 문서 본문으로 채우세요 .
-⚠️ 출력 시 절대로 Markdown 코드블록(```json`, ``` 등)을 포함하지 마세요.
-⚠️ 절대로 {"output": {...}} 형태로 감싸지 말고, 
-오직 {"title": "...", "description": "...", "contents": "..."} 구조로만 출력하세요."""
+        system_message, prompt = self._build_concept_prompt(course_title, course_desc, chapter_title, chapter_desc, learning_context, rag_context)
 
-        response = await self.model.generate_content_async(
-            f"{system_message}\n\n{prompt}",
-            generation_config=genai.types.GenerationConfig(temperature=0.7, max_output_tokens=8192),
-            safety_settings=self.safety_settings
-        )
+        raw = await self._call_model("concept", f"{system_message}\n\n{prompt}")
         
-        result = self._extract_content(response.text)
+        result = self._extract_content(raw)
         
         # Log to DB
         latency = int((time.time() - start_time) * 1000)
@@ -681,10 +1279,45 @@ output language: ko
 
         return result
 
-    async def generate_exercise(self, course_title: str, course_desc: str, chapter_title: str, chapter_desc: str, learning_context: str = "") -> dict:
+    async def stream_concept(self, course_title: str, course_desc: str, chapter_title: str, chapter_desc: str, learning_context: str = "", rag_context: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        개념 설명을 Gemini 스트리밍 API로 생성하며, "contents" 마크다운을 도착하는 대로 전달합니다.
+
+        JSON 객체가 닫히기 전에도 JsonStringFieldExtractor로 "contents" 값을 점진적으로 디코딩하여
+        {"type": "delta", "text": ...} 이벤트로 내보내고, 마지막에 {"type": "result", "data": {...}}를 내보냅니다.
+        최종 결과는 generate_concept와 같은 형식이며 같은 방식으로 로그를 남깁니다.
+
+        Yields:
+            Dict[str, Any]: "delta" 이벤트 (0개 이상) 후 "result" 이벤트 1개
+        """
         start_time = time.time()
-        search_query = f"{chapter_title} {chapter_desc} 실습 연습"
-        rag_context = await self.search_context(search_query, k=3)
+        if rag_context is None:
+            search_query = f"{chapter_title} {chapter_desc} 개념 설명"
+            rag_context = await self.search_context(search_query, k=3)
+
+        system_message, prompt = self._build_concept_prompt(course_title, course_desc, chapter_title, chapter_desc, learning_context, rag_context)
+
+        extractor = JsonStringFieldExtractor("contents")
+        raw_parts = []
+        async for text in self._stream_model("concept", f"{system_message}\n\n{prompt}"):
+            raw_parts.append(text)
+            delta = extractor.feed(text)
+            if delta:
+                yield {"type": "delta", "text": delta}
+
+        result = self._extract_content("".join(raw_parts))
+
+        # Log to DB
+        latency = int((time.time() - start_time) * 1000)
+        self._log_to_db("concept", chapter_title, prompt, json.dumps(result, ensure_ascii=False), latency)
+
+        yield {"type": "result", "data": result}
+
+    async def generate_exercise(self, course_title: str, course_desc: str, chapter_title: str, chapter_desc: str, learning_context: str = "", rag_context: Optional[str] = None) -> dict:
+        start_time = time.time()
+        if rag_context is None:  # 검색 계획(plan_chapter_retrieval)으로 미리 받은 자료가 없을 때만 검색
+            search_query = f"{chapter_title} {chapter_desc} 실습 연습"
+            rag_context = await self.search_context(search_query, k=3)
 
         prompt_parts = [
             f"Course Title: {course_title}",
@@ -700,48 +1333,11 @@ output language: ko
 
         prompt = "\n".join(prompt_parts)
 
-        system_message = """당신은 JSON 응답 전용 AI입니다.
-입력 데이터는 다음 형식으로 주어집니다:
-	"courseTitle": "string",
-	"courseDescription": "string",
-	"chapterTitle": "string",
-	"chapterDescription": "string"
-
-작업:
-You are an AI assistant specializing in education and personalized learning. Your task is to generate approximately three distinct, personalized self-study exercises. These exercises should focus on basic concepts relevant to the provided chapter ID, course title, course description, and the user's learning profile details. The output should be clearly structured, presenting each of the three exercises distinctly.
-If reference materials are provided, use them to create exercises that align with the concepts covered in the reference materials.
-# Step by Step instructions
-1. Review the provided Chapter ID, Course Title, Course Description, and Prompt to understand the context and the learner's profile details.
-2. Generate the first personalized self-study exercise, focusing on basic concepts relevant to the Chapter ID, Course Title, Course Description, and the chapter's description.
-3. Generate the second personalized self-study exercise, ensuring it is distinct from the first and also focuses on basic concepts relevant to the Chapter ID, Course Title, Course Description, and the learner's profile details.
-4. Generate the third personalized self-study exercise, ensuring it is distinct from the previous two and also focuses on basic concepts relevant to the Course Title, Course Description, Chapter title, and its description.
-5. Review the three generated exercises. Are there approximately three distinct exercises? If not, go back to step 2 and adjust or regenerate the exercises as needed to meet the count and distinctness requirements.
-6. Ensure each exercise is clearly structured and presented individually.
-output language: ko
-
-출력 형식 (반드시 JSON):
-{
-  "title": "string",
-  "description": "string",
-  "contents": "string"
-}
-
-⚠️ 규칙:
-- 반드시 위 JSON 구조만 출력하세요.
-- 절대로 {"output": {...}} 또는 문자열(JSON string) 형태로 감싸지 마세요.
-- 대화형 멘트, 설명, 사족 없이 오직 JSON 데이터만 출력하세요.
-- "contents" 필드는 markdown 문서 본문으로 채우세요 .
-⚠️ 출력 시 절대로 Markdown 코드블록(```json`, ``` 등)을 포함하지 마세요.
-⚠️ 절대로 {"output": {...}} 형태로 감싸지 말고, 
-오직 {"title": "...", "description": "...", "contents": "..."} 구조로만 출력하세요."""
+        system_message = EXERCISE_SYSTEM_MESSAGE
 
-        response = await self.model.generate_content_async(
-            f"{system_message}\n\n{prompt}",
-            generation_config=genai.types.GenerationConfig(temperature=0.7, max_output_tokens=8192),
-            safety_settings=self.safety_settings
-        )
+        raw = await self._call_model("exercise", f"{system_message}\n\n{prompt}")
         
-        result = self._extract_content(response.text)
+        result = self._extract_content(raw)
         
         # Log to DB
         latency = int((time.time() - start_time) * 1000)
@@ -749,11 +1345,12 @@ output language: ko
 
         return result
 
-    async def generate_quiz(self, course_title: str, chapter_title: str, chapter_desc: str, course_prompt: str = "", learning_context: str = "") -> dict:
+    async def generate_quiz(self, course_title: str, chapter_title: str, chapter_desc: str, course_prompt: str = "", learning_context: str = "", rag_context: Optional[str] = None) -> dict:
         """Generate 5 Multiple Choice Questions."""
         start_time = time.time()
-        search_query = f"{chapter_title} {chapter_desc} 객관식 퀴즈"
-        rag_context = await self.search_context(search_query, k=3)
+        if rag_context is None:  # 검색 계획(plan_chapter_retrieval)으로 미리 받은 자료가 없을 때만 검색
+            search_query = f"{chapter_title} {chapter_desc} 객관식 퀴즈"
+            rag_context = await self.search_context(search_query, k=3)
 
         prompt_parts = [
             f"Course Title: {course_title}",
@@ -768,66 +1365,139 @@ output language: ko
 
         prompt = "\n".join(prompt_parts)
 
-        system_message = """당신은 JSON 응답 전용 AI입니다.
-입력 데이터는 다음 형식으로 주어집니다:
-	"courseTitle": "string",
-	"chapterTitle": "string"
+        system_message = QUIZ_SYSTEM_MESSAGE
 
-작업:
-You are an expert quiz generator. Create 5 multiple-choice questions (4 options each) based on the chapter content.
-Output must be a JSON object with a "quizes" array.
-Each item in "quizes" must have:
-- "question": string
-- "options": array of 4 strings
-- "answer": string (must be one of the options)
-- "explanation": string (explanation of the correct answer)
+        raw = await self._call_model("quiz", f"{system_message}\n\n{prompt}")
+        
+        result = self._clean_json(raw)
+        
+        # Log to DB
+        latency = int((time.time() - start_time) * 1000)
+        self._log_to_db("quiz", chapter_title, prompt, json.dumps(result, ensure_ascii=False), latency)
 
-output language: ko
+        return result
 
-출력 형식 (반드시 JSON):
-{
-  "quizes": [
-    {
-      "question": "string",
-      "options": ["string", "string", "string", "string"],
-      "answer": "string",
-      "explanation": "string"
-    },
-    ... (5 items)
-  ]
-}
+    async def generate_advanced_learning(self, course_title: str, chapter_title: str, chapter_desc: str, course_prompt: str = "", learning_context: str = "", rag_context: Optional[str] = None) -> dict:
+        start_time = time.time()
+        if rag_context is None:  # 검색 계획(plan_chapter_retrieval)으로 미리 받은 자료가 없을 때만 검색
+            search_query = f"{chapter_title} {chapter_desc} 심화 학습 주관식 문제"
+            rag_context = await self.search_context(search_query, k=3)
 
-⚠️ 규칙:
-- 반드시 위 JSON 구조만 출력하세요.
-- 절대로 {"output": {...}} 또는 문자열(JSON string) 형태로 감싸지 마세요.
-"""
+        prompt_parts = [
+            f"Course Title: {course_title}",
+            f"Chapter Title: {chapter_title}",
+            f"Course Prompt: {course_prompt}",
+        ]
+        if learning_context:
+            prompt_parts.append(f"\n[User Learning Context]\n{learning_context}\n(Please adapt the quiz difficulty and focus based on the user's performance.)")
 
-        response = await self.model.generate_content_async(
-            f"{system_message}\n\n{prompt}",
-            generation_config=genai.types.GenerationConfig(temperature=0.7, max_output_tokens=8192),
-            safety_settings=self.safety_settings
-        )
+        if rag_context:
+            prompt_parts.append(f"\n[참고 교재 자료]\n{rag_context}")
+
+        prompt = "\n".join(prompt_parts)
+
+        system_message = ADVANCED_LEARNING_SYSTEM_MESSAGE
+
+        raw = await self._call_model("advanced_learning", f"{system_message}\n\n{prompt}")
         
-        result = self._clean_json(response.text)
+        result = self._clean_json(raw)
         
         # Log to DB
         latency = int((time.time() - start_time) * 1000)
-        self._log_to_db("quiz", chapter_title, prompt, json.dumps(result, ensure_ascii=False), latency)
+        self._log_to_db("advanced_learning", chapter_title, prompt, json.dumps(result, ensure_ascii=False), latency)
 
         return result
 
-    async def generate_advanced_learning(self, course_title: str, chapter_title: str, chapter_desc: str, course_prompt: str = "", learning_context: str = "") -> dict:
+    def _is_complete_bundle(self, raw: str) -> bool:
+        """통합 응답 텍스트가 JSON으로 파싱되고 네 섹션이 모두 올바른 구조인지 확인합니다. (응답 캐시 검사용)"""
+        try:
+            bundle = self._clean_json(raw)
+        except ValueError:
+            return False
+        return isinstance(bundle, dict) and all(
+            self._validate_bundle_section(section, bundle.get(section)) is not None
+            for section in ("concept", "exercise", "quiz", "advanced_learning")
+        )
+
+    def _validate_bundle_section(self, section: str, data: Any) -> Optional[dict]:
+        """
+        통합 응답의 개별 섹션이 기존 섹션별 응답과 같은 구조인지 검사합니다.
+
+        Args:
+            section: 섹션 이름 ("concept", "exercise", "quiz", "advanced_learning")
+            data: 통합 응답에서 꺼낸 섹션 데이터
+
+        Returns:
+            Optional[dict]: 정규화된 섹션 데이터, 구조가 올바르지 않으면 None
+        """
+        if not isinstance(data, dict):
+            return None
+
+        if section in ("concept", "exercise"):
+            contents = data.get("contents")
+            if not isinstance(contents, str) or not contents.strip():
+                return None
+            return {
+                "title": str(data.get("title", "")),
+                "description": str(data.get("description", "")),
+                "contents": contents
+            }
+
+        quizes = data.get("quizes")
+        if not isinstance(quizes, list) or not quizes:
+            return None
+
+        if section == "quiz":
+            for item in quizes:
+                if not isinstance(item, dict):
+                    return None
+                options = item.get("options")
+                if not isinstance(item.get("question"), str) or not isinstance(options, list) or len(options) < 2:
+                    return None
+                if not isinstance(item.get("answer"), str) or not isinstance(item.get("explanation"), str):
+                    return None
+            return {"quizes": quizes}
+
+        if section == "advanced_learning":
+            for item in quizes:
+                if not isinstance(item, dict) or not isinstance(item.get("quiz"), str):
+                    return None
+            return {"quizes": quizes}
+
+        return None
+
+    async def generate_chapter_bundle(self, course_title: str, course_desc: str, chapter_title: str, chapter_desc: str, learning_context: str = "") -> Dict[str, Any]:
+        """
+        개념/실습/퀴즈/심화 학습 4개 섹션을 한 번의 Gemini 호출로 생성합니다.
+
+        섹션별 생성(generate_concept 등)은 긴 시스템 프롬프트와 RAG 검색을 4번 반복하지만,
+        이 메서드는 공통 입력과 참고 자료를 한 번만 보내고 4개 섹션을 하나의 JSON 객체로 받습니다.
+        통합 응답이 깨졌거나 일부 섹션 구조가 올바르지 않으면 해당 섹션만 기존 섹션별 메서드로 다시 생성합니다.
+
+        Args:
+            course_title: 코스 제목
+            course_desc: 코스 설명
+            chapter_title: 챕터 제목
+            chapter_desc: 챕터 설명
+            learning_context: 학습 컨텍스트 (최근 퀴즈 결과, 피드백)
+
+        Returns:
+            Dict[str, Any]: {"concept", "exercise", "quiz", "advanced_learning"} 키를 가진 딕셔너리
+                asyncio.gather(return_exceptions=True)와 같이, 폴백 생성까지 실패한 섹션의 값은 Exception 객체입니다.
+        """
         start_time = time.time()
-        search_query = f"{chapter_title} {chapter_desc} 심화 학습 주관식 문제"
-        rag_context = await self.search_context(search_query, k=3)
+        # 섹션별 참고 자료를 한 번에 검색 (폴백 시에도 재검색하지 않도록 섹션별 결과 보관)
+        retrieval_plan = await self.plan_chapter_retrieval(chapter_title, chapter_desc)
+        rag_context = retrieval_plan["shared"]
 
         prompt_parts = [
             f"Course Title: {course_title}",
+            f"Course Description: {course_desc}",
             f"Chapter Title: {chapter_title}",
-            f"Course Prompt: {course_prompt}",
+            f"Chapter Description: {chapter_desc}",
         ]
         if learning_context:
-            prompt_parts.append(f"\n[User Learning Context]\n{learning_context}\n(Please adapt the quiz difficulty and focus based on the user's performance.)")
+            prompt_parts.append(f"\n[User Learning Context]\n{learning_context}\n(Please adapt the difficulty and focus of every section based on this context.)")
 
         if rag_context:
             prompt_parts.append(f"\n[참고 교재 자료]\n{rag_context}")
@@ -842,51 +1512,67 @@ output language: ko
 	"chapterDescription": "string"
 
 작업:
-You are an expert educational content creator. Your task is to generate three subjective essay-type "Advanced Learning" questions that provoke thoughtful responses and deep understanding.
-For each question, also provide a comprehensive model answer that demonstrates depth of understanding and critical thinking.
-The output must be a JSON array named `quizes`, containing three objects, each with:
-- `quiz` (string): The question
-- `model_answer` (string): A detailed model answer (200-300 words in Korean)
-
+You are an experienced educational content creator. For the given chapter, produce a complete self-study package with four sections in a single JSON object.
+If reference materials are provided, use them so that every section is accurate and aligned with the reference materials.
+1. "concept": 800~1000 words of well-structured markdown explaining the chapter's concepts for self-learners (headings, subheadings, bullet points).
+2. "exercise": approximately three distinct, personalized self-study exercises on the chapter's basic concepts, in markdown.
+3. "quiz": 5 multiple-choice questions with 4 options each. "answer" must be one of the options, and "explanation" explains the correct answer.
+4. "advanced_learning": 3 subjective essay-type questions that provoke deep understanding, each with a 200-300 word model answer.
+IMPORTANT: Ensure the JSON response is complete and valid. Do not truncate the output. Prioritize finishing the JSON structure over exceeding the word count.
 output language: ko
 
 출력 형식 (반드시 JSON):
 {
-  "quizes" : [
-    {
-      "quiz" : "string",
-      "model_answer" : "string"
-    },
-    {
-      "quiz" : "string",
-      "model_answer" : "string"
-    },
-    {
-      "quiz" : "string",
-      "model_answer" : "string"
-    }
-  ]
+  "concept": {"title": "string", "description": "string", "contents": "string"},
+  "exercise": {"title": "string", "description": "string", "contents": "string"},
+  "quiz": {
+    "quizes": [
+      {"question": "string", "options": ["string", "string", "string", "string"], "answer": "string", "explanation": "string"}
+    ]
+  },
+  "advanced_learning": {
+    "quizes": [
+      {"quiz": "string", "model_answer": "string"}
+    ]
+  }
 }
 
 ⚠️ 규칙:
 - 반드시 위 JSON 구조만 출력하세요.
 - 절대로 {"output": {...}} 또는 문자열(JSON string) 형태로 감싸지 마세요.
-- model_answer는 학습자가 스스로 답을 작성한 후 참고할 수 있는 모범적인 답안이어야 합니다.
-"""
-
-        response = await self.model.generate_content_async(
-            f"{system_message}\n\n{prompt}",
-            generation_config=genai.types.GenerationConfig(temperature=0.7, max_output_tokens=8192),
-            safety_settings=self.safety_settings
-        )
-        
-        result = self._clean_json(response.text)
-        
-        # Log to DB
-        latency = int((time.time() - start_time) * 1000)
-        self._log_to_db("advanced_learning", chapter_title, prompt, json.dumps(result, ensure_ascii=False), latency)
+- 대화형 멘트, 설명, 사족 없이 오직 JSON 데이터만 출력하세요.
+- "contents" 필드는 markdown 문서 본문으로 채우세요.
+⚠️ 출력 시 절대로 Markdown 코드블록(```json`, ``` 등)을 포함하지 마세요."""
 
-        return result
+        sections: Dict[str, Any] = {}
+        try:
+            # 네 섹션이 모두 올바른 통합 응답만 캐시 (일부가 깨진 응답이 캐시되면 같은 챕터는 계속 폴백만 하게 됨)
+            raw = await self._call_model("chapter_bundle", f"{system_message}\n\n{prompt}", validate=self._is_complete_bundle)
+            bundle = self._clean_json(raw)
+            for section in ("concept", "exercise", "quiz", "advanced_learning"):
+                validated = self._validate_bundle_section(section, bundle.get(section))
+                if validated is not None:
+                    sections[section] = validated
+
+            latency = int((time.time() - start_time) * 1000)
+            self._log_to_db("chapter_bundle", chapter_title, prompt, json.dumps(bundle, ensure_ascii=False), latency)
+        except Exception as e:
+            logger.warning(f"Chapter bundle generation failed, falling back to per-section generation: {type(e).__name__}: {e}")
+
+        # 통합 응답에서 빠졌거나 깨진 섹션만 섹션별 메서드로 다시 생성
+        fallbacks = {
+            "concept": lambda: self.generate_concept(course_title, course_desc, chapter_title, chapter_desc, learning_context, rag_context=retrieval_plan["concept"]),
+            "exercise": lambda: self.generate_exercise(course_title, course_desc, chapter_title, chapter_desc, learning_context, rag_context=retrieval_plan["exercise"]),
+            "quiz": lambda: self.generate_quiz(course_title, chapter_title, chapter_desc, course_desc, learning_context, rag_context=retrieval_plan["quiz"]),
+            "advanced_learning": lambda: self.generate_advanced_learning(course_title, chapter_title, chapter_desc, course_desc, learning_context, rag_context=retrieval_plan["advanced_learning"]),
+        }
+        missing = [section for section in fallbacks if section not in sections]
+        if missing:
+            logger.info(f"Chapter bundle fallback for sections {missing}: {chapter_title}")
+            results = await asyncio.gather(*(fallbacks[section]() for section in missing), return_exceptions=True)
+            sections.update(zip(missing, results))
+
+        return sections
 
     async def grade_quiz(self, question: str, answer: str, chapter_title: str, chapter_desc: str) -> dict:
         start_time = time.time()
@@ -912,25 +1598,11 @@ output language: ko
 }}
 """
 
-        system_message = """당신은 교육 전문가입니다. 학생의 답안을 공정하고 건설적으로 채점하고 피드백을 제공하세요.
-점수는 0-100 사이로 주되, 답안의 완성도, 정확성, 이해도를 종합적으로 평가하세요.
-
-⚠️ 중요: 반드시 완전한 JSON 형식으로 응답하세요. JSON이 잘리지 않도록 주의하세요.
-반드시 다음 구조를 완전히 포함하세요:
-{
-  "score": 숫자,
-  "feedback": "문자열",
-  "correct_points": ["문자열 배열"],
-  "improvements": ["문자열 배열"]
-}"""
+        system_message = GRADING_SYSTEM_MESSAGE
 
-        response = await self.model.generate_content_async(
-            f"{system_message}\n\n{prompt}",
-            generation_config=genai.types.GenerationConfig(temperature=0.3, max_output_tokens=4096),
-            safety_settings=self.safety_settings
-        )
+        raw = await self._call_model("grading", f"{system_message}\n\n{prompt}")
         
-        result = self._clean_json(response.text)
+        result = self._clean_json(raw)
         
         # Log to DB
         latency = int((time.time() - start_time) * 1000)
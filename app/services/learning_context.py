@@ -0,0 +1,158 @@
+"""
+학습 컨텍스트 요약 저장소
+
+변경 이유:
+- ContentGenerator.get_learning_context가 챕터 생성마다 quiz_results, user_feedback을
+  timestamp 정렬로 조회하고 문자열을 다시 만들었음 (인덱스 없는 정렬 2회 + 포맷팅)
+- /grade-quiz, /feedback이 저장할 때 메모리의 최근 N건 요약을 함께 갱신하고,
+  생성 시에는 미리 만들어 둔 문자열을 O(1)로 읽음 (시작 시 DB의 최근 기록으로 다시 채움)
+- 전역 한 덩어리가 아니라 코스/챕터 범위별로 요약을 유지하여, 해당 코스의 기록만 컨텍스트로 사용
+"""
+import logging
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger("pop_pins_api")
+
+SCOPE_COURSE = "course"
+SCOPE_CHAPTER = "chapter"
+
+
+def _chapter_scope_name(course_title: Optional[str], chapter_title: str) -> str:
+    # 다른 코스의 같은 제목 챕터와 섞이지 않도록 코스 제목을 함께 사용
+    return f"{course_title or ''}\x00{chapter_title}"
+
+
+class _ScopeSummary:
+    """한 범위(전역/코스/챕터)의 최근 퀴즈 결과와 피드백, 그리고 미리 만든 컨텍스트 문자열"""
+
+    def __init__(self, size: int):
+        self.quizzes: Deque[str] = deque(maxlen=size)
+        self.feedback: Deque[str] = deque(maxlen=size)
+        self._text: Optional[str] = None
+
+    def add_quiz(self, line: str) -> None:
+        self.quizzes.appendleft(line)  # 최신 항목이 앞
+        self._text = None
+
+    def add_feedback(self, line: str) -> None:
+        self.feedback.appendleft(line)
+        self._text = None
+
+    def text(self) -> str:
+        if self._text is None:
+            parts = []
+            if self.quizzes:
+                parts.append("Recent Quiz Performance:")
+                parts.extend(self.quizzes)
+            if self.feedback:
+                parts.append("Recent User Feedback:")
+                parts.extend(self.feedback)
+            self._text = "\n".join(parts)
+        return self._text
+
+
+class LearningContextStore:
+    """
+    최근 퀴즈 결과/피드백 요약을 범위별로 유지합니다.
+
+    - 쓰기(record_quiz, record_feedback): 전역, 코스, 챕터 범위의 요약에 한 줄씩 추가 (각 범위 최근 size건)
+    - 읽기(context): 가장 좁은 범위부터 기록이 있는 요약 문자열을 반환 (챕터 → 코스 → 전역)
+    - 코스/챕터 범위 수가 max_scopes를 넘으면 가장 오래 갱신되지 않은 범위부터 제거 (전역 요약은 유지)
+
+    동기 엔드포인트(스레드 풀)와 이벤트 루프에서 함께 호출되므로 잠금으로 보호합니다.
+
+    Example:
+        store = LearningContextStore.from_env()
+        store.record_quiz("리스트 기초", 80, '["슬라이싱"]', course_title="파이썬 리스트")
+        store.context(course_title="파이썬 리스트")
+    """
+
+    def __init__(self, size: int = 3, max_scopes: int = 10000):
+        self.size = max(1, size)
+        self.max_scopes = max_scopes
+        self._lock = threading.Lock()
+        self._global = _ScopeSummary(self.size)
+        self._scopes: Dict[Tuple[str, str], _ScopeSummary] = {}  # (종류, 이름) → 코스/챕터 범위 요약
+        self._counters = {"quiz_records": 0, "feedback_records": 0, "reads": 0, "scope_evictions": 0}
+
+    @classmethod
+    def from_env(cls) -> "LearningContextStore":
+        """환경 변수(LEARNING_CONTEXT_SIZE, LEARNING_CONTEXT_MAX_SCOPES)로 저장소를 만듭니다."""
+        return cls(
+            size=int(os.getenv("LEARNING_CONTEXT_SIZE", "3")),
+            max_scopes=int(os.getenv("LEARNING_CONTEXT_MAX_SCOPES", "10000")),
+        )
+
+    def _scope(self, kind: str, name: str) -> _ScopeSummary:
+        key = (kind, name)
+        summary = self._scopes.pop(key, None)
+        if summary is None:
+            summary = _ScopeSummary(self.size)
+            while len(self._scopes) >= self.max_scopes:
+                del self._scopes[next(iter(self._scopes))]  # 가장 오래 갱신되지 않은 범위
+                self._counters["scope_evictions"] += 1
+        self._scopes[key] = summary  # 갱신 순서 유지 (dict 삽입 순서)
+        return summary
+
+    def _targets(self, chapter_title: Optional[str], course_title: Optional[str]) -> Iterable[_ScopeSummary]:
+        yield self._global
+        if course_title:
+            yield self._scope(SCOPE_COURSE, course_title)
+        if chapter_title:
+            yield self._scope(SCOPE_CHAPTER, _chapter_scope_name(course_title, chapter_title))
+
+    def record_quiz(
+        self,
+        chapter_title: str,
+        score: int,
+        weak_points: Optional[str],
+        course_title: Optional[str] = None
+    ) -> None:
+        """채점 결과 한 건을 요약에 추가합니다. (weak_points는 저장된 JSON 문자열 그대로)"""
+        line = f"- Chapter '{chapter_title}': Score {score}/100. Weak points: {weak_points or '없음'}"
+        with self._lock:
+            for summary in self._targets(chapter_title, course_title):
+                summary.add_quiz(line)
+            self._counters["quiz_records"] += 1
+
+    def record_feedback(
+        self,
+        chapter_title: str,
+        rating: int,
+        comment: Optional[str],
+        course_title: Optional[str] = None
+    ) -> None:
+        """피드백 한 건을 요약에 추가합니다."""
+        line = f"- Chapter '{chapter_title}': Rating {rating}/5. Comment: '{comment or '없음'}'"
+        with self._lock:
+            for summary in self._targets(chapter_title, course_title):
+                summary.add_feedback(line)
+            self._counters["feedback_records"] += 1
+
+    def context(self, course_title: Optional[str] = None, chapter_title: Optional[str] = None) -> str:
+        """
+        학습 컨텍스트 문자열을 반환합니다. (기록이 없으면 빈 문자열)
+
+        챕터 범위 → 코스 범위 → 전역 순서로 기록이 있는 첫 범위를 사용합니다.
+        코스 정보 없이 저장된 이전 기록만 있는 경우에도 전역 요약으로 이전과 같은 컨텍스트를 제공합니다.
+        """
+        candidates = []
+        if chapter_title:
+            candidates.append((SCOPE_CHAPTER, _chapter_scope_name(course_title, chapter_title)))
+        if course_title:
+            candidates.append((SCOPE_COURSE, course_title))
+        with self._lock:
+            self._counters["reads"] += 1
+            for key in candidates:
+                summary = self._scopes.get(key)
+                if summary is not None and (summary.quizzes or summary.feedback):
+                    return summary.text()
+            return self._global.text()
+
+    def stats(self) -> Dict[str, int]:
+        """기록/조회 횟수와 현재 코스/챕터 범위 수를 반환합니다."""
+        with self._lock:
+            return {**self._counters, "scopes": len(self._scopes)}
@@ -0,0 +1,165 @@
+"""
+LLM 응답 캐시 (내용 주소 기반)
+
+변경 이유:
+- ContentGenerator의 모든 생성 메서드는 (시스템 메시지 + 프롬프트)가 결정적이고 생성 설정도 고정인데,
+  같은 프롬프트(예: 같은 주제의 학습 목표)도 매번 Gemini로 다시 보내고 있었음
+- (모델 이름, 전체 프롬프트, 생성 설정)의 해시를 키로 응답 텍스트를 TieredCache(메모리 LRU + SQLite)에 저장하고,
+  같은 프롬프트가 동시에 들어오면 SingleFlight로 한 번만 호출하여 인기 주제는 전체에서 Gemini 호출 1회로 처리
+- 기존 GenerationLog 행으로 캐시를 미리 채울 수 있음 (warm-start)
+"""
+import contextvars
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.utils.cache import TieredCache
+from app.utils.singleflight import SingleFlight
+
+logger = logging.getLogger("pop_pins_api")
+
+# True이면 캐시를 읽지 않고 새로 생성 (결과는 캐시에 덮어씀)
+_bypass: "contextvars.ContextVar[bool]" = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def llm_cache_bypass(enabled: bool = True) -> Iterator[None]:
+    """
+    with 블록 안의 모델 호출은 응답 캐시를 읽지 않고 새로 생성합니다. (강제 재생성용)
+
+    블록 안에서 만든 asyncio 작업도 컨텍스트를 복사하므로 같이 적용됩니다.
+    enabled=False이면 아무것도 하지 않습니다.
+
+    Example:
+        with llm_cache_bypass(request.force_refresh):
+            await generator.generate_concept(...)
+    """
+    if not enabled:
+        yield
+        return
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def is_cache_bypassed() -> bool:
+    return _bypass.get()
+
+
+def response_cache_key(model_name: str, contents: str, settings: Dict[str, Any]) -> str:
+    """(모델 이름, 전체 프롬프트, 생성 설정)의 SHA-256 해시를 반환합니다."""
+    payload = json.dumps(
+        {"model": model_name, "settings": settings, "contents": contents},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    프롬프트 해시 → 응답 텍스트 캐시 + 동일 프롬프트 요청 병합
+
+    Attributes:
+        cache (TieredCache): 응답 텍스트 저장소 (UTF-8 bytes)
+        flights (SingleFlight): 같은 키로 진행 중인 모델 호출
+
+    Example:
+        response_cache = LLMResponseCache.from_env()
+        text = await response_cache.get_or_call(key, call)  # call() -> (text, cacheable)
+    """
+
+    def __init__(self, cache: TieredCache):
+        self.cache = cache
+        self.flights = SingleFlight()
+        self.warmed = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMResponseCache"]:
+        """환경 변수(LLM_RESPONSE_CACHE_*)로 캐시를 만듭니다. LLM_RESPONSE_CACHE_ENABLED=false이면 None."""
+        if os.getenv("LLM_RESPONSE_CACHE_ENABLED", "true").lower() != "true":
+            return None
+        disk_max_mb = float(os.getenv("LLM_RESPONSE_CACHE_DISK_MAX_MB", "512"))
+        return cls(TieredCache(
+            "llm_response",
+            max_memory_bytes=int(float(os.getenv("LLM_RESPONSE_CACHE_MAX_MB", "32")) * 1024 * 1024),
+            ttl_seconds=float(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+            disk_path=os.getenv("LLM_RESPONSE_CACHE_PATH", "./cache/llm_response_cache.db") or None,
+            max_disk_bytes=int(disk_max_mb * 1024 * 1024) if disk_max_mb > 0 else None,
+        ))
+
+    async def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 텍스트를 반환합니다. 없거나 강제 재생성 중이면 None. (디스크 계층은 thread pool에서 조회)"""
+        if is_cache_bypassed():
+            return None
+        value = await self.cache.aget(key)
+        return value.decode("utf-8") if value is not None else None
+
+    async def set(self, key: str, text: str) -> None:
+        await self.cache.aset(key, text.encode("utf-8"))
+
+    async def delete(self, key: str) -> None:
+        await self.cache.adelete(key)
+
+    async def get_or_call(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Tuple[str, bool]]],
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        캐시에 있으면 바로 반환하고, 없으면 call()로 생성합니다.
+
+        같은 키로 이미 진행 중인 호출이 있으면 새로 호출하지 않고 그 결과를 함께 기다립니다.
+
+        Args:
+            key: response_cache_key()로 만든 키
+            call: (응답 텍스트, 캐시 저장 가능 여부)를 반환하는 코루틴 팩토리
+                  출력 한도 초과 등으로 잘린 응답은 저장하지 않도록 cacheable=False를 반환
+            validate: 응답 내용 검사 함수 (선택). False인 응답은 저장하지 않고,
+                      이미 저장된 응답이 False이면 지우고 새로 생성 (정상 종료했지만 구조가 깨진 응답이 재사용되지 않도록)
+
+        Returns:
+            str: 응답 텍스트
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            if validate is None or validate(cached):
+                return cached
+            logger.warning(f"Evicting cached LLM response that failed validation: {key[:12]}")
+            await self.delete(key)
+
+        async def fill() -> str:
+            text, cacheable = await call()
+            if cacheable and (validate is None or validate(text)):
+                await self.set(key, text)
+            return text
+
+        return await self.flights.do(key, fill)
+
+    def warm_start(self, entries: Iterable[Tuple[str, str]]) -> int:
+        """
+        (키, 응답 텍스트) 목록으로 캐시를 채웁니다. 같은 키는 뒤에 오는 값이 남습니다. (서버 시작 시 동기 실행)
+
+        Returns:
+            int: 저장한 항목 수
+        """
+        count = 0
+        for key, text in entries:
+            self.cache.set(key, text.encode("utf-8"))
+            count += 1
+        self.warmed += count
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 계층별 히트/미스 카운터, 요청 병합 통계, warm-start 항목 수를 반환합니다."""
+        return {
+            **self.cache.stats(),
+            "flights": self.flights.stats(),
+            "warmed": self.warmed,
+        }
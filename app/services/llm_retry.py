@@ -0,0 +1,233 @@
+"""
+LLM 호출 재시도/백오프/헤징 정책
+
+변경 이유:
+- 재시도는 generate_learning_objectives에만 있었고 그마저 고정 1초 대기였음
+  나머지 생성/채점 호출은 일시적인 오류(429, 5xx, 네트워크 타임아웃) 한 번에 그대로 실패
+- 모든 모델 호출이 같은 정책을 쓰도록
+  1) 재시도 가능한 오류만 지수 백오프 + 지터(full jitter)로 재시도하고 (검증 오류는 즉시 실패)
+  2) 호출마다 타임아웃을 두어 응답 없는 연결을 끊고
+  3) 선택적으로 헤징: 첫 호출이 최근 지연의 상위 백분위(p95 등)를 넘기면 같은 요청을 하나 더 보내 먼저 끝난 쪽을 사용
+- 챕터 p99 지연은 대부분 느린 Gemini 호출 하나가 결정하므로 헤징으로 꼬리 지연을 줄임
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from app.services.llm_scheduler import is_rate_limit_error
+
+logger = logging.getLogger("pop_pins_api")
+
+T = TypeVar("T")
+
+# 재시도 대상 서버 오류 (google.api_core.exceptions 클래스 이름, 타입에 직접 의존하지 않음)
+_RETRYABLE_ERROR_NAMES = {
+    "InternalServerError",
+    "ServiceUnavailable",
+    "BadGateway",
+    "GatewayTimeout",
+    "DeadlineExceeded",
+    "ServerError",
+    "RetryError",
+    "ClientConnectionError",
+    "ServerDisconnectedError",
+}
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    재시도하면 성공할 수 있는 일시적 오류인지 판별합니다.
+
+    - 재시도: 429(할당량), 5xx 서버 오류, 타임아웃, 연결 오류
+    - 즉시 실패: 검증 오류(ValueError, JSON 파싱 실패 등), 인증/요청 형식 오류(4xx)
+    """
+    if is_rate_limit_error(error):
+        return True
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in _RETRYABLE_ERROR_NAMES:
+        return True
+    code = getattr(error, "code", None)
+    return isinstance(code, int) and 500 <= code < 600
+
+
+class LatencyTracker:
+    """호출 종류별 최근 성공 지연을 보관하고 백분위를 계산합니다. (헤징 기준)"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Dict[str, Deque[float]] = {}
+        self._window = window
+
+    def record(self, request_type: str, latency: float) -> None:
+        self._samples.setdefault(request_type, deque(maxlen=self._window)).append(latency)
+
+    def percentile(self, request_type: str, percentile: float, min_samples: int) -> Optional[float]:
+        """표본이 min_samples개 미만이면 None."""
+        samples = self._samples.get(request_type)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+
+class RetryPolicy:
+    """
+    모델 호출 한 건을 재시도/타임아웃/헤징 정책에 따라 실행합니다.
+
+    Attributes:
+        max_attempts (int): 최초 호출 포함 최대 시도 횟수
+        base_delay (float): 백오프 기본 대기 시간 (초), 시도마다 2배 (max_delay 상한, 0~상한 사이 무작위)
+        timeout (float): max_output_tokens 8192 기준 호출 타임아웃 (초), 출력 한도에 비례해 늘어남
+        hedge_enabled (bool): 헤징 사용 여부
+        hedge_percentile (float): 이 백분위 지연을 넘기면 헤지 요청 발송 (예: 0.95)
+
+    Example:
+        policy = RetryPolicy.from_env()
+        response = await policy.run("concept", lambda: call_once(timeout=policy.timeout_for(8192)))
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 20.0,
+        timeout: float = 120.0,
+        hedge_enabled: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_min_delay: float = 2.0
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.latencies = LatencyTracker()
+
+        self._counters = {
+            "calls": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "exhausted": 0,
+            "non_retryable": 0,
+            "hedges_fired": 0,
+            "hedges_won": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """환경 변수(LLM_MAX_ATTEMPTS, LLM_CALL_TIMEOUT_SECONDS, LLM_HEDGE_ENABLED 등)로 정책을 만듭니다."""
+        return cls(
+            max_attempts=int(os.getenv("LLM_MAX_ATTEMPTS", "3")),
+            base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY_SECONDS", "1.0")),
+            max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY_SECONDS", "20")),
+            timeout=float(os.getenv("LLM_CALL_TIMEOUT_SECONDS", "120")),
+            hedge_enabled=os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true",
+            hedge_percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95")),
+            hedge_min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+        )
+
+    def timeout_for(self, max_output_tokens: Optional[int]) -> float:
+        """출력 한도에 비례한 호출 타임아웃 (8192 토큰 = timeout, 그보다 작아도 timeout 이하로 줄이지 않음)"""
+        scale = max(1.0, (max_output_tokens or 8192) / 8192)
+        return self.timeout * scale
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """attempt번째(0부터) 실패 후 대기 시간. 429는 기본 대기 시간을 2배로 잡습니다."""
+        base = self.base_delay * (2 if is_rate_limit_error(error) else 1)
+        return random.uniform(0, min(self.max_delay, base * (2 ** attempt)))
+
+    async def run(self, request_type: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        call()을 실행하고, 재시도 가능한 오류면 백오프 후 다시 실행합니다.
+
+        Args:
+            request_type: 호출 종류 (로그 및 헤징 지연 기준 구분)
+            call: 호출 한 번을 수행하는 코루틴 팩토리 (타임아웃은 call 안에서 적용)
+
+        Raises:
+            마지막 시도의 예외 (재시도 불가 오류는 첫 시도에서 바로 전파)
+        """
+        self._counters["calls"] += 1
+        for attempt in range(self.max_attempts):
+            try:
+                if self.hedge_enabled:
+                    return await self._run_hedged(request_type, call)
+                return await self._run_timed(request_type, call)
+            except Exception as error:
+                if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+                    self._counters["timeouts"] += 1
+                if not is_retryable_error(error):
+                    self._counters["non_retryable"] += 1
+                    raise
+                if attempt == self.max_attempts - 1:
+                    self._counters["exhausted"] += 1
+                    logger.error(f"[{request_type}] All {self.max_attempts} attempts failed ({type(error).__name__}): {error}")
+                    raise
+                delay = self.backoff(attempt, error)
+                self._counters["retries"] += 1
+                logger.warning(
+                    f"[{request_type}] Attempt {attempt + 1}/{self.max_attempts} failed "
+                    f"({type(error).__name__}): {error} - retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+        raise RuntimeError("unreachable")
+
+    async def _run_timed(self, request_type: str, call: Callable[[], Awaitable[T]]) -> T:
+        started = time.monotonic()
+        result = await call()
+        self.latencies.record(request_type, time.monotonic() - started)
+        return result
+
+    async def _run_hedged(self, request_type: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        첫 호출이 헤징 기준 지연을 넘기면 같은 호출을 하나 더 보내고, 먼저 성공한 결과를 반환합니다.
+
+        한쪽이 실패하면 다른 쪽 결과를 기다리고, 둘 다 실패하면 먼저 실패한 쪽의 예외를 전파합니다.
+        남은 호출은 취소합니다. (표본이 부족하면 헤징 없이 실행)
+        """
+        threshold = self.latencies.percentile(request_type, self.hedge_percentile, self.hedge_min_samples)
+        if threshold is None:
+            return await self._run_timed(request_type, call)
+
+        started = time.monotonic()
+        primary = asyncio.ensure_future(call())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=max(threshold, self.hedge_min_delay))
+            if done:
+                result = primary.result()
+                self.latencies.record(request_type, time.monotonic() - started)
+                return result
+
+            self._counters["hedges_fired"] += 1
+            logger.info(f"[{request_type}] Hedging slow call (> {threshold:.1f}s)")
+            hedge = asyncio.ensure_future(call())
+            tasks.add(hedge)
+            pending = set(tasks)
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._counters["hedges_won"] += 1
+                        self.latencies.record(request_type, time.monotonic() - started)
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """재시도/타임아웃/헤징 카운터를 반환합니다."""
+        return {**self._counters, "hedge_enabled": self.hedge_enabled}
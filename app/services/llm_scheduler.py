@@ -0,0 +1,372 @@
+"""
+LLM 호출 스케줄러 (동시성/속도 제한 + 우선순위)
+
+변경 이유:
+- generate_content_async 호출 수를 제한하는 곳이 없어, /generate-study-material 한 번과
+  챕터 요청 몇 개만 겹쳐도 Gemini RPM/TPM 할당량을 넘어 429가 연쇄적으로 발생함
+- 모든 모델 호출이 이 스케줄러의 슬롯을 받은 뒤 실행되도록 하여
+  1) 토큰 버킷으로 분당 요청 수(RPM)와 예상 토큰 수(TPM)를 제한하고
+  2) 429나 지연 급증 시 동시 실행 한도를 줄이는 적응형(AIMD) 동시성 제한을 두고
+  3) 대기열은 우선순위 순서로 처리하여 채점/개념 설명 같은 대화형 요청이 일괄/백그라운드 작업보다 먼저 실행되게 함
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from google.api_core.exceptions import ResourceExhausted, TooManyRequests
+    _RATE_LIMIT_ERRORS: Tuple[type, ...] = (ResourceExhausted, TooManyRequests)
+except ImportError:  # google-generativeai 의존성, 없으면 예외 이름으로만 판별
+    _RATE_LIMIT_ERRORS = ()
+
+logger = logging.getLogger("pop_pins_api")
+
+# 우선순위 클래스 (숫자가 작을수록 먼저 실행)
+PRIORITY_INTERACTIVE = "interactive"  # 사용자가 화면에서 기다리는 요청 (채점, 개념 설명, 학습 목표)
+PRIORITY_STANDARD = "standard"  # 일반 생성 요청 (커리큘럼, 실습, 퀴즈, 심화 학습)
+PRIORITY_BULK = "bulk"  # 일괄 생성 (/generate-study-material)
+PRIORITY_BACKGROUND = "background"  # 사용자가 기다리지 않는 작업 (사전 생성, 캐시 워밍 등)
+
+PRIORITY_LEVELS = {
+    PRIORITY_INTERACTIVE: 0,
+    PRIORITY_STANDARD: 1,
+    PRIORITY_BULK: 2,
+    PRIORITY_BACKGROUND: 3,
+}
+
+# 현재 요청 흐름의 우선순위 (엔드포인트에서 설정하면 하위 호출 전체에 적용)
+_priority_override: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar("llm_priority", default=None)
+
+
+@contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    """
+    with 블록 안에서 시작되는 모델 호출의 우선순위를 지정합니다.
+
+    블록 안에서 만든 asyncio 작업도 컨텍스트를 복사하므로 같은 우선순위가 적용됩니다.
+    (단, SingleFlight(isolate_context=True)의 공유 작업은 제외)
+
+    Example:
+        with llm_priority(PRIORITY_BULK):
+            await generate_course_only(request, db)
+    """
+    if priority not in PRIORITY_LEVELS:
+        raise ValueError(f"Unknown LLM priority: {priority}")
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+def resolve_priority(default: str) -> str:
+    """컨텍스트에 지정된 우선순위가 있으면 그것을, 없으면 호출 종류별 기본값을 반환합니다."""
+    return _priority_override.get() or default
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Gemini 할당량 초과(429) 오류인지 판별합니다.
+
+    예외 타입(ResourceExhausted, TooManyRequests)과 HTTP 상태 코드로만 판단합니다.
+    메시지 문자열은 보지 않음 (ID, 토큰 수, 바이트 수 등에 "429"가 들어간 다른 오류를 429로 오인하지 않도록)
+    """
+    if isinstance(error, _RATE_LIMIT_ERRORS):
+        return True
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True  # google.api_core가 없는 환경 또는 같은 이름의 클라이언트 예외
+    for attribute in ("code", "status_code"):
+        if getattr(error, attribute, None) == 429:
+            return True
+    return False
+
+
+class TokenBucket:
+    """
+    분당 한도를 초 단위로 균등하게 채우는 토큰 버킷
+
+    capacity가 0 이하이면 제한이 없습니다.
+    실제 사용량이 예상보다 많으면 adjust()로 차감하여 잔량이 음수(빚)가 될 수 있습니다.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount만큼 꺼낼 수 있을 때까지 남은 시간(초). 0이면 지금 가능합니다."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)  # 한도보다 큰 요청도 버킷이 가득 차면 실행
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        if self.unlimited:
+            return
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """실제 사용량과 예상치의 차이(delta > 0이면 추가 차감)를 반영합니다."""
+        if not self.unlimited:
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class _Waiter:
+    __slots__ = ("priority", "tokens", "future", "enqueued_at")
+
+    def __init__(self, priority: str, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class LLMScheduler:
+    """
+    모델 호출 슬롯을 배분하는 프로세스 단위 스케줄러
+
+    - RPM/TPM 토큰 버킷: 슬롯을 줄 때 요청 1개와 예상 토큰 수를 차감하고, 응답 후 실제 토큰 수로 보정
+    - 적응형 동시성 한도 (AIMD): 성공 시 한도를 천천히 늘리고(+1/한도),
+      429 시 절반으로 줄이고 잠시 배분을 멈추며, 지연이 평소(EWMA)보다 크게 늘면 1 줄임
+    - 우선순위 대기열: 항상 가장 높은 우선순위의 가장 오래된 요청부터 슬롯을 받음
+
+    Example:
+        scheduler = LLMScheduler.from_env()
+        async with scheduler.slot("concept", PRIORITY_INTERACTIVE, estimated_tokens=9000) as slot:
+            response = await model.generate_content_async(...)
+            slot.record_usage(response.usage_metadata.total_token_count)
+    """
+
+    def __init__(
+        self,
+        rpm_limit: int = 0,
+        tpm_limit: int = 0,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        latency_spike_factor: float = 3.0,
+        rate_limit_cooldown: float = 5.0
+    ):
+        self.requests_bucket = TokenBucket(rpm_limit)
+        self.tokens_bucket = TokenBucket(tpm_limit)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.latency_spike_factor = latency_spike_factor
+        self.rate_limit_cooldown = rate_limit_cooldown
+
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._queue: List[Tuple[int, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._paused_until = 0.0
+        self._latency_ewma: Dict[str, float] = {}  # 호출 종류별 평균 지연 (초)
+
+        self._counters = {
+            "granted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rate_limited": 0,
+            "latency_spikes": 0,
+            "cancelled_while_queued": 0,
+        }
+        self._waits: Dict[str, Deque[float]] = {name: deque(maxlen=500) for name in PRIORITY_LEVELS}
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        """환경 변수(LLM_RPM_LIMIT, LLM_TPM_LIMIT, LLM_MAX_CONCURRENCY 등)로 스케줄러를 만듭니다."""
+        return cls(
+            rpm_limit=int(os.getenv("LLM_RPM_LIMIT", "0")),
+            tpm_limit=int(os.getenv("LLM_TPM_LIMIT", "0")),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "16")),
+            min_concurrency=int(os.getenv("LLM_MIN_CONCURRENCY", "1")),
+            latency_spike_factor=float(os.getenv("LLM_LATENCY_SPIKE_FACTOR", "3.0")),
+            rate_limit_cooldown=float(os.getenv("LLM_RATE_LIMIT_COOLDOWN_SECONDS", "5")),
+        )
+
+    # ------------------------------------------------------------------
+    # 슬롯 배분
+    # ------------------------------------------------------------------
+    @asynccontextmanager
+    async def slot(self, request_type: str, priority: str, estimated_tokens: int = 0) -> AsyncIterator["_Slot"]:
+        """
+        슬롯을 받을 때까지 기다린 뒤 블록을 실행하고, 끝나면 결과(지연/429 여부)를 한도 조정에 반영합니다.
+
+        Args:
+            request_type: 호출 종류 (지연 급증 판단 기준을 종류별로 유지)
+            priority: PRIORITY_LEVELS의 키
+            estimated_tokens: TPM 버킷에서 미리 차감할 예상 토큰 수 (입력 + 출력)
+        """
+        await self._acquire(priority, estimated_tokens)
+        slot = _Slot(estimated_tokens)
+        started = time.monotonic()
+        try:
+            yield slot
+        except BaseException as error:
+            self._release(request_type, time.monotonic() - started, error)
+            raise
+        else:
+            self._release(request_type, time.monotonic() - started, None)
+        finally:
+            if slot.actual_tokens is not None:
+                self.tokens_bucket.adjust(slot.actual_tokens - estimated_tokens)
+
+    async def _acquire(self, priority: str, tokens: int) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, tokens, loop.create_future())
+        heapq.heappush(self._queue, (PRIORITY_LEVELS[priority], next(self._sequence), waiter))
+        self._pump()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 슬롯을 받은 직후 취소됨: 받은 슬롯을 돌려줌
+                self.in_flight -= 1
+                self._pump()
+            else:
+                self._counters["cancelled_while_queued"] += 1
+            raise
+        self._waits[priority].append(time.monotonic() - waiter.enqueued_at)
+
+    def _pump(self) -> None:
+        """동시성 한도와 토큰 버킷이 허용하는 만큼 대기열 앞에서부터 슬롯을 배분합니다."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        now = time.monotonic()
+        while self._queue:
+            _, _, waiter = self._queue[0]
+            if waiter.future.done():  # 대기 중 취소된 요청
+                heapq.heappop(self._queue)
+                continue
+            if self.in_flight >= int(self.limit):
+                return  # 실행 중인 호출이 끝나면 _release가 다시 호출
+
+            delay = max(
+                self._paused_until - now,
+                self.requests_bucket.wait_time(1, now),
+                self.tokens_bucket.wait_time(waiter.tokens, now),
+            )
+            if delay > 0:
+                # 앞선(우선순위가 높은) 요청이 예산을 기다리는 동안 뒤 요청이 끼어들지 않도록 대기열 전체를 멈춤
+                self._wakeup = asyncio.get_running_loop().call_later(delay, self._pump)
+                return
+
+            heapq.heappop(self._queue)
+            self.requests_bucket.take(1, now)
+            self.tokens_bucket.take(waiter.tokens, now)
+            self.in_flight += 1
+            self._counters["granted"] += 1
+            waiter.future.set_result(None)
+
+    def _release(self, request_type: str, latency: float, error: Optional[BaseException]) -> None:
+        self.in_flight -= 1
+        if error is None:
+            self._counters["completed"] += 1
+            self._on_success(request_type, latency)
+        elif isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+            pass  # 클라이언트 연결 종료, 스트림 중단 등: 한도 조정에 반영하지 않음
+        elif is_rate_limit_error(error):
+            self._counters["failed"] += 1
+            self._on_rate_limited()
+        else:
+            self._counters["failed"] += 1
+        self._pump()
+
+    # ------------------------------------------------------------------
+    # 적응형 동시성 한도 (AIMD)
+    # ------------------------------------------------------------------
+    def _on_success(self, request_type: str, latency: float) -> None:
+        baseline = self._latency_ewma.get(request_type)
+        if baseline is None:
+            self._latency_ewma[request_type] = latency
+        else:
+            self._latency_ewma[request_type] = baseline * 0.8 + latency * 0.2
+        if baseline is not None and latency > baseline * self.latency_spike_factor:
+            self._counters["latency_spikes"] += 1
+            self.limit = max(float(self.min_concurrency), self.limit - 1)
+            logger.warning(
+                f"LLM latency spike ({request_type}: {latency:.1f}s, baseline {baseline:.1f}s), "
+                f"concurrency limit -> {int(self.limit)}"
+            )
+            return
+        self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def _on_rate_limited(self) -> None:
+        self._counters["rate_limited"] += 1
+        self.limit = max(float(self.min_concurrency), self.limit / 2)
+        self._paused_until = time.monotonic() + self.rate_limit_cooldown
+        logger.warning(
+            f"LLM rate limited (429), concurrency limit -> {int(self.limit)}, "
+            f"pausing dispatch for {self.rate_limit_cooldown:.0f}s"
+        )
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        """대기열 길이, 우선순위별 대기 시간, 동시성 한도, 버킷 잔량을 반환합니다."""
+        queue_depth = {name: 0 for name in PRIORITY_LEVELS}
+        for _, _, waiter in self._queue:
+            if not waiter.future.done():
+                queue_depth[waiter.priority] += 1
+
+        wait_ms = {}
+        for name, samples in self._waits.items():
+            if not samples:
+                wait_ms[name] = {"count": 0, "avg": 0, "p95": 0, "max": 0}
+                continue
+            ordered = sorted(samples)
+            wait_ms[name] = {
+                "count": len(ordered),
+                "avg": int(sum(ordered) / len(ordered) * 1000),
+                "p95": int(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000),
+                "max": int(ordered[-1] * 1000),
+            }
+
+        return {
+            **self._counters,
+            "in_flight": self.in_flight,
+            "concurrency_limit": int(self.limit),
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": queue_depth,
+            "wait_ms": wait_ms,
+            "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 1),
+            "rpm_available": None if self.requests_bucket.unlimited else int(self.requests_bucket.tokens),
+            "tpm_available": None if self.tokens_bucket.unlimited else int(self.tokens_bucket.tokens),
+        }
+
+
+class _Slot:
+    """slot() 블록 안에서 실제 사용 토큰 수를 기록하는 핸들"""
+
+    __slots__ = ("estimated_tokens", "actual_tokens")
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens: Optional[int] = None
+
+    def record_usage(self, total_tokens: Optional[int]) -> None:
+        if total_tokens:
+            self.actual_tokens = int(total_tokens)
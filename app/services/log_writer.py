@@ -0,0 +1,223 @@
+"""
+생성 로그 백그라운드 기록기
+
+변경 이유:
+- ContentGenerator._log_to_db가 async 메서드 안에서 SessionLocal을 열고 한 행을 INSERT + commit하여
+  SQLite fsync가 이벤트 루프를 막음 (챕터당 4번), commit 실패 시 세션도 닫히지 않음
+- 로그 행은 메모리 큐에 넣기만 하고, 전용 스레드가 N행 또는 M밀리초마다 한 트랜잭션으로 일괄 INSERT
+- 큐 크기 제한과 넘칠 때의 정책(가장 오래된 행 버림 / 새 행 버림), 종료 시 남은 행 flush 지원
+- 프롬프트/결과 본문은 기록 스레드에서 zstd로 압축하여 generation_log_payloads 테이블에 저장
+  (이벤트 루프에서 압축하지 않고, 이력 목록 조회는 작은 메타데이터 행만 읽음)
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.database import SessionLocal
+from app.models import GenerationLog, GenerationLogPayload
+from app.utils.compression import TextCompressor, default_compressor
+
+logger = logging.getLogger("pop_pins_api")
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+
+_STOP = object()  # 종료 신호
+
+
+class GenerationLogWriter:
+    """
+    GenerationLog 행을 모아서 별도 스레드에서 일괄 저장합니다.
+
+    submit()은 큐에 넣기만 하므로 이벤트 루프에서 호출해도 막히지 않습니다.
+    스레드는 batch_size행이 모이거나 flush_interval_ms가 지나면 한 트랜잭션으로 저장합니다.
+
+    Attributes:
+        batch_size (int): 한 트랜잭션에 넣을 최대 행 수
+        flush_interval_ms (int): 행이 batch_size만큼 모이지 않아도 저장하는 주기
+        overflow_policy (str): 큐가 가득 찼을 때 "drop_oldest"(기본) 또는 "drop_newest"
+
+    Example:
+        writer = GenerationLogWriter.from_env()
+        writer.start()
+        writer.submit({"request_type": "concept", "topic": "...", ...})
+        writer.stop()  # 남은 행 저장 후 종료
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 50,
+        flush_interval_ms: int = 500,
+        max_queue_size: int = 10000,
+        overflow_policy: str = OVERFLOW_DROP_OLDEST,
+        compressor: Optional[TextCompressor] = None
+    ):
+        if overflow_policy not in (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST):
+            raise ValueError(f"Unknown log writer overflow policy: {overflow_policy}")
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_ms = flush_interval_ms
+        self.overflow_policy = overflow_policy
+        self.compressor = compressor or default_compressor()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._counters = {
+            "submitted": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+            "payload_bytes_raw": 0,
+            "payload_bytes_stored": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "GenerationLogWriter":
+        """환경 변수(GENERATION_LOG_BATCH_SIZE, GENERATION_LOG_FLUSH_MS 등)로 기록기를 만듭니다."""
+        return cls(
+            batch_size=int(os.getenv("GENERATION_LOG_BATCH_SIZE", "50")),
+            flush_interval_ms=int(os.getenv("GENERATION_LOG_FLUSH_MS", "500")),
+            max_queue_size=int(os.getenv("GENERATION_LOG_QUEUE_SIZE", "10000")),
+            overflow_policy=os.getenv("GENERATION_LOG_OVERFLOW_POLICY", OVERFLOW_DROP_OLDEST),
+        )
+
+    def start(self) -> None:
+        """기록 스레드를 시작합니다. 프로세스 종료 시 남은 행을 저장하도록 atexit에도 등록합니다."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="generation-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """
+        GenerationLog 컬럼 값 딕셔너리를 큐에 넣습니다. (막히지 않음)
+
+        Returns:
+            bool: 큐에 들어갔으면 True, 넘침 정책으로 버려졌으면 False
+        """
+        with self._lock:
+            self._counters["submitted"] += 1
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            pass
+
+        if self.overflow_policy == OVERFLOW_DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+                self._queue.put_nowait(row)
+                self._count("dropped")
+                return True
+            except (queue.Empty, queue.Full):
+                pass
+        self._count("dropped")
+        logger.warning("Generation log queue is full, dropping log row")
+        return False
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """남은 행을 모두 저장한 뒤 기록 스레드를 종료합니다."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        while True:
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+                break
+            except queue.Full:
+                # 큐가 가득 찬 채로 스레드가 멈춰 있는 경우: 가장 오래된 행을 버리고 종료 신호를 넣음
+                try:
+                    self._queue.get_nowait()
+                    self._count("dropped")
+                except queue.Empty:
+                    pass
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Generation log writer did not finish flushing before timeout")
+        self._thread = None
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def _run(self) -> None:
+        interval = self.flush_interval_ms / 1000
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            first = self._queue.get()  # 첫 행이 올 때까지 대기
+            if first is _STOP:
+                break
+            batch.append(first)
+            deadline = time.monotonic() + interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+        # 종료 신호 뒤에 남은 행까지 저장
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        for start in range(0, len(leftover), self.batch_size):
+            self._write(leftover[start:start + self.batch_size])
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        db = SessionLocal()
+        try:
+            db.add_all([self._to_log(row) for row in batch])
+            db.commit()
+            self._count("written", len(batch))
+            self._count("batches")
+        except Exception as e:
+            db.rollback()
+            self._count("failed", len(batch))
+            logger.error(f"Failed to write {len(batch)} generation logs: {e}")
+        finally:
+            db.close()
+
+    def _to_log(self, row: Dict[str, Any]) -> GenerationLog:
+        """큐의 행을 GenerationLog + 압축된 본문(GenerationLogPayload)으로 변환합니다."""
+        row = dict(row)
+        prompt = row.pop("prompt_context", None)
+        generated = row.pop("generated_content", None)
+        payload = GenerationLogPayload(
+            prompt_context=self.compressor.compress(prompt),
+            generated_content=self.compressor.compress(generated),
+        )
+        raw = len((prompt or "").encode("utf-8")) + len((generated or "").encode("utf-8"))
+        stored = len(payload.prompt_context or b"") + len(payload.generated_content or b"")
+        with self._lock:
+            self._counters["payload_bytes_raw"] += raw
+            self._counters["payload_bytes_stored"] += stored
+        return GenerationLog(**row, payload=payload)
+
+    def stats(self) -> Dict[str, Any]:
+        """제출/저장/버림/실패 행 수, 본문 압축 전/후 바이트 수, 현재 큐 길이를 반환합니다."""
+        with self._lock:
+            return {
+                **self._counters,
+                "pending": self._queue.qsize(),
+                "running": self._thread is not None and self._thread.is_alive(),
+            }
@@ -0,0 +1,125 @@
+"""
+RAG 검색 결과 캐시 (인덱스 버전별)
+
+변경 이유:
+- 같은 인덱스에서 search_context(query, k)의 결과는 항상 같은데, 강제 재생성이나 같은 챕터를 다시 요청할 때마다
+  쿼리 임베딩 + FAISS 검색을 다시 수행했음
+- (인덱스 버전 해시, 정규화된 쿼리, k, 본문 자르기 정책)을 키로 결과 청크의 FAISS 행 번호만 저장하고,
+  히트 시 index_to_docstore_id → docstore에서 청크를 바로 꺼냄 (본문 텍스트는 중복 저장하지 않음)
+- docstore ID는 로드 방식마다 다르므로(mmap 청크 저장소: 번호, FAISS.load_local: UUID) 저장하지 않음
+  → 같은 벡터 DB를 어느 방식으로 열어도 캐시 항목이 유효함
+- 인덱스 버전은 벡터 DB 디렉터리 파일과 구축 메타데이터 JSON(원본 파일별 mtime, size)으로 계산하므로
+  벡터 DB를 다시 만들면 이전 결과는 자동으로 사용되지 않음
+"""
+import hashlib
+import json
+import logging
+import numbers
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.services.embedding_cache import normalize_query
+from app.utils.cache import TieredCache
+
+logger = logging.getLogger("pop_pins_api")
+
+# 캐시 값 형식 (docstore ID 목록을 저장하던 이전 항목과 키가 겹치지 않도록 키에 포함)
+VALUE_FORMAT = "faiss-rows"
+
+
+def vector_db_metadata_path(db_path: Path) -> Path:
+    """벡터 DB 구축 시 함께 만드는 원본 파일 메타데이터 JSON 경로 (<DB 디렉터리>_metadata.json)"""
+    return db_path.with_name(f"{db_path.name}_metadata.json")
+
+
+def index_version(db_path: Path) -> str:
+    """
+    벡터 DB의 버전 해시를 계산합니다.
+
+    - 디렉터리 안 파일(index.faiss, index.pkl 등)의 이름, 크기, 수정 시각
+    - 메타데이터 JSON의 원본 파일별 mtime, size, 청크 수, 분할 전략 (파일이 없으면 생략)
+
+    Returns:
+        str: SHA-256 앞 16자리
+    """
+    files = {
+        path.name: [path.stat().st_size, path.stat().st_mtime_ns]
+        for path in sorted(db_path.iterdir()) if path.is_file()
+    }
+    sources: Dict[str, Any] = {}
+    metadata_path = vector_db_metadata_path(db_path)
+    if metadata_path.exists():
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            sources = {
+                key: [entry.get("mtime"), entry.get("size"), entry.get("chunks"), entry.get("strategy")]
+                for key, entry in metadata.items() if isinstance(entry, dict)
+            }
+        except (OSError, ValueError) as error:
+            logger.warning(f"Vector DB metadata could not be read, using index files only: {error}")
+    payload = json.dumps({"files": files, "sources": sources}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class RetrievalCache:
+    """
+    (인덱스 버전, 쿼리, k, 자르기 정책) → 검색 결과 청크의 FAISS 행 번호 목록
+
+    Attributes:
+        cache (TieredCache): JSON 배열(FAISS 행 번호) 저장소
+        index_version (str): 현재 로드한 벡터 DB의 버전 해시 (index_version())
+        truncation (str): 결과 포맷팅 정책 식별자 (예: "chars:500", 바뀌면 다른 키)
+
+    Example:
+        retrieval_cache = RetrievalCache.from_env(index_version(db_path), truncation="chars:500")
+        rows = retrieval_cache.get(query, k, index.ntotal)  # 없으면 None
+        retrieval_cache.set(query, k, rows)
+    """
+
+    def __init__(self, cache: TieredCache, index_version: str, truncation: str):
+        self.cache = cache
+        self.index_version = index_version
+        self.truncation = truncation
+
+    @classmethod
+    def from_env(cls, index_version: str, truncation: str) -> Optional["RetrievalCache"]:
+        """환경 변수(RETRIEVAL_CACHE_*)로 캐시를 만듭니다. RETRIEVAL_CACHE_ENABLED=false이면 None."""
+        if os.getenv("RETRIEVAL_CACHE_ENABLED", "true").lower() != "true":
+            return None
+        disk_max_mb = float(os.getenv("RETRIEVAL_CACHE_DISK_MAX_MB", "64"))
+        return cls(
+            TieredCache(
+                "rag_retrieval",
+                max_memory_bytes=int(float(os.getenv("RETRIEVAL_CACHE_MAX_MB", "4")) * 1024 * 1024),
+                disk_path=os.getenv("RETRIEVAL_CACHE_PATH", "./cache/retrieval_cache.db") or None,
+                max_disk_bytes=int(disk_max_mb * 1024 * 1024) if disk_max_mb > 0 else None,
+            ),
+            index_version=index_version,
+            truncation=truncation,
+        )
+
+    def key(self, query: str, k: int) -> str:
+        payload = f"{VALUE_FORMAT}\x00{self.index_version}\x00{self.truncation}\x00{k}\x00{normalize_query(query)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, query: str, k: int, total: int) -> Optional[List[int]]:
+        """
+        캐시된 FAISS 행 번호 목록 (순위 순)을 반환합니다. 없으면 None.
+
+        total(index.ntotal) 범위를 벗어난 번호가 있는 항목은 손상된 것으로 보고 None을 반환합니다.
+        """
+        rows = self.cache.get_json(self.key(query, k))
+        if not isinstance(rows, list):
+            return None
+        if not all(isinstance(row, numbers.Integral) and not isinstance(row, bool) and 0 <= row < total for row in rows):
+            logger.warning(f"Ignoring invalid retrieval cache entry for query: {query[:50]}")
+            return None
+        return rows
+
+    def set(self, query: str, k: int, rows: List[int]) -> None:
+        self.cache.set_json(self.key(query, k), rows)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "index_version": self.index_version}
@@ -3,17 +3,58 @@ PopPins II - 유틸리티 모듈
 
 공통으로 사용되는 유틸리티 함수들을 제공합니다.
 """
-from .cache import create_chapter_cache_key
+from .cache import create_chapter_cache_key, TieredCache
 from .errors import handle_generation_error, validate_generator_initialized
-from .db_helpers import save_course_to_db, save_chapter_content_to_db, calculate_course_progress
+from .db_helpers import (
+    save_course_to_db,
+    save_chapter_content_to_db,
+    load_chapter_content_from_db,
+    save_course_to_db_async,
+    save_chapter_content_to_db_async,
+    load_chapter_content_from_db_async,
+    calculate_course_progress,
+    course_progress_from_counts,
+    list_courses_with_progress,
+    load_course_chapter_summaries,
+    load_generation_log_payload,
+    load_chapter_section_from_db,
+    load_chapter_content_hash,
+    chapter_content_hash,
+    CHAPTER_SECTIONS,
+)
+from .json_stream import JsonStringFieldExtractor
+from .singleflight import SingleFlight
+from .compression import TextCompressor, default_compressor
+from .pagination import encode_cursor, decode_cursor, keyset_before, split_page
 
 __all__ = [
     'create_chapter_cache_key',
+    'TieredCache',
     'handle_generation_error',
     'validate_generator_initialized',
     'save_course_to_db',
     'save_chapter_content_to_db',
+    'load_chapter_content_from_db',
+    'save_course_to_db_async',
+    'save_chapter_content_to_db_async',
+    'load_chapter_content_from_db_async',
     'calculate_course_progress',
+    'course_progress_from_counts',
+    'list_courses_with_progress',
+    'load_course_chapter_summaries',
+    'load_generation_log_payload',
+    'load_chapter_section_from_db',
+    'load_chapter_content_hash',
+    'chapter_content_hash',
+    'CHAPTER_SECTIONS',
+    'JsonStringFieldExtractor',
+    'SingleFlight',
+    'encode_cursor',
+    'decode_cursor',
+    'keyset_before',
+    'split_page',
+    'TextCompressor',
+    'default_compressor',
 ]
 
 
@@ -5,22 +5,36 @@
 - 캐시 키 생성 로직이 여러 곳에서 중복됨
 - 문자열 기반 키로 변경하여 튜플 해시 계산 비용 절감
 - 향후 Redis 등 외부 캐시로 전환 시 용이
+- 모듈 전역 dict 캐시는 크기 제한/만료가 없어 장기 실행 시 계속 커지고, 재시작하면 모두 사라짐
+  → 바이트 기준 LRU/TTL 메모리 계층 + SQLite 디스크 계층(TieredCache)으로 교체
+- 디스크 계층(SQLite 조회/쓰기, fsync)을 async 코드에서 직접 호출하면 이벤트 루프가 멈추므로,
+  async 호출자용 aget/aset/adelete는 메모리 히트만 바로 반환하고 디스크 계층은 thread pool에서 실행
 """
-from typing import Tuple
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("pop_pins_api")
 
 
 def create_chapter_cache_key(course_title: str, chapter_title: str, chapter_description: str) -> str:
     """
     챕터 콘텐츠 캐시 키를 생성합니다.
-    
+
     Args:
         course_title: 코스 제목
         chapter_title: 챕터 제목
         chapter_description: 챕터 설명
-    
+
     Returns:
         str: 캐시 키 (형식: "course:chapter:description")
-    
+
     변경 이유:
         - 튜플 대신 문자열 사용으로 해시 계산 비용 절감
         - 외부 캐시 시스템과 호환성 향상
@@ -28,4 +42,334 @@ def create_chapter_cache_key(course_title: str, chapter_title: str, chapter_desc
     return f"{course_title}:{chapter_title}:{chapter_description}"
 
 
+class TieredCache:
+    """
+    2단계 캐시: 바이트 기준 LRU/TTL 메모리 계층 + 영구 SQLite 디스크 계층
+
+    - 메모리 계층: 값의 총 크기(바이트)가 max_memory_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    - 디스크 계층: 쓰기 시 함께 저장(write-through)되며, 메모리 미스 시 조회 후 메모리로 승격
+      재시작 후에도 유지되므로 인기 있는 항목을 다시 생성할 필요가 없음
+    - 두 계층 모두 ttl_seconds가 지나면 만료 (0 이하이면 만료 없음)
+
+    값은 bytes로 저장하며, 직렬화는 호출자가 담당합니다. (JSON은 get_json/set_json 사용)
+    여러 스레드에서 호출해도 안전합니다.
+    async 코드에서는 aget/aset/adelete(aget_json/aset_json)를 사용합니다. (디스크 계층 I/O는 thread pool에서 실행)
+
+    Attributes:
+        name (str): 캐시 이름 (디스크 테이블 구분 및 로그용)
+        stats(): 계층별 히트, 미스, 제거(eviction), 만료 카운터
+
+    Example:
+        cache = TieredCache("chapter", max_memory_bytes=64 * 1024 * 1024, ttl_seconds=86400,
+                            disk_path="./cache/chapter_cache.db")
+        cache.set_json(key, {"concept": {...}})
+        data = cache.get_json(key)  # 없으면 None
+        data = await cache.aget_json(key)  # async 코드에서
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_memory_bytes: int,
+        ttl_seconds: float = 0,
+        disk_path: Optional[str] = None,
+        max_disk_bytes: Optional[int] = None
+    ):
+        self.name = name
+        self.max_memory_bytes = max_memory_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()  # 메모리 계층, 카운터
+        # SQLite 연결 전용 잠금 (디스크 I/O 중에도 이벤트 루프의 메모리 조회가 기다리지 않도록 분리,
+        # 두 잠금이 모두 필요하면 항상 _disk_lock → _lock 순서)
+        self._disk_lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()  # key -> (value, expires_at)
+        self._memory_bytes = 0
+        self._writes_since_prune = 0
+
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "expirations": 0,
+            "sets": 0,
+        }
+
+        self._disk: Optional[sqlite3.Connection] = None
+        if disk_path:
+            self._open_disk(disk_path)
+
+    # ------------------------------------------------------------------
+    # 디스크 계층
+    # ------------------------------------------------------------------
+    def _open_disk(self, disk_path: str) -> None:
+        """SQLite 디스크 계층을 엽니다. 실패하면 메모리 전용으로 동작합니다."""
+        try:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False, isolation_level=None)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute("PRAGMA synchronous=NORMAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " expires_at REAL,"
+                " accessed_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._disk.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed ON cache_entries (namespace, accessed_at)"
+            )
+            logger.info(f"[{self.name}] 디스크 캐시 계층 사용: {disk_path}")
+        except sqlite3.Error as error:
+            logger.error(f"[{self.name}] 디스크 캐시 계층을 열 수 없어 메모리 전용으로 동작합니다: {error}")
+            self._disk = None
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[bytes, float]]:
+        row = self._disk.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.name, key)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            self._disk.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.name, key))
+            with self._lock:
+                self._counters["expirations"] += 1
+            return None
+        self._disk.execute(
+            "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            (now, self.name, key)
+        )
+        return bytes(value), expires_at if expires_at is not None else float("inf")
+
+    def _disk_prune(self, now: float) -> None:
+        """만료된 항목을 지우고, 용량 제한을 넘으면 오래 사용하지 않은 항목부터 제거합니다."""
+        self._disk.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+            (self.name, now)
+        )
+        if not self.max_disk_bytes:
+            return
+        total = self._disk.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?", (self.name,)
+        ).fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        excess = total - self.max_disk_bytes
+        removed = 0
+        rows = self._disk.execute(
+            "SELECT key, size FROM cache_entries WHERE namespace = ? ORDER BY accessed_at", (self.name,)
+        ).fetchall()
+        victims = []
+        for key, size in rows:
+            if removed >= excess:
+                break
+            victims.append((self.name, key))
+            removed += size
+        self._disk.executemany("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", victims)
+        with self._lock:
+            self._counters["disk_evictions"] += len(victims)
+
+    # ------------------------------------------------------------------
+    # 메모리 계층
+    # ------------------------------------------------------------------
+    def _memory_put(self, key: str, value: bytes, expires_at: float) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old[0])
+        if len(value) > self.max_memory_bytes:
+            return  # 메모리 계층 전체보다 큰 값은 디스크에만 보관
+        self._memory[key] = (value, expires_at)
+        self._memory_bytes += len(value)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._counters["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # 계층별 조회/저장 (잠금 포함)
+    # ------------------------------------------------------------------
+    def _memory_lookup(self, key: str, now: float) -> Optional[bytes]:
+        """메모리 계층만 조회합니다. (히트/만료만 집계, 미스는 _disk_lookup에서 집계)"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return value
+            del self._memory[key]
+            self._memory_bytes -= len(value)
+            self._counters["expirations"] += 1
+            return None
+
+    def _disk_lookup(self, key: str, now: float) -> Optional[bytes]:
+        """메모리 미스 후 디스크 계층을 조회하고, 찾으면 메모리로 승격합니다."""
+        found = None
+        if self._disk is not None:
+            with self._disk_lock:
+                try:
+                    found = self._disk_get(key, now)
+                except sqlite3.Error as error:
+                    logger.error(f"[{self.name}] 디스크 캐시 조회 실패: {error}")
+        with self._lock:
+            if found is not None:
+                value, expires_at = found
+                self._memory_put(key, value, expires_at)
+                self._counters["disk_hits"] += 1
+                return value
+            self._counters["misses"] += 1
+            return None
+
+    def _memory_set(self, key: str, value: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._memory_put(key, value, expires_at)
+            self._counters["sets"] += 1
+
+    def _disk_set(self, key: str, value: bytes, now: float, expires_at: float) -> None:
+        with self._disk_lock:
+            try:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, size, expires_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.name, key, value, len(value), expires_at if self.ttl_seconds > 0 else None, now)
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= 100:
+                    self._writes_since_prune = 0
+                    self._disk_prune(now)
+            except sqlite3.Error as error:
+                logger.error(f"[{self.name}] 디스크 캐시 저장 실패: {error}")
+
+    def _memory_delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._memory.pop(key, None)
+            if entry is not None:
+                self._memory_bytes -= len(entry[0])
+
+    def _disk_delete(self, key: str) -> None:
+        with self._disk_lock:
+            try:
+                self._disk.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.name, key))
+            except sqlite3.Error as error:
+                logger.error(f"[{self.name}] 디스크 캐시 삭제 실패: {error}")
+
+    def _expires_at(self, now: float) -> float:
+        return now + self.ttl_seconds if self.ttl_seconds > 0 else float("inf")
+
+    # ------------------------------------------------------------------
+    # 공개 API (동기: thread pool/시작 코드용)
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[bytes]:
+        """키에 해당하는 값을 반환합니다. 없거나 만료되었으면 None."""
+        now = time.time()
+        value = self._memory_lookup(key, now)
+        if value is not None:
+            return value
+        return self._disk_lookup(key, now)
+
+    def set(self, key: str, value: bytes) -> None:
+        """값을 메모리와 디스크 계층에 함께 저장합니다."""
+        now = time.time()
+        expires_at = self._expires_at(now)
+        self._memory_set(key, value, expires_at)
+        if self._disk is not None:
+            self._disk_set(key, value, now, expires_at)
+
+    def delete(self, key: str) -> None:
+        """두 계층에서 키를 제거합니다."""
+        self._memory_delete(key)
+        if self._disk is not None:
+            self._disk_delete(key)
+
+    def clear(self) -> None:
+        """두 계층의 모든 항목을 제거합니다."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self._disk is not None:
+            with self._disk_lock:
+                try:
+                    self._disk.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.name,))
+                except sqlite3.Error as error:
+                    logger.error(f"[{self.name}] 디스크 캐시 초기화 실패: {error}")
+
+    def get_json(self, key: str) -> Optional[Any]:
+        """JSON으로 저장된 값을 역직렬화하여 반환합니다."""
+        value = self.get(key)
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            self.delete(key)  # 손상된 항목은 제거
+            return None
+
+    def set_json(self, key: str, data: Any) -> None:
+        """값을 JSON(UTF-8)으로 직렬화하여 저장합니다."""
+        self.set(key, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    # ------------------------------------------------------------------
+    # 공개 API (async: 이벤트 루프에서 호출, 디스크 계층은 thread pool에서 실행)
+    # ------------------------------------------------------------------
+    async def aget(self, key: str) -> Optional[bytes]:
+        """get()의 async 버전입니다. 메모리 히트는 바로 반환하고, 디스크 조회만 thread pool에서 실행합니다."""
+        now = time.time()
+        value = self._memory_lookup(key, now)
+        if value is not None:
+            return value
+        if self._disk is None:
+            return self._disk_lookup(key, now)  # 미스 집계만
+        return await asyncio.get_running_loop().run_in_executor(None, self._disk_lookup, key, now)
+
+    async def aset(self, key: str, value: bytes) -> None:
+        """set()의 async 버전입니다. 메모리 계층은 바로 갱신하고, 디스크 쓰기는 thread pool에서 실행합니다."""
+        now = time.time()
+        expires_at = self._expires_at(now)
+        self._memory_set(key, value, expires_at)
+        if self._disk is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._disk_set, key, value, now, expires_at)
+
+    async def adelete(self, key: str) -> None:
+        """delete()의 async 버전입니다."""
+        self._memory_delete(key)
+        if self._disk is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._disk_delete, key)
+
+    async def aget_json(self, key: str) -> Optional[Any]:
+        """get_json()의 async 버전입니다."""
+        value = await self.aget(key)
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            await self.adelete(key)  # 손상된 항목은 제거
+            return None
+
+    async def aset_json(self, key: str, data: Any) -> None:
+        """set_json()의 async 버전입니다."""
+        await self.aset(key, json.dumps(data, ensure_ascii=False).encode("utf-8"))
 
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스/제거 카운터와 현재 메모리 사용량을 반환합니다."""
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "disk_enabled": self._disk is not None,
+            }
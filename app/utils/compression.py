@@ -0,0 +1,145 @@
+"""
+텍스트 페이로드 압축 (zstd)
+
+변경 이유:
+- GenerationLog는 프롬프트(RAG 컨텍스트 최대 1500자 포함)와 생성 결과 JSON 전체를 비압축 Text로 저장하여
+  DB 크기의 대부분을 차지하고, 이력 목록 조회도 이 큰 행들을 훑어야 했음
+- 한국어 마크다운/JSON은 zstd로 수 배 줄어들며, 짧은 텍스트는 같은 종류의 샘플로 학습한 사전을 쓰면 더 줄어듦
+- 저장 형식 앞에 1바이트 코덱 표시를 붙여 사전 유무/압축 여부가 다른 행이 섞여 있어도 읽을 수 있게 함
+  (zstandard가 설치되지 않은 환경에서는 비압축으로 저장)
+"""
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 비압축 저장
+    zstandard = None
+
+logger = logging.getLogger("pop_pins_api")
+
+CODEC_RAW = 0
+CODEC_ZSTD = 1
+CODEC_ZSTD_DICT = 2
+
+
+class TextCompressor:
+    """
+    문자열 ↔ 압축 바이트 변환기
+
+    저장 형식: [코덱 1바이트][본문]
+    - 0: UTF-8 원문 (zstandard 미설치 또는 압축해도 줄지 않는 짧은 텍스트)
+    - 1: zstd
+    - 2: 학습된 사전을 사용한 zstd (읽을 때도 같은 사전 필요)
+
+    zstd 압축/해제 객체는 스레드 간에 공유할 수 없으므로 스레드마다 따로 만듭니다.
+
+    Example:
+        compressor = default_compressor()
+        blob = compressor.compress("긴 생성 결과 ...")
+        text = compressor.decompress(blob)
+    """
+
+    def __init__(self, level: int = 3, dictionary: Optional[bytes] = None):
+        self.level = level
+        self.dictionary = dictionary
+        self._local = threading.local()
+        if zstandard is not None and dictionary:
+            self._dict = zstandard.ZstdCompressionDict(dictionary)
+            self._dict.precompute_compress(level=level)
+        else:
+            self._dict = None
+
+    @classmethod
+    def from_env(cls) -> "TextCompressor":
+        """환경 변수(PAYLOAD_COMPRESSION_LEVEL, PAYLOAD_ZSTD_DICT_PATH)로 압축기를 만듭니다."""
+        dictionary = None
+        dict_path = os.getenv("PAYLOAD_ZSTD_DICT_PATH")
+        if dict_path:
+            try:
+                with open(dict_path, "rb") as f:
+                    dictionary = f.read()
+            except OSError as error:
+                logger.error(f"zstd 사전을 읽을 수 없어 사전 없이 압축합니다: {dict_path} ({error})")
+        if zstandard is None:
+            logger.warning("zstandard가 설치되지 않아 페이로드를 압축하지 않고 저장합니다")
+        return cls(level=int(os.getenv("PAYLOAD_COMPRESSION_LEVEL", "3")), dictionary=dictionary)
+
+    @property
+    def enabled(self) -> bool:
+        return zstandard is not None
+
+    def _compressor(self):
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=self.level, dict_data=self._dict)
+            self._local.compressor = compressor
+        return compressor
+
+    def _decompressor(self, with_dict: bool):
+        name = "dict_decompressor" if with_dict else "decompressor"
+        decompressor = getattr(self._local, name, None)
+        if decompressor is None:
+            decompressor = zstandard.ZstdDecompressor(dict_data=self._dict if with_dict else None)
+            setattr(self._local, name, decompressor)
+        return decompressor
+
+    def compress(self, text: Optional[str]) -> Optional[bytes]:
+        """문자열을 저장 형식으로 압축합니다. None은 None 그대로 반환합니다."""
+        if text is None:
+            return None
+        raw = text.encode("utf-8")
+        if zstandard is None:
+            return bytes([CODEC_RAW]) + raw
+        compressed = self._compressor().compress(raw)
+        if len(compressed) >= len(raw):
+            return bytes([CODEC_RAW]) + raw
+        return bytes([CODEC_ZSTD_DICT if self._dict is not None else CODEC_ZSTD]) + compressed
+
+    def decompress(self, blob: Optional[bytes]) -> Optional[str]:
+        """
+        compress()로 만든 바이트를 문자열로 되돌립니다.
+
+        Raises:
+            ValueError: 알 수 없는 코덱, zstandard 미설치, 사전이 필요한데 설정되지 않은 경우
+        """
+        if blob is None:
+            return None
+        blob = bytes(blob)
+        if not blob:
+            return ""
+        codec, body = blob[0], blob[1:]
+        if codec == CODEC_RAW:
+            return body.decode("utf-8")
+        if codec not in (CODEC_ZSTD, CODEC_ZSTD_DICT):
+            raise ValueError(f"Unknown payload codec: {codec}")
+        if zstandard is None:
+            raise ValueError("zstandard is required to read compressed payloads")
+        if codec == CODEC_ZSTD_DICT and self._dict is None:
+            raise ValueError("Payload was compressed with a zstd dictionary; set PAYLOAD_ZSTD_DICT_PATH")
+        return self._decompressor(codec == CODEC_ZSTD_DICT).decompress(body).decode("utf-8")
+
+    @staticmethod
+    def train_dictionary(samples: List[str], dict_size: int = 112640) -> bytes:
+        """
+        샘플 텍스트로 zstd 사전을 학습합니다. (짧은 한국어 마크다운/JSON 페이로드의 압축률 향상)
+
+        Args:
+            samples: 실제 저장되는 것과 같은 종류의 텍스트 (수백 개 이상 권장)
+            dict_size: 사전 크기 (바이트)
+
+        Returns:
+            bytes: PAYLOAD_ZSTD_DICT_PATH로 지정할 파일에 그대로 저장할 사전
+        """
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to train a dictionary")
+        return zstandard.train_dictionary(dict_size, [s.encode("utf-8") for s in samples]).as_bytes()
+
+
+@lru_cache(maxsize=1)
+def default_compressor() -> TextCompressor:
+    """환경 변수 설정으로 만든 공용 압축기 (프로세스당 1개)"""
+    return TextCompressor.from_env()
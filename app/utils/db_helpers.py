@@ -5,15 +5,96 @@
 - DB 작업 로직이 엔드포인트에 직접 포함되어 가독성 저하
 - 중복된 DB 쿼리 패턴을 함수로 추출
 - 시간복잡도 개선 (N+1 쿼리 방지)
+- async 엔드포인트용 비동기 버전(*_async) 추가: AsyncSession으로 이벤트 루프를 막지 않음
+- 코스 목록: 코스마다 chapters를 지연 로딩(코스당 쿼리 1회 + content 블롭 읽기)하던 것을
+  GROUP BY 집계 쿼리 1회로 교체 (list_courses_with_progress)
+- 코스 목록 커서 페이지네이션: (created_at, id) 복합 인덱스 범위 검색
+- 생성 이력 본문은 압축된 별도 테이블에서 상세 조회 시에만 읽음 (load_generation_log_payload)
+- 챕터 콘텐츠는 4개 섹션을 섹션별 행(chapter_sections)에 압축 저장하고 콘텐츠 해시를 함께 기록
+  섹션 하나만 읽을 때 챕터 전체를 풀거나 파싱하지 않음 (load_chapter_section_from_db)
 """
+import hashlib
 import json
 import logging
-from typing import Optional, Tuple
-from sqlalchemy.orm import Session
-from app.models import Course as DBCourse, Chapter as DBChapter
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+from app.models import Course as DBCourse, Chapter as DBChapter, ChapterSection, GenerationLog, GenerationLogPayload
+from app.utils.compression import default_compressor
+from app.utils.pagination import Cursor, keyset_before
 
 logger = logging.getLogger("pop_pins_api")
 
+# 챕터 콘텐츠 섹션 (chapter_sections.section 값)
+CHAPTER_SECTIONS = ("concept", "exercise", "quiz", "advanced_learning")
+
+
+def encode_chapter_section(data: dict) -> Tuple[bytes, str]:
+    """
+    섹션 데이터를 (압축된 JSON, SHA-256 해시)로 변환합니다.
+
+    키를 정렬해 직렬화하므로 같은 내용이면 항상 같은 해시가 나옵니다.
+    """
+    raw = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    return default_compressor().compress(raw), hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def chapter_content_hash(section_hashes: Dict[str, str]) -> str:
+    """섹션별 해시로 챕터 전체 콘텐츠 해시를 계산합니다. (섹션 순서 고정)"""
+    joined = "\n".join(f"{name}:{section_hashes.get(name, '')}" for name in CHAPTER_SECTIONS)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+
+def _chapter_section_rows(chapter_id: int, sections: Dict[str, dict]) -> List[ChapterSection]:
+    rows = []
+    for name in CHAPTER_SECTIONS:
+        content, content_hash = encode_chapter_section(sections[name])
+        rows.append(ChapterSection(chapter_id=chapter_id, section=name, content=content, content_hash=content_hash))
+    return rows
+
+
+def _owned_chapter_query(chapter_id: int, chapter_title: str, course_title: str):
+    """
+    요청한 코스/챕터 제목과 일치할 때만 챕터를 찾는 쿼리입니다.
+
+    chapter_id는 클라이언트가 보낸 값이므로 기본 키만으로 조회하면 다른 코스의 챕터를
+    덮어쓰거나 읽을 수 있습니다. 챕터 제목과 소속 코스 주제까지 일치해야 같은 챕터로 봅니다.
+    """
+    return (
+        select(DBChapter)
+        .join(DBCourse, DBCourse.id == DBChapter.course_id)
+        .where(
+            DBChapter.id == chapter_id,
+            DBChapter.title == chapter_title,
+            DBCourse.topic == course_title
+        )
+    )
+
+
+def _assemble_chapter_content(
+    db_chapter: DBChapter,
+    section_rows: List[ChapterSection],
+    legacy_content: Optional[str]
+) -> Optional[dict]:
+    """섹션 행(또는 이전 버전의 chapters.content)으로 챕터 콘텐츠 딕셔너리를 만듭니다. 불완전하면 None."""
+    if section_rows:
+        compressor = default_compressor()
+        content = {row.section: json.loads(compressor.decompress(row.content)) for row in section_rows}
+    elif legacy_content:
+        content = json.loads(legacy_content)
+    else:
+        return None
+    if not all(content.get(section) for section in CHAPTER_SECTIONS):
+        return None  # 심화 학습이 저장되지 않던 이전 버전 데이터는 재생성
+
+    content["chapter"] = {
+        "chapterId": db_chapter.id,
+        "chapterTitle": db_chapter.title,
+        "chapterDescription": db_chapter.description
+    }
+    return content
+
 
 def save_course_to_db(
     db: Session,
@@ -21,7 +102,7 @@ def save_course_to_db(
     description: str,
     difficulty: str,
     chapters_data: list[dict]
-) -> Optional[int]:
+) -> Optional[Tuple[int, List[int]]]:
     """
     코스와 챕터 정보를 데이터베이스에 저장합니다.
     
@@ -34,11 +115,12 @@ def save_course_to_db(
             각 항목은 {"chapterTitle": str, "chapterDescription": str} 형식
     
     Returns:
-        Optional[int]: 저장된 코스 ID, 실패 시 None
+        Optional[Tuple[int, List[int]]]: (저장된 코스 ID, chapters_data 순서대로의 챕터 ID 목록), 실패 시 None
     
     변경 이유:
         - DB 저장 로직을 엔드포인트에서 분리
         - 에러 처리 개선 (저장 실패해도 응답은 반환)
+        - 챕터 ID를 응답에 담아 이후 챕터 요청이 기본 키로 조회할 수 있도록 함
     """
     try:
         # 코스 생성 및 저장
@@ -48,8 +130,7 @@ def save_course_to_db(
             level=difficulty
         )
         db.add(db_course)
-        db.commit()
-        db.refresh(db_course)
+        db.flush()  # 코스 ID 할당 (커밋은 챕터와 함께 한 번만)
         
         # 챕터 일괄 생성 (성능 개선: N번의 add 대신 한 번에 처리)
         db_chapters = [
@@ -64,7 +145,7 @@ def save_course_to_db(
         db.commit()
         
         logger.info(f"코스 저장 완료: {topic} (ID: {db_course.id})")
-        return db_course.id
+        return db_course.id, [db_chapter.id for db_chapter in db_chapters]
         
     except Exception as db_error:
         logger.error(f"코스 저장 실패: {db_error}", exc_info=True)
@@ -74,22 +155,26 @@ def save_course_to_db(
 
 def save_chapter_content_to_db(
     db: Session,
-    course_title: str,
+    chapter_id: int,
     chapter_title: str,
+    course_title: str,
     concept_data: dict,
     exercise_data: dict,
-    quiz_data: dict
+    quiz_data: dict,
+    advanced_data: dict
 ) -> bool:
     """
     챕터 콘텐츠를 데이터베이스에 저장합니다.
     
     Args:
         db: 데이터베이스 세션
-        course_title: 코스 제목
-        chapter_title: 챕터 제목
+        chapter_id: 챕터 ID (기본 키)
+        chapter_title: 챕터 제목 (chapter_id의 챕터와 일치해야 저장)
+        course_title: 코스 제목 (chapter_id의 소속 코스 주제와 일치해야 저장)
         concept_data: 개념 데이터
         exercise_data: 실습 데이터
         quiz_data: 퀴즈 데이터
+        advanced_data: 심화 학습 데이터
     
     Returns:
         bool: 저장 성공 여부
@@ -97,58 +182,234 @@ def save_chapter_content_to_db(
     변경 이유:
         - 복잡한 DB 쿼리 로직을 함수로 분리
         - 에러 처리 개선
-        - 가독성 향상
+        - 코스 제목/챕터 제목 문자열 검색(인덱스 없음, 동명 코스 모호성) 대신 기본 키로 조회
+        - 심화 학습까지 저장하여 재시작 후에도 재생성 없이 전체 챕터를 제공
+        - 섹션별 행(chapter_sections)에 압축 저장 + 콘텐츠 해시, 섹션 단위로 읽을 수 있음
+        - 클라이언트가 보낸 chapter_id는 제목/코스 주제가 일치할 때만 신뢰 (다른 코스 챕터 덮어쓰기 방지)
     """
     try:
-        # 코스 찾기 (최신 것 우선)
-        db_course = (
-            db.query(DBCourse)
-            .filter(DBCourse.topic == course_title)
-            .order_by(DBCourse.created_at.desc())
-            .first()
-        )
+        db_chapter = db.execute(_owned_chapter_query(chapter_id, chapter_title, course_title)).scalar_one_or_none()
         
-        if not db_course:
-            logger.warning(f"코스를 찾을 수 없음: {course_title}")
+        if not db_chapter:
+            logger.warning(f"챕터를 찾을 수 없거나 제목이 일치하지 않음: ID {chapter_id} ({course_title} / {chapter_title})")
             return False
         
-        # 챕터 찾기
-        db_chapter = (
-            db.query(DBChapter)
-            .filter(
-                DBChapter.course_id == db_course.id,
-                DBChapter.title == chapter_title
-            )
-            .first()
-        )
+        # 섹션별 압축 저장 (다시 생성한 경우 기존 섹션 교체)
+        db.execute(delete(ChapterSection).where(ChapterSection.chapter_id == chapter_id))
+        db.add_all(_chapter_section_rows(chapter_id, {
+            "concept": concept_data,
+            "exercise": exercise_data,
+            "quiz": quiz_data,
+            "advanced_learning": advanced_data
+        }))
+        db_chapter.content = None  # 이전 버전 형식은 비움
+        db_chapter.is_completed = 1
+        db.commit()
         
+        logger.info(f"챕터 콘텐츠 저장 완료: {db_chapter.title} (ID: {chapter_id})")
+        return True
+        
+    except Exception as db_error:
+        logger.error(f"챕터 콘텐츠 저장 실패: {db_error}", exc_info=True)
+        db.rollback()
+        return False
+
+
+def load_chapter_content_from_db(
+    db: Session,
+    chapter_id: int,
+    chapter_title: str,
+    course_title: str
+) -> Optional[dict]:
+    """
+    저장된 챕터 콘텐츠를 기본 키로 조회합니다. (생성 전 read-through)
+    
+    Args:
+        db: 데이터베이스 세션
+        chapter_id: 챕터 ID (기본 키)
+        chapter_title: 챕터 제목 (chapter_id의 챕터와 일치해야 조회)
+        course_title: 코스 제목 (chapter_id의 소속 코스 주제와 일치해야 조회)
+    
+    Returns:
+        Optional[dict]: {"chapter": {...}, "concept": {...}, "exercise": {...}, "quiz": {...}, "advanced_learning": {...}}
+            챕터가 없거나, 제목/코스 주제가 다르거나, 콘텐츠가 없거나,
+            4개 섹션 중 하나라도 빠진 경우(이전 버전 저장분) None
+    """
+    try:
+        db_chapter = db.execute(_owned_chapter_query(chapter_id, chapter_title, course_title)).scalar_one_or_none()
         if not db_chapter:
-            logger.warning(f"챕터를 찾을 수 없음: {chapter_title}")
-            return False
+            return None
         
-        # 콘텐츠 JSON 생성 및 저장
-        content_json = json.dumps(
-            {
-                "concept": concept_data,
-                "exercise": exercise_data,
-                "quiz": quiz_data
-            },
-            ensure_ascii=False
+        section_rows = db.execute(
+            select(ChapterSection).where(ChapterSection.chapter_id == chapter_id)
+        ).scalars().all()
+        legacy_content = None
+        if not section_rows:
+            legacy_content = db.execute(select(DBChapter.content).where(DBChapter.id == chapter_id)).scalar()
+        return _assemble_chapter_content(db_chapter, section_rows, legacy_content)
+        
+    except Exception as db_error:
+        logger.error(f"챕터 콘텐츠 조회 실패: ID {chapter_id} - {db_error}", exc_info=True)
+        return None
+
+
+async def save_course_to_db_async(
+    db: AsyncSession,
+    topic: str,
+    description: str,
+    difficulty: str,
+    chapters_data: list[dict]
+) -> Optional[Tuple[int, List[int]]]:
+    """
+    save_course_to_db의 비동기 버전입니다. (async 엔드포인트용)
+    
+    Returns:
+        Optional[Tuple[int, List[int]]]: (저장된 코스 ID, chapters_data 순서대로의 챕터 ID 목록), 실패 시 None
+    """
+    try:
+        db_course = DBCourse(
+            topic=topic,
+            description=description,
+            level=difficulty
         )
+        db.add(db_course)
+        await db.flush()  # 코스 ID 할당 (커밋은 챕터와 함께 한 번만)
+        
+        db_chapters = [
+            DBChapter(
+                course_id=db_course.id,
+                title=chapter["chapterTitle"],
+                description=chapter["chapterDescription"]
+            )
+            for chapter in chapters_data
+        ]
+        db.add_all(db_chapters)
+        await db.commit()
+        
+        logger.info(f"코스 저장 완료: {topic} (ID: {db_course.id})")
+        return db_course.id, [db_chapter.id for db_chapter in db_chapters]
         
-        db_chapter.content = content_json
+    except Exception as db_error:
+        logger.error(f"코스 저장 실패: {db_error}", exc_info=True)
+        await db.rollback()
+        return None
+
+
+async def save_chapter_content_to_db_async(
+    db: AsyncSession,
+    chapter_id: int,
+    chapter_title: str,
+    course_title: str,
+    concept_data: dict,
+    exercise_data: dict,
+    quiz_data: dict,
+    advanced_data: dict
+) -> bool:
+    """
+    save_chapter_content_to_db의 비동기 버전입니다. (async 엔드포인트용)
+    
+    Returns:
+        bool: 저장 성공 여부
+    """
+    try:
+        db_chapter = await db.scalar(_owned_chapter_query(chapter_id, chapter_title, course_title))
+        
+        if not db_chapter:
+            logger.warning(f"챕터를 찾을 수 없거나 제목이 일치하지 않음: ID {chapter_id} ({course_title} / {chapter_title})")
+            return False
+        
+        await db.execute(delete(ChapterSection).where(ChapterSection.chapter_id == chapter_id))
+        db.add_all(_chapter_section_rows(chapter_id, {
+            "concept": concept_data,
+            "exercise": exercise_data,
+            "quiz": quiz_data,
+            "advanced_learning": advanced_data
+        }))
+        db_chapter.content = None
         db_chapter.is_completed = 1
-        db.commit()
+        await db.commit()
         
-        logger.info(f"챕터 콘텐츠 저장 완료: {chapter_title}")
+        logger.info(f"챕터 콘텐츠 저장 완료: {db_chapter.title} (ID: {chapter_id})")
         return True
         
     except Exception as db_error:
         logger.error(f"챕터 콘텐츠 저장 실패: {db_error}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         return False
 
 
+async def load_chapter_content_from_db_async(
+    db: AsyncSession,
+    chapter_id: int,
+    chapter_title: str,
+    course_title: str
+) -> Optional[dict]:
+    """
+    load_chapter_content_from_db의 비동기 버전입니다. (async 엔드포인트용)
+    
+    Returns:
+        Optional[dict]: 4개 섹션과 "chapter" 정보, 없거나 제목/코스 주제가 다르거나 불완전하면 None
+    """
+    try:
+        db_chapter = await db.scalar(_owned_chapter_query(chapter_id, chapter_title, course_title))
+        if not db_chapter:
+            return None
+        
+        section_rows = (await db.execute(
+            select(ChapterSection).where(ChapterSection.chapter_id == chapter_id)
+        )).scalars().all()
+        legacy_content = None
+        if not section_rows:
+            legacy_content = await db.scalar(select(DBChapter.content).where(DBChapter.id == chapter_id))
+        return _assemble_chapter_content(db_chapter, section_rows, legacy_content)
+        
+    except Exception as db_error:
+        logger.error(f"챕터 콘텐츠 조회 실패: ID {chapter_id} - {db_error}", exc_info=True)
+        return None
+
+
+def load_chapter_section_from_db(db: Session, chapter_id: int, section: str) -> Optional[Tuple[dict, str]]:
+    """
+    챕터 섹션 하나를 조회합니다. (해당 섹션 행만 읽고 압축을 풂)
+    
+    Args:
+        db: 데이터베이스 세션
+        chapter_id: 챕터 ID
+        section: CHAPTER_SECTIONS 중 하나
+    
+    Returns:
+        Optional[Tuple[dict, str]]: (섹션 데이터, 콘텐츠 해시), 저장된 섹션이 없으면 None
+            이전 버전 형식(chapters.content)으로 저장된 챕터는 해당 섹션을 꺼내 해시를 계산
+    """
+    row = db.get(ChapterSection, (chapter_id, section))
+    if row is not None:
+        return json.loads(default_compressor().decompress(row.content)), row.content_hash
+    
+    legacy_content = db.execute(select(DBChapter.content).where(DBChapter.id == chapter_id)).scalar()
+    if not legacy_content:
+        return None
+    data = json.loads(legacy_content).get(section)
+    if not data:
+        return None
+    return data, encode_chapter_section(data)[1]
+
+
+def load_chapter_content_hash(db: Session, chapter_id: int) -> Optional[str]:
+    """
+    챕터 전체 콘텐츠 해시를 섹션 해시만 읽어 계산합니다. (본문은 읽지 않음)
+    
+    Returns:
+        Optional[str]: 4개 섹션이 모두 저장되어 있지 않으면 None
+    """
+    rows = db.execute(
+        select(ChapterSection.section, ChapterSection.content_hash).where(ChapterSection.chapter_id == chapter_id)
+    ).all()
+    hashes = {section: content_hash for section, content_hash in rows}
+    if not all(name in hashes for name in CHAPTER_SECTIONS):
+        return None
+    return chapter_content_hash(hashes)
+
+
 def calculate_course_progress(chapters: list) -> Tuple[int, int, int]:
     """
     코스의 진행률을 계산합니다.
@@ -164,14 +425,88 @@ def calculate_course_progress(chapters: list) -> Tuple[int, int, int]:
         - 시간복잡도 개선: 한 번의 순회로 모든 값 계산
         - 0으로 나누기 방지 로직 포함
     """
-    total_chapters = len(chapters)
+    completed_chapters = sum(1 for chapter in chapters if chapter.is_completed == 1)
+    return course_progress_from_counts(len(chapters), completed_chapters)
+
+
+def course_progress_from_counts(total_chapters: int, completed_chapters: int) -> Tuple[int, int, int]:
+    """
+    챕터 수와 완료된 챕터 수로 진행률을 계산합니다. (집계 쿼리 결과용)
+    
+    Returns:
+        Tuple[int, int, int]: (전체 챕터 수, 완료된 챕터 수, 진행률 0-100)
+    """
     if total_chapters == 0:
         return 0, 0, 0
-    
-    completed_chapters = sum(1 for chapter in chapters if chapter.is_completed == 1)
     progress = int((completed_chapters / total_chapters) * 100)
-    
     return total_chapters, completed_chapters, progress
 
 
+def list_courses_with_progress(
+    db: Session,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[Cursor] = None
+) -> List[Tuple[DBCourse, int, int]]:
+    """
+    코스 목록과 코스별 전체/완료 챕터 수를 집계 쿼리 한 번으로 조회합니다.
+    
+    courses LEFT JOIN chapters ... GROUP BY courses.id로 COUNT와 SUM(is_completed = 1)을 계산하므로
+    페이지 크기와 관계없이 쿼리는 1회이고, 챕터의 content(JSON 블롭)는 읽지 않습니다.
+    
+    Args:
+        db: 데이터베이스 세션
+        skip: 건너뛸 코스 수 (cursor가 있으면 무시)
+        limit: 반환할 최대 코스 수
+        cursor: 이전 페이지 마지막 코스의 (created_at, id), 이보다 오래된 코스부터 조회
+    
+    Returns:
+        List[Tuple[Course, int, int]]: 최신순 (코스, 전체 챕터 수, 완료된 챕터 수) 목록
+    """
+    chapter_count = func.count(DBChapter.id)
+    completed_count = func.coalesce(func.sum(case((DBChapter.is_completed == 1, 1), else_=0)), 0)
+    stmt = (
+        select(DBCourse, chapter_count, completed_count)
+        .outerjoin(DBChapter, DBChapter.course_id == DBCourse.id)
+        .group_by(DBCourse.id)
+        .order_by(DBCourse.created_at.desc(), DBCourse.id.desc())
+        .limit(limit)
+    )
+    if cursor is not None:
+        stmt = stmt.where(keyset_before(DBCourse.created_at, DBCourse.id, cursor))
+    else:
+        stmt = stmt.offset(skip)
+    return [(course, int(total), int(completed)) for course, total, completed in db.execute(stmt).all()]
+
+
+def load_course_chapter_summaries(db: Session, course_id: int) -> List[DBChapter]:
+    """
+    코스 상세 화면용 챕터 목록을 조회합니다. (id, 제목, 설명만 읽고 content 블롭은 읽지 않음)
+    
+    Returns:
+        List[Chapter]: ID 순 챕터 목록
+    """
+    return (
+        db.query(DBChapter)
+        .options(load_only(DBChapter.id, DBChapter.title, DBChapter.description))
+        .filter(DBChapter.course_id == course_id)
+        .order_by(DBChapter.id)
+        .all()
+    )
+
 
+def load_generation_log_payload(db: Session, log: GenerationLog) -> Tuple[Optional[str], Optional[str]]:
+    """
+    생성 이력의 프롬프트/결과 본문을 읽습니다.
+    
+    압축 본문 테이블(generation_log_payloads)에 있으면 압축을 풀어 반환하고,
+    이전 버전에서 generation_logs에 직접 저장한 행이면 그 컬럼을 읽습니다.
+    
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (prompt_context, generated_content)
+    """
+    payload = db.get(GenerationLogPayload, log.id)
+    if payload is not None:
+        compressor = default_compressor()
+        return compressor.decompress(payload.prompt_context), compressor.decompress(payload.generated_content)
+    return log.prompt_context, log.generated_content
@@ -0,0 +1,135 @@
+"""
+스트리밍 JSON 파싱 유틸리티 함수
+
+변경 이유:
+- Gemini 스트리밍 응답은 JSON 객체가 끝나기 전까지 json.loads로 파싱할 수 없음
+- 개념 설명의 "contents" 마크다운을 JSON이 닫히기 전에 클라이언트로 먼저 전달하기 위함
+"""
+import json
+from typing import List
+
+
+class JsonStringFieldExtractor:
+    """
+    조각(chunk) 단위로 들어오는 JSON 텍스트에서 최상위 문자열 필드 하나의 값을 점진적으로 추출합니다.
+
+    feed()를 호출할 때마다 지금까지 확정된 필드 값 중 새로 디코딩된 부분만 반환합니다.
+    이스케이프 시퀀스(\\n, \\", \\uXXXX, 서로게이트 쌍)가 조각 경계에서 잘려도 다음 조각이 올 때까지 보류합니다.
+
+    Example:
+        extractor = JsonStringFieldExtractor("contents")
+        extractor.feed('{"title": "리스트", "contents": "# 리스')  # -> "# 리스"
+        extractor.feed('트\\n본문"}')                              # -> "트\\n본문"
+        extractor.done                                             # -> True
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._token: List[str] = []
+        self._last_string = None  # 직전에 닫힌 문자열 (키 판별용)
+        self._expect_value = False  # 대상 키와 ':'를 읽은 상태
+        self._in_target = False
+        self._raw = ""  # 아직 디코딩하지 않은 대상 값의 원문
+
+    def feed(self, chunk: str) -> str:
+        """
+        새 조각을 입력하고, 이번에 새로 디코딩된 필드 값을 반환합니다.
+
+        Args:
+            chunk: 모델이 스트리밍한 텍스트 조각
+
+        Returns:
+            str: 새로 확정된 필드 값 (없으면 빈 문자열)
+        """
+        if self.done:
+            return ""
+
+        for char in chunk:
+            if self._in_target:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_target = False
+                    self.done = True
+                    return self._drain(final=True)
+                self._raw += char
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = "".join(self._token)
+                    continue
+                self._token.append(char)
+            elif char == '"':
+                if self._expect_value:
+                    self._expect_value = False
+                    self._in_target = True
+                else:
+                    self._in_string = True
+                    self._token = []
+            elif char == ":":
+                if self._depth == 1 and self._last_string == self.field:
+                    self._expect_value = True
+            elif char in "{[":
+                self._depth += 1
+                self._last_string = None
+            elif char in "}]":
+                self._depth -= 1
+            elif char == ",":
+                self._last_string = None
+            elif not char.isspace():
+                # 대상 필드 값이 문자열이 아닌 경우 (숫자, null 등)
+                self._expect_value = False
+
+        return self._drain() if self._in_target else ""
+
+    def _drain(self, final: bool = False) -> str:
+        """디코딩 가능한 앞부분만 JSON 문자열로 디코딩하고, 잘린 이스케이프는 남겨둡니다."""
+        cut = len(self._raw) if final else self._safe_prefix_len(self._raw)
+        prefix, self._raw = self._raw[:cut], self._raw[cut:]
+        if not prefix:
+            return ""
+        try:
+            return json.loads(f'"{prefix}"', strict=False)
+        except ValueError:
+            return prefix  # 잘못된 이스케이프는 원문 그대로 전달
+
+    @staticmethod
+    def _safe_prefix_len(raw: str) -> int:
+        """이스케이프 시퀀스 중간에서 끊기지 않는 가장 긴 앞부분의 길이를 계산합니다."""
+        i = 0
+        safe = 0
+        n = len(raw)
+        while i < n:
+            if raw[i] == "\\":
+                if i + 1 >= n:
+                    break
+                if raw[i + 1] == "u":
+                    if i + 6 > n:
+                        break
+                    try:
+                        code = int(raw[i + 2:i + 6], 16)
+                    except ValueError:
+                        code = 0
+                    if 0xD800 <= code <= 0xDBFF:
+                        # 상위 서로게이트: 하위 서로게이트(\\uXXXX)까지 받아야 디코딩 가능
+                        if i + 12 > n:
+                            break
+                        i += 12
+                    else:
+                        i += 6
+                else:
+                    i += 2
+            else:
+                i += 1
+            safe = i
+        return safe
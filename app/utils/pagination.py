@@ -0,0 +1,73 @@
+"""
+커서 기반(keyset) 페이지네이션 유틸리티
+
+변경 이유:
+- /history, /quiz-results, /courses는 timestamp/created_at 기준 OFFSET/LIMIT으로 페이지를 나눠
+  뒤쪽 페이지일수록 건너뛸 행을 모두 읽고 정렬해야 함 (generation_logs는 챕터당 4행 이상씩 증가)
+- 마지막 행의 (시각, id)를 불투명 커서로 돌려주고, 다음 페이지는 그보다 앞선 행만
+  (시각, id) 복합 인덱스로 바로 찾아 읽음 → 페이지 깊이와 관계없이 일정한 비용
+- 같은 시각의 행이 여러 개여도 id로 순서가 확정되므로 누락/중복 없음
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """(시각, id)를 URL에 그대로 쓸 수 있는 불투명 문자열로 인코딩합니다."""
+    payload = json.dumps({"t": timestamp.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    encode_cursor()로 만든 커서를 (시각, id)로 되돌립니다.
+
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["t"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError) as error:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from error
+
+
+def keyset_before(timestamp_column: Any, id_column: Any, cursor: Cursor):
+    """
+    최신순((시각, id) 내림차순) 정렬에서 커서 다음에 오는 행을 고르는 WHERE 조건.
+
+    (ts < :t) OR (ts = :t AND id < :i) — (시각, id) 복합 인덱스의 범위 검색으로 처리됩니다.
+    """
+    timestamp, row_id = cursor
+    return or_(
+        timestamp_column < timestamp,
+        and_(timestamp_column == timestamp, id_column < row_id)
+    )
+
+
+def split_page(rows: Sequence[Any], limit: int, key) -> Tuple[List[Any], Optional[str]]:
+    """
+    limit + 1개를 조회한 결과를 (이번 페이지 행, 다음 페이지 커서)로 나눕니다.
+
+    Args:
+        rows: limit + 1개까지 조회한 행
+        limit: 페이지 크기
+        key: 행 → (시각, id)
+
+    Returns:
+        Tuple[List, Optional[str]]: 다음 페이지가 없으면 커서는 None
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    timestamp, row_id = key(page[-1])
+    if timestamp is None:
+        return page, None  # 시각이 없는 행은 커서로 이어갈 수 없음 (offset 페이지네이션 사용)
+    return page, encode_cursor(timestamp, row_id)
@@ -0,0 +1,98 @@
+"""
+요청 병합(single-flight) 유틸리티
+
+변경 이유:
+- 같은 챕터를 여러 탭/사용자가 동시에 열면 캐시가 채워지기 전이라 같은 생성 작업이 중복 실행됨
+- 진행 중인 작업을 키 단위로 등록해 두고, 동일한 요청은 새 작업 대신 기존 작업의 결과를 기다리게 함
+"""
+import asyncio
+import contextvars
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger("pop_pins_api")
+
+
+class SingleFlight:
+    """
+    키 단위로 진행 중인 비동기 작업을 공유합니다.
+
+    같은 키로 do()가 동시에 여러 번 호출되면 첫 호출만 작업을 시작하고,
+    나머지 호출은 같은 asyncio.Task의 결과(또는 예외)를 함께 받습니다.
+    작업이 끝나면 등록이 해제되므로 이후 호출은 새 작업을 시작합니다.
+
+    Note:
+        - 대기 중인 요청 하나가 취소(클라이언트 연결 종료 등)되어도 공유 작업은 취소되지 않습니다 (asyncio.shield)
+        - 단일 프로세스(이벤트 루프) 범위에서만 병합됩니다
+        - isolate_context=True이면 공유 작업을 빈 컨텍스트에서 실행하여 첫 호출자의 contextvars
+          (예: llm_priority로 지정한 bulk 우선순위)를 물려받지 않습니다. 나중에 합류한 대화형 요청이
+          첫 호출자의 낮은 우선순위 때문에 기다리지 않도록, 여러 요청이 공유하는 작업에 사용합니다.
+
+    Example:
+        flights = SingleFlight()
+        result = await flights.do(cache_key, lambda: generate(request))
+    """
+
+    def __init__(self, isolate_context: bool = False):
+        self.isolate_context = isolate_context
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0  # 새로 시작된 작업 수
+        self.coalesced = 0  # 기존 작업에 합류한 요청 수
+
+    def get(self, key: Hashable) -> Optional[asyncio.Task]:
+        """키에 해당하는 진행 중인 작업을 반환합니다. 없으면 None."""
+        return self._inflight.get(key)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        키에 대해 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 factory()로 새 작업을 시작합니다.
+
+        Args:
+            key: 작업을 식별하는 해시 가능한 키 (예: 챕터 캐시 키)
+            factory: 새 작업이 필요할 때만 호출되는 코루틴 팩토리
+
+        Returns:
+            Any: 공유 작업의 결과 (작업이 예외로 끝나면 모든 대기자에게 같은 예외 전파)
+        """
+        task, _ = self.start(key, factory)
+        return await asyncio.shield(task)
+
+    def start(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Tuple[asyncio.Task, bool]:
+        """
+        do()와 같지만 결과를 기다리지 않고 공유 작업을 반환합니다.
+
+        작업을 시작한 호출자가 결과 외의 진행 상황(예: 스트리밍 이벤트)을 함께 받아야 할 때 사용합니다.
+        반환된 작업은 asyncio.shield()로 기다려야 호출자가 취소되어도 공유 작업이 유지됩니다.
+
+        Returns:
+            Tuple[asyncio.Task, bool]: (공유 작업, 이 호출이 새로 시작했는지 여부)
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.info(f"진행 중인 동일 작업에 합류: {key}")
+            return task, False
+        if self.isolate_context:
+            # 작업은 생성 시점의 컨텍스트를 복사하므로 빈 컨텍스트 안에서 만듦
+            task = contextvars.Context().run(asyncio.ensure_future, factory())
+        else:
+            task = asyncio.ensure_future(factory())
+        self._inflight[key] = task
+        self.started += 1
+        task.add_done_callback(lambda done, key=key: self._release(key, done))
+        return task, True
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록 예외 확인
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """진행 중/시작/병합 작업 수를 반환합니다."""
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
@@ -1,12 +1,18 @@
 import { useLocation, useNavigate, useParams, Link } from 'react-router-dom';
 import { useState, useEffect } from 'react';
-import type { Course, ChapterContent, QuizGradingResponse } from '../types';
+import type { Chapter, Course, ChapterContent, QuizGradingResponse } from '../types';
 import { generateChapterContent, downloadChapter, gradeQuiz, submitFeedback } from '../services/api';
 import MarkdownViewer from '../components/MarkdownViewer';
 import SurveyModal from '../components/SurveyModal';
 
 type TabType = 'concept' | 'exercise' | 'quiz' | 'advanced';
 
+// 코스 저장에 실패하면 chapterId가 0이므로 순번(1부터)을 라우트 ID로 사용
+const routeIdOf = (chapter: Chapter, index: number) => chapter.chapterId || index + 1;
+
+const findChapterIndex = (chapters: Chapter[], chapterId?: string) =>
+    chapters.findIndex((c, index) => routeIdOf(c, index) === parseInt(chapterId || '0'));
+
 export default function ChapterPage() {
     const { chapterId } = useParams();
     const location = useLocation();
@@ -40,7 +46,7 @@ export default function ChapterPage() {
             return;
         }
 
-        const chapter = course.chapters.find(c => c.chapterId === parseInt(chapterId));
+        const chapter = course.chapters[findChapterIndex(course.chapters, chapterId)];
         if (!chapter) return;
 
         // 이미 같은 챕터의 콘텐츠가 로드되어 있으면 다시 요청하지 않음
@@ -65,6 +71,7 @@ export default function ChapterPage() {
                     course_description: requestInfo.topic, // Simple fallback
                     chapter_title: chapter.chapterTitle,
                     chapter_description: chapter.chapterDescription,
+                    chapter_id: chapter.chapterId || undefined, // 저장되지 않은 챕터는 chapter_id 생략
                 });
                 setContent(data);
             } catch (err: any) {
@@ -81,9 +88,7 @@ export default function ChapterPage() {
 
     if (!course || !chapterId) return null;
 
-    const chapterIndex = course.chapters.findIndex(
-        c => c.chapterId === parseInt(chapterId)
-    );
+    const chapterIndex = findChapterIndex(course.chapters, chapterId);
 
     if (chapterIndex === -1) return <div>Chapter not found</div>;
 
@@ -91,7 +96,7 @@ export default function ChapterPage() {
 
     const handleNext = () => {
         if (chapterIndex < course.chapters.length - 1) {
-            const nextChapterId = course.chapters[chapterIndex + 1].chapterId;
+            const nextChapterId = routeIdOf(course.chapters[chapterIndex + 1], chapterIndex + 1);
             navigate(`/chapter/${nextChapterId}`, { state: { course, requestInfo } });
             setActiveTab('concept');
             // Reset feedback state for new chapter
@@ -103,7 +108,7 @@ export default function ChapterPage() {
 
     const handlePrev = () => {
         if (chapterIndex > 0) {
-            const prevChapterId = course.chapters[chapterIndex - 1].chapterId;
+            const prevChapterId = routeIdOf(course.chapters[chapterIndex - 1], chapterIndex - 1);
             navigate(`/chapter/${prevChapterId}`, { state: { course, requestInfo } });
             setActiveTab('concept');
             // Reset feedback state for new chapter
@@ -117,7 +122,7 @@ export default function ChapterPage() {
         if (!content || !requestInfo) return;
 
         try {
-            const chapter = course.chapters.find(c => c.chapterId === parseInt(chapterId || '0'));
+            const chapter = course.chapters[chapterIndex];
             if (!chapter) return;
 
             const data = await downloadChapter({
@@ -154,7 +159,7 @@ export default function ChapterPage() {
         }
 
         if (!content || !requestInfo) return;
-        const chapter = course.chapters.find(c => c.chapterId === parseInt(chapterId || '0'));
+        const chapter = course.chapters[chapterIndex];
         if (!chapter) return;
 
         setGradingLoading({ ...gradingLoading, [quizIndex]: true });
@@ -165,6 +170,7 @@ export default function ChapterPage() {
                 answer,
                 chapter_title: chapter.chapterTitle,
                 chapter_description: chapter.chapterDescription,
+                course_title: requestInfo.topic,
             });
             setQuizGradings({ ...quizGradings, [quizIndex]: result });
         } catch (err) {
@@ -187,7 +193,8 @@ export default function ChapterPage() {
             await submitFeedback({
                 chapter_title: content.chapter.chapterTitle,
                 rating,
-                comment
+                comment,
+                course_title: requestInfo?.topic,
             });
             setFeedbackSubmitted(true);
             alert('피드백이 제출되었습니다. 감사합니다!');
@@ -201,7 +208,7 @@ export default function ChapterPage() {
 
     const handleRegenerate = async () => {
         if (!requestInfo || !chapterId) return;
-        const chapter = course.chapters.find(c => c.chapterId === parseInt(chapterId));
+        const chapter = course.chapters[chapterIndex];
         if (!chapter) return;
 
         setIsLoading(true);
@@ -214,6 +221,7 @@ export default function ChapterPage() {
                 chapter_title: chapter.chapterTitle,
                 chapter_description: chapter.chapterDescription,
                 chapter_index: chapterIndex + 1,
+                chapter_id: chapter.chapterId || undefined,
                 force_refresh: true
             });
             setContent(data);
@@ -256,7 +264,7 @@ export default function ChapterPage() {
                                     onClick={async () => {
                                         if (!content || !requestInfo) return;
                                         try {
-                                            const chapter = course.chapters.find(c => c.chapterId === parseInt(chapterId || '0'));
+                                            const chapter = course.chapters[chapterIndex];
                                             if (!chapter) return;
 
                                             // 동적 import로 순환 참조 방지 및 필요한 시점에 로드
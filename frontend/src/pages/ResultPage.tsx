@@ -85,9 +85,9 @@ export default function ResultPage() {
 
                     <ul className="divide-y divide-gray-200">
                         {course.chapters.map((chapter, index) => (
-                            <li key={chapter.chapterId} className="hover:bg-gray-50 transition-colors">
+                            <li key={chapter.chapterId || index + 1} className="hover:bg-gray-50 transition-colors">
                                 <Link
-                                    to={`/courses/${course.id}/chapters/${chapter.chapterId}`}
+                                    to={`/courses/${course.id}/chapters/${chapter.chapterId || index + 1}`}
                                     state={{ course, requestInfo }} // Pass context for lazy loading
                                     className="block p-6"
                                 >
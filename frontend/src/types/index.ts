@@ -1,5 +1,5 @@
 export interface Chapter {
-    chapterId: number;
+    chapterId: number; // 코스 저장에 실패하면 0 (챕터 요청에 chapter_id를 보내지 않음)
     chapterTitle: string;
     chapterDescription: string;
 }
@@ -73,6 +73,7 @@ export interface ChapterRequest {
     chapter_title: string;
     chapter_description: string;
     chapter_index?: number;
+    chapter_id?: number;
     force_refresh?: boolean;
 }
 
@@ -95,6 +96,7 @@ export interface FeedbackRequest {
     chapter_title: string;
     rating: number;
     comment: string;
+    course_title?: string;
 }
 
 export interface QuizGradingRequest {
@@ -102,6 +104,7 @@ export interface QuizGradingRequest {
     answer: string;
     chapter_title: string;
     chapter_description: string;
+    course_title?: string;
 }
 
 export interface QuizGradingResponse {
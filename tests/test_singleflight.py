@@ -0,0 +1,160 @@
+"""
+SingleFlight(요청 병합) 단위 테스트
+
+- 동시 호출은 작업 하나를 공유하고, 끝나면 등록이 해제됨
+- 예외는 모든 대기자에게 같은 예외로 전파되고, 이후 호출은 새 작업을 시작
+- 대기자 하나가 취소되어도 공유 작업과 다른 대기자는 영향을 받지 않음
+- isolate_context=True이면 첫 호출자의 contextvars(예: LLM 우선순위)를 물려받지 않음
+"""
+import asyncio
+import contextvars
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+_marker: "contextvars.ContextVar[str]" = contextvars.ContextVar("marker", default="default")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_task(self):
+        async def scenario():
+            flights = SingleFlight()
+            calls = 0
+            release = asyncio.Event()
+
+            async def work():
+                nonlocal calls
+                calls += 1
+                await release.wait()
+                return "result"
+
+            waiters = [asyncio.create_task(flights.do("key", work)) for _ in range(3)]
+            await asyncio.sleep(0)
+            assert flights.stats()["in_flight"] == 1
+            release.set()
+            results = await asyncio.gather(*waiters)
+            return calls, results, flights.stats()
+
+        calls, results, stats = run(scenario())
+        assert calls == 1
+        assert results == ["result"] * 3
+        assert stats == {"in_flight": 0, "started": 1, "coalesced": 2}
+
+    def test_key_is_released_after_completion(self):
+        async def scenario():
+            flights = SingleFlight()
+            calls = 0
+
+            async def work():
+                nonlocal calls
+                calls += 1
+                return calls
+
+            first = await flights.do("key", work)
+            second = await flights.do("key", work)
+            return first, second, flights.get("key")
+
+        first, second, inflight = run(scenario())
+        assert (first, second) == (1, 2)
+        assert inflight is None
+
+    def test_exception_propagates_to_all_waiters_and_releases(self):
+        async def scenario():
+            flights = SingleFlight()
+            release = asyncio.Event()
+
+            async def failing():
+                await release.wait()
+                raise ValueError("boom")
+
+            waiters = [asyncio.create_task(flights.do("key", failing)) for _ in range(2)]
+            await asyncio.sleep(0)
+            release.set()
+            outcomes = await asyncio.gather(*waiters, return_exceptions=True)
+            retried = await flights.do("key", lambda: asyncio.sleep(0, result="ok"))
+            return outcomes, retried, flights.stats()["in_flight"]
+
+        outcomes, retried, in_flight = run(scenario())
+        assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+        assert retried == "ok"
+        assert in_flight == 0
+
+    def test_cancelled_waiter_does_not_cancel_shared_task(self):
+        async def scenario():
+            flights = SingleFlight()
+            release = asyncio.Event()
+
+            async def work():
+                await release.wait()
+                return "result"
+
+            owner = asyncio.create_task(flights.do("key", work))
+            joiner = asyncio.create_task(flights.do("key", work))
+            await asyncio.sleep(0)
+            joiner.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await joiner
+            release.set()
+            return await owner
+
+        assert run(scenario()) == "result"
+
+    def test_cancelled_shielded_get_does_not_cancel_shared_task(self):
+        # 스트리밍 호출처럼 get()으로 작업을 꺼내 기다리는 경우도 shield로 감싸면 다른 대기자에게 영향이 없음
+        async def scenario():
+            flights = SingleFlight()
+            release = asyncio.Event()
+
+            async def work():
+                await release.wait()
+                return "result"
+
+            owner = asyncio.create_task(flights.do("key", work))
+            await asyncio.sleep(0)
+            async def join():
+                return await asyncio.shield(flights.get("key"))
+
+            joiner = asyncio.create_task(join())
+            await asyncio.sleep(0)
+            joiner.cancel()
+            release.set()
+            return await owner
+
+        assert run(scenario()) == "result"
+
+    def test_start_reports_whether_task_was_started(self):
+        async def scenario():
+            flights = SingleFlight()
+            release = asyncio.Event()
+
+            async def work():
+                await release.wait()
+                return "result"
+
+            task, started = flights.start("key", work)
+            same, joined = flights.start("key", work)
+            release.set()
+            return task is same, started, joined, await asyncio.shield(task)
+
+        assert run(scenario()) == (True, True, False, "result")
+
+    @pytest.mark.parametrize("isolate_context, expected", [(False, "bulk"), (True, "default")])
+    def test_isolate_context(self, isolate_context, expected):
+        async def scenario():
+            flights = SingleFlight(isolate_context=isolate_context)
+
+            async def work():
+                return _marker.get()
+
+            token = _marker.set("bulk")
+            try:
+                return await flights.do("key", work)
+            finally:
+                _marker.reset(token)
+
+        assert run(scenario()) == expected